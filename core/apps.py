@@ -0,0 +1,7 @@
+from django.conf import settings
+from django.contrib.staticfiles.apps import StaticFilesConfig as BaseStaticFilesConfig
+
+
+class StaticFilesConfig(BaseStaticFilesConfig):
+    """collectstatic ishlatilmaydigan vendor fayllarni o'tkazib yuboradi"""
+    ignore_patterns = BaseStaticFilesConfig.ignore_patterns + getattr(settings, 'STATIC_PRUNE_PATTERNS', [])
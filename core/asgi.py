@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+# Jonli lenta (SSE) faqat ASGI serverda yoqiladi - settings.LIVE_FEED
+os.environ.setdefault('DJANGO_SERVER', 'asgi')
 
 application = get_asgi_application()
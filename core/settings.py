@@ -1,4 +1,5 @@
 import os
+from importlib.util import find_spec
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -9,21 +10,32 @@ DEBUG = True
 
 ALLOWED_HOSTS = ['*']
 
+# Deployment profili: 'full' (standart), 'admin' yoki 'public'.
+# 'public' workerlar faqat sayt va JSON API ni beradi - admin, CKEditor,
+# browsable API va xodimlar jonli lentasi (admin banneri) yuklanmaydi.
+# 'admin' workerlarda ommaviy yuklama uchun qismlar yo'q: siqish va
+# so'rovlarni cheklash middleware lari, mobil ilova batch endpointi.
+# Sayt sahifalari ikkalasida ham qoladi - admin ulardan reverse() qiladi.
+# Eslatma: django.contrib.admin 'public' da ham import qilinadi - DRF ning
+# rest_framework.views -> schemas -> admindocs.views zanjiri orqali (~9 ms),
+# shuning uchun ishga tushish tezlashuvi kichik (~5%, 783/827 modul).
+APP_PROFILE = os.environ.get('APP_PROFILE', 'full')
+ADMIN_ENABLED = APP_PROFILE != 'public'
+PUBLIC_ENABLED = APP_PROFILE != 'admin'
+
 INSTALLED_APPS = [
-    'jazzmin',
-    'django.contrib.admin',
+    *(['jazzmin', 'django.contrib.admin'] if ADMIN_ENABLED else []),
     'django.contrib.auth',
     'django.contrib.contenttypes',
     'django.contrib.sessions',
     'django.contrib.messages',
-    'django.contrib.staticfiles',
+    'core.apps.StaticFilesConfig',
     
     # Third party
     'rest_framework',
     'rest_framework.authtoken',
     'corsheaders',
-    'ckeditor',
-    'ckeditor_uploader',
+    *(['ckeditor', 'ckeditor_uploader'] if ADMIN_ENABLED else []),
     
     # Local apps
     'courses',
@@ -40,12 +52,15 @@ MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
+    *(['courses.middleware.AdmissionControlMiddleware'] if PUBLIC_ENABLED else []),
+    'courses.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
+    *(['courses.middleware.CompressionMiddleware'] if PUBLIC_ENABLED else []),
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'courses.middleware.RequestProfilerMiddleware',
 ]
 
 ROOT_URLCONF = 'core.urls'
@@ -70,22 +85,42 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'core.wsgi.application'
 
-# DATABASES = {
-#     'default': {
-#         'ENGINE': 'django.db.backends.sqlite3',
-#         'NAME': BASE_DIR / 'db.sqlite3',
-#     }
-# }
+# Baza profili: 'postgres' (standart) yoki 'sqlite' (noutbuk, CI va benchmarklar uchun)
+DB_PROFILE = os.environ.get('DB_PROFILE', 'postgres')
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.postgresql_psycopg2',
-        'NAME': 'qosim',
-        'USER': 'qosim',
-        'PASSWORD': 'qosim',
-        'HOST': 'localhost',
-        'PORT': '',
+if DB_PROFILE == 'sqlite':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get('DB_NAME', BASE_DIR / 'db.sqlite3'),
+        }
     }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('DB_NAME', 'qosim'),
+            'USER': os.environ.get('DB_USER', 'qosim'),
+            'PASSWORD': os.environ.get('DB_PASSWORD', 'qosim'),
+            'HOST': os.environ.get('DB_HOST', 'localhost'),
+            'PORT': os.environ.get('DB_PORT', ''),
+            'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 60)),
+            'CONN_HEALTH_CHECKS': True,
+            # Osilib qolgan so'rov workerni band qilmasligi uchun (ms, 0 - cheklovsiz)
+            'OPTIONS': {
+                'options': f"-c statement_timeout={int(os.environ.get('DB_STATEMENT_TIMEOUT', 30000))}",
+            },
+        }
+    }
+
+# SQLite ulanish ochilganda qo'llanadigan PRAGMA lar (courses.db)
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -64000,
+    'temp_store': 'MEMORY',
 }
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -106,6 +141,34 @@ STATIC_URL = '/static/'
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 STATICFILES_DIRS = [os.path.join(BASE_DIR, 'static')] if os.path.isdir(os.path.join(BASE_DIR, 'static')) else []
 
+# Hash nomli fayllar + gzip/brotli nusxalar; whitenoise ularni immutable sifatida beradi
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'core.storage.CompressedManifestStaticFilesStorage'},
+}
+WHITENOISE_MANIFEST_STRICT = False
+
+# Hech bir shablon yoki konfiguratsiya ishlatmaydigan vendor fayllar (collectstatic o'tkazib yuboradi)
+STATIC_PRUNE_PATTERNS = [
+    # Jazzmin faqat 'default' bootswatch mavzusini yuklaydi
+    *[f'vendor/bootswatch/{theme}/*' for theme in (
+        'cerulean', 'cosmo', 'cyborg', 'darkly', 'flatly', 'journal', 'litera', 'lumen', 'lux',
+        'materia', 'minty', 'pulse', 'sandstone', 'simplex', 'sketchy', 'slate', 'solar',
+        'spacelab', 'superhero', 'united', 'yeti',
+    )],
+    # CKEditor build'iga kirmagan va CKEDITOR_CONFIGS da yoqilmagan pluginlar
+    *[f'ckeditor/ckeditor/plugins/{plugin}/*' for plugin in (
+        'adobeair', 'autoembed', 'autogrow', 'autolink', 'bbcode', 'codesnippet', 'codesnippetgeshi',
+        'devtools', 'divarea', 'docprops', 'embed', 'embedbase', 'embedsemantic', 'flash',
+        'iframedialog', 'image2', 'mathjax', 'placeholder', 'sharedspace', 'sourcedialog',
+        'stylesheetparser', 'tableresize', 'uicolor', 'wsc',
+    )],
+    'ckeditor/ckeditor/skins/moono/*',
+    '*.map',
+    'ckeditor/ckeditor/CHANGES.md',
+    'rest_framework/docs/*',
+]
+
 # Media files
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
@@ -114,18 +177,107 @@ MEDIA_ROOT = BASE_DIR / 'media'
 AUTH_USER_MODEL = 'courses.User'
 
 # REST Framework
+MSGPACK_ENABLED = find_spec('msgpack') is not None
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'courses.authentication.CachedTokenAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',
     ],
+    # orjson renderer standart JSONRenderer bilan bir xil bayt beradi;
+    # msgpack o'rnatilgan bo'lsa ``Accept: application/msgpack`` ham ishlaydi
+    'DEFAULT_RENDERER_CLASSES': [
+        'courses.renderers.FastJSONRenderer',
+        *(['courses.renderers.MessagePackRenderer'] if MSGPACK_ENABLED else []),
+        *(['rest_framework.renderers.BrowsableAPIRenderer'] if ADMIN_ENABLED else []),
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'courses.renderers.FastJSONParser',
+        *(['courses.renderers.MessagePackParser'] if MSGPACK_ENABLED else []),
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
 }
 
+# Sessions: kesh + baza, muddat intervalda bir marta yangilanadi
+SESSION_ENGINE = 'courses.sessions'
+SESSION_REFRESH_INTERVAL = 60 * 60  # sekund
+
+# Admission control: imtihon so'rovlari katalog va admindan ustun
+ADMISSION_CONTROL = {
+    'ENABLED': True,
+    'MAX_CONCURRENT': 64,
+    'RETRY_AFTER': 5,
+    'CLASSES': {
+        'exam': {'limit': 48, 'queue': 200, 'timeout': 10, 'priority': 0},
+        'catalog': {'limit': 24, 'queue': 50, 'timeout': 2, 'priority': 1},
+        'admin': {'limit': 8, 'queue': 10, 'timeout': 2, 'priority': 2},
+    },
+}
+
+# Javoblarni siqish (Brotli/gzip); CSRF tokenli sahifalar BREACH ga qarshi himoyalanadi
+COMPRESSION = {
+    'ENABLED': True,
+    'BROTLI_LEVEL': 5,
+    'GZIP_LEVEL': 6,
+    'MIN_SIZE': 512,
+    'CSRF_PAGES': 'pad',
+}
+
+# Mobil ilova uchun batch endpoint (/api/batch/)
+BATCH_API = {
+    'MAX_REQUESTS': 20,
+    'MAX_WORKERS': 4,
+}
+
+# Xodimlar uchun jonli lenta (SSE): faqat ASGI da (core/asgi.py DJANGO_SERVER=asgi qo'yadi).
+# Bir nechta worker bo'lsa baza so'raladi
+LIVE_FEED = {
+    'ENABLED': os.environ.get('DJANGO_SERVER') == 'asgi',
+    'POLL_INTERVAL': 3,
+    'HEARTBEAT': 15,
+    'MAX_AGE': 300,
+}
+
+# Kesh: REDIS_URL berilsa umumiy Redis (bir nechta worker), aks holda jarayon xotirasi
+REDIS_URL = os.environ.get('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# DRF javoblari keshi (kalitlar model versiyalari bilan eskiradi)
+RESPONSE_CACHE = {
+    'ENABLED': True,
+    'TIMEOUT': 60 * 60,
+}
+
+# Xodimlar uchun so'rov profili: ?_profile=1 yoki "X-Profile: 1" sarlavhasi
+REQUEST_PROFILER = {
+    'ENABLED': True,
+    'INTERVAL': 0.001,
+    'KEEP': 100,
+}
+
+# Token authentication cache (sekundlarda)
+AUTH_TOKEN_CACHE = None  # None - faqat umumiy (Redis) kesh bo'lsa
+AUTH_TOKEN_CACHE_TTL = 300
+AUTH_TOKEN_EXPIRE_SECONDS = None  # None - muddatsiz
+
 # CORS Settings
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",
@@ -170,6 +322,7 @@ JAZZMIN_SETTINGS = {
     "topmenu_links": [
         {"name": "Bosh sahifa", "url": "admin:index"},
         {"name": "Saytga o'tish", "url": "/", "new_window": True},
+        {"name": "Statistika", "url": "admin:courses_statistic_changelist"},
     ],
     "show_sidebar": True,
     "navigation_expanded": True,
@@ -185,6 +338,8 @@ JAZZMIN_SETTINGS = {
         "courses.Enrollment": "fas fa-user-check",
         "courses.Post": "fas fa-newspaper",
         "courses.AboutPage": "fas fa-user-tie",
+        "courses.Statistic": "fas fa-chart-bar",
+        "courses.RequestProfile": "fas fa-stopwatch",
         "courses.Term": "fas fa-book"
     },
 }
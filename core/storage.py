@@ -0,0 +1,15 @@
+from whitenoise.storage import CompressedManifestStaticFilesStorage as BaseStorage
+
+
+class CompressedManifestStaticFilesStorage(BaseStorage):
+    """sourceMappingURL havolalarini qayta yozmaydigan manifest storage.
+
+    Vendor paketlardagi ``.map`` fayllar ko'pincha yo'q (yoki
+    STATIC_PRUNE_PATTERNS orqali tashlab yuborilgan), ular faqat
+    brauzer devtools uchun kerak.
+    """
+
+    patterns = tuple(
+        (extension, tuple(pattern for pattern in extension_patterns if 'sourceMappingURL' not in str(pattern)))
+        for extension, extension_patterns in BaseStorage.patterns
+    )
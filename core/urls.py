@@ -1,15 +1,21 @@
-from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 from django.views.generic import TemplateView
 
 urlpatterns = [
-    path('admin/', admin.site.urls),
-    path('ckeditor/', include('ckeditor_uploader.urls')),
     path('', include('courses.urls')),
 ]
 
+# Admin va CKEditor faqat 'public' bo'lmagan profilda
+if settings.ADMIN_ENABLED:
+    from django.contrib import admin
+
+    urlpatterns = [
+        path('admin/', admin.site.urls),
+        path('ckeditor/', include('ckeditor_uploader.urls')),
+    ] + urlpatterns
+
 # Media files (development)
 if settings.DEBUG:
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -17,4 +23,4 @@ if settings.DEBUG:
 
 # Custom error handlers
 handler404 = 'courses.views.handler404'
-handler500 = 'courses.views.handler500'
\ No newline at end of file
+handler500 = 'courses.views.handler500'
@@ -1,10 +1,26 @@
+import json
+
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.core.exceptions import PermissionDenied
+from django.db.models import Count, Q
+from django.db.models.functions import Now
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404
+from django.template.response import TemplateResponse
+from django.urls import path, reverse
+from django.utils.html import format_html, format_html_join
+from .dashboard import invalidate_dashboards
+from .grading import QUEUE_PAGE_SIZE, submission_queue, bulk_grade
+from .live import live_feed_enabled
+from .profiling import flame_graph
+from .statistics import refresh, site_statistics
 from .models import (
     User, Term, AboutPage, Category, Subject, Course, Lesson, Enrollment,
     LessonProgress, Quiz, QuizQuestion, QuizAnswer, Post,
     PracticalAssignment, AssignmentSubmission, Reference,
-    FinalTest, FinalTestQuestion, FinalTestAnswer, FinalTestResult
+    FinalTest, FinalTestQuestion, FinalTestAnswer, FinalTestResult, FinalTestStats, Statistic,
+    RequestProfile
 )
 
 
@@ -63,16 +79,12 @@ class AboutPageAdmin(admin.ModelAdmin):
 
 @admin.register(Subject)
 class SubjectAdmin(admin.ModelAdmin):
-    list_display = ['name', 'slug', 'order', 'is_active', 'get_courses_count']
+    list_display = ['name', 'slug', 'order', 'is_active', 'published_courses_count']
     list_filter = ['is_active']
     search_fields = ['name', 'description']
     prepopulated_fields = {'slug': ('name',)}
     list_editable = ['order', 'is_active']
 
-    def get_courses_count(self, obj):
-        return obj.courses.filter(is_published=True).count()
-    get_courses_count.short_description = "Kurslar soni"
-
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
@@ -89,7 +101,10 @@ class LessonInline(admin.TabularInline):
 
 @admin.register(Course)
 class CourseAdmin(admin.ModelAdmin):
-    list_display = ['title', 'subject', 'category', 'instructor', 'level', 'order', 'is_published']
+    list_display = [
+        'title', 'subject', 'category', 'instructor', 'level', 'order', 'is_published',
+        'lessons_count', 'enrollments_count',
+    ]
     list_filter = ['subject', 'category', 'level', 'is_published']
     search_fields = ['title', 'description']
     prepopulated_fields = {'slug': ('title',)}
@@ -181,7 +196,7 @@ class AssignmentSubmissionInline(admin.TabularInline):
 
 @admin.register(PracticalAssignment)
 class PracticalAssignmentAdmin(admin.ModelAdmin):
-    list_display = ['title', 'lesson', 'max_score', 'deadline_days', 'is_active', 'created_at']
+    list_display = ['title', 'lesson', 'max_score', 'deadline_days', 'is_active', 'created_at', 'grading_link']
     list_filter = ['is_active', 'created_at']
     search_fields = ['title', 'description']
     list_editable = ['is_active']
@@ -195,23 +210,119 @@ class PracticalAssignmentAdmin(admin.ModelAdmin):
         }),
     )
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('lesson', 'lesson__course').annotate(
+            pending_count=Count('submissions', filter=Q(submissions__status='submitted'))
+        )
+
+    def grading_link(self, obj):
+        url = reverse('admin:courses_practicalassignment_grading', args=[obj.pk])
+        return format_html('<a href="{}">Baholash ({})</a>', url, obj.pending_count)
+    grading_link.short_description = "Baholash navbati"
+
+    def get_urls(self):
+        urls = [
+            path('<int:pk>/grading/', self.admin_site.admin_view(self.grading_view),
+                 name='courses_practicalassignment_grading'),
+            path('<int:pk>/grading/queue/', self.admin_site.admin_view(self.grading_queue_view),
+                 name='courses_practicalassignment_grading_queue'),
+            path('<int:pk>/grading/bulk/', self.admin_site.admin_view(self.grading_bulk_view),
+                 name='courses_practicalassignment_grading_bulk'),
+        ]
+        return urls + super().get_urls()
+
+    def _get_grading_assignment(self, request, pk):
+        if not request.user.has_perm('courses.change_assignmentsubmission'):
+            raise PermissionDenied
+        return get_object_or_404(PracticalAssignment.objects.select_related('lesson'), pk=pk)
+
+    def grading_view(self, request, pk):
+        """Baholash ish joyi - birinchi sahifa HTML ichida keladi"""
+        assignment = self._get_grading_assignment(request, pk)
+        items, next_cursor = submission_queue(assignment)
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'title': f"Baholash: {assignment.title}",
+            'assignment': assignment,
+            'initial_page': {'results': items, 'next': next_cursor},
+            'page_size': QUEUE_PAGE_SIZE,
+            'status_choices': AssignmentSubmission.STATUS_CHOICES,
+        }
+        return TemplateResponse(request, 'admin/courses/practicalassignment/grading.html', context)
+
+    def grading_queue_view(self, request, pk):
+        """Navbatning keyingi sahifasi (JSON)"""
+        assignment = self._get_grading_assignment(request, pk)
+        try:
+            after = int(request.GET.get('after', 0))
+        except ValueError:
+            after = 0
+        items, next_cursor = submission_queue(assignment, after=after)
+        return JsonResponse({'results': items, 'next': next_cursor})
+
+    def grading_bulk_view(self, request, pk):
+        """Tanlangan ishlarni bitta so'rovda baholash (JSON)"""
+        if request.method != 'POST':
+            return JsonResponse({'error': 'POST kerak'}, status=405)
+        assignment = self._get_grading_assignment(request, pk)
+        try:
+            payload = json.loads(request.body)
+            if not isinstance(payload, dict):
+                return JsonResponse({'error': "JSON obyekt kutilgan"}, status=400)
+            ids = [int(i) for i in payload.get('ids', [])]
+            score = payload.get('score')
+            updated = bulk_grade(
+                assignment, ids, payload.get('status'),
+                score=int(score) if score not in (None, '') else None,
+                feedback=payload.get('feedback'),
+            )
+        except (ValueError, TypeError) as exc:
+            return JsonResponse({'error': str(exc)}, status=400)
+        return JsonResponse({'updated': updated})
+
+
+class LiveBannerMixin:
+    """Jonli lenta banneri - faqat ASGI da (WSGI da sahifani yangilash kifoya)"""
+
+    def changelist_view(self, request, extra_context=None):
+        extra_context = {**(extra_context or {}), 'live_feed_enabled': live_feed_enabled(request)}
+        return super().changelist_view(request, extra_context)
+
 
 @admin.register(AssignmentSubmission)
-class AssignmentSubmissionAdmin(admin.ModelAdmin):
+class AssignmentSubmissionAdmin(LiveBannerMixin, admin.ModelAdmin):
     list_display = ['user', 'assignment', 'status', 'score', 'submitted_at', 'download_file']
     list_filter = ['status', 'submitted_at']
     search_fields = ['user__username', 'assignment__title']
     list_editable = ['status', 'score']
-    readonly_fields = ['user', 'assignment', 'submission_file', 'comment', 'submitted_at', 'download_link']
+    list_select_related = ['user', 'assignment']
+    actions = ['mark_accepted', 'mark_rejected']
+    readonly_fields = ['user', 'assignment', 'submission_file', 'comment', 'submitted_at', 'reviewed_at', 'download_link']
     fieldsets = (
         ('Yuborilgan ish', {
             'fields': ('user', 'assignment', 'submission_file', 'download_link', 'comment', 'submitted_at')
         }),
         ('Baholash', {
-            'fields': ('status', 'score', 'feedback')
+            'fields': ('status', 'score', 'feedback', 'reviewed_at')
         }),
     )
 
+    def _mark(self, request, queryset, status):
+        user_ids = set(queryset.values_list('user_id', flat=True))
+        # .update() signal yubormaydi - ``bulk_grade`` dagi izohga qarang
+        updated = queryset.update(status=status, reviewed_at=Now())
+        invalidate_dashboards(user_ids)
+        self.message_user(request, f"{updated} ta ish yangilandi.")
+
+    @admin.action(description="Tanlanganlarni qabul qilish")
+    def mark_accepted(self, request, queryset):
+        self._mark(request, queryset, 'accepted')
+
+    @admin.action(description="Tanlanganlarni qaytarish")
+    def mark_rejected(self, request, queryset):
+        self._mark(request, queryset, 'rejected')
+
     def download_file(self, obj):
         from django.utils.html import format_html
         if obj.submission_file:
@@ -265,9 +376,14 @@ class FinalTestAdmin(admin.ModelAdmin):
     search_fields = ['title', 'description']
     list_editable = ['is_active', 'order']
     inlines = [FinalTestQuestionInline]
+    readonly_fields = ['item_analysis']
     fieldsets = (
         ('Asosiy ma\'lumotlar', {
-            'fields': ('title', 'description', 'pass_score', 'order', 'is_active')
+            'fields': ('title', 'description', 'pass_score', 'questions_per_attempt', 'order', 'is_active')
+        }),
+        ('Savollar tahlili', {
+            'fields': ('item_analysis',),
+            'classes': ('collapse',),
         }),
     )
 
@@ -275,6 +391,29 @@ class FinalTestAdmin(admin.ModelAdmin):
         return obj.questions.count()
     get_questions_count.short_description = "Savollar soni"
 
+    def item_analysis(self, obj):
+        stats = FinalTestStats.objects.filter(test=obj).first() if obj and obj.pk else None
+        if not stats or not stats.attempts:
+            return "Hali urinishlar yo'q"
+        rows = stats.item_analysis()
+        questions = dict(
+            FinalTestQuestion.objects.filter(pk__in=[r['question_id'] for r in rows]).values_list('pk', 'question')
+        )
+        return format_html(
+            '<table class="table table-sm"><thead><tr><th>Savol</th><th>Ko\'rgan</th><th>To\'g\'ri</th>'
+            '<th>Qiyinlik (p)</th><th>Ajrata olish (r)</th></tr></thead><tbody>{}</tbody></table>',
+            format_html_join('', '<tr><td>{}</td><td>{}</td><td>{}</td><td>{}</td><td>{}</td></tr>', (
+                (
+                    questions.get(r['question_id'], f"#{r['question_id']} (o'chirilgan)")[:80],
+                    r['seen'], r['correct'],
+                    '—' if r['difficulty'] is None else f"{r['difficulty']:.2f}",
+                    '—' if r['discrimination'] is None else f"{r['discrimination']:.2f}",
+                )
+                for r in sorted(rows, key=lambda r: r['difficulty'] if r['difficulty'] is not None else 1)
+            )),
+        )
+    item_analysis.short_description = "Savollar statistikasi"
+
 
 @admin.register(FinalTestQuestion)
 class FinalTestQuestionAdmin(admin.ModelAdmin):
@@ -286,8 +425,68 @@ class FinalTestQuestionAdmin(admin.ModelAdmin):
 
 
 @admin.register(FinalTestResult)
-class FinalTestResultAdmin(admin.ModelAdmin):
+class FinalTestResultAdmin(LiveBannerMixin, admin.ModelAdmin):
     list_display = ['user', 'test', 'score', 'correct', 'total', 'passed', 'completed_at']
     list_filter = ['passed', 'test', 'completed_at']
     search_fields = ['user__username', 'test__title']
-    readonly_fields = ['user', 'test', 'score', 'correct', 'total', 'passed', 'completed_at']
\ No newline at end of file
+    readonly_fields = ['user', 'test', 'score', 'correct', 'total', 'passed', 'seed', 'completed_at']
+
+
+@admin.register(Statistic)
+class StatisticAdmin(admin.ModelAdmin):
+    """Platforma statistikasi paneli - jamlanma jadvaldan, agregat so'rovlarsiz"""
+    list_display = ['key', 'value', 'updated_at']
+    search_fields = ['key']
+    actions = ['refresh_statistics']
+    change_list_template = 'admin/courses/statistic/change_list.html'
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def changelist_view(self, request, extra_context=None):
+        extra_context = {**(extra_context or {}), 'stats': site_statistics()}
+        return super().changelist_view(request, extra_context)
+
+    @admin.action(description="Haqiqiy sonlar bilan qayta hisoblash")
+    def refresh_statistics(self, request, queryset):
+        changed = refresh()
+        self.message_user(request, f"{len(changed)} ta ko'rsatkich yangilandi.")
+
+
+@admin.register(RequestProfile)
+class RequestProfileAdmin(admin.ModelAdmin):
+    """Oxirgi profillar; sahifada flame graph, SQL va shablonlar vaqt chizig'i"""
+    list_display = ['created_at', 'method', 'path', 'status_code', 'duration', 'sql_time', 'query_count', 'user']
+    list_filter = ['method', 'status_code', 'view_name']
+    search_fields = ['path', 'view_name']
+    list_select_related = ['user']
+    fields = ['method', 'path', 'view_name', 'status_code', 'user', 'duration', 'sql_time',
+              'query_count', 'sample_count', 'created_at']
+    change_form_template = 'admin/courses/requestprofile/change_form.html'
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def change_view(self, request, object_id, form_url='', extra_context=None):
+        profile = self.get_object(request, object_id)
+        if profile is not None:
+            scale = max(profile.duration, 1)
+            extra_context = {
+                **(extra_context or {}),
+                'flame_rows': flame_graph(profile.stacks),
+                'timeline_queries': [
+                    {**query, 'left': query['start'] * 100 / scale, 'width': max(query['duration'] * 100 / scale, 0.2)}
+                    for query in profile.queries
+                ],
+                'timeline_templates': [
+                    {**entry, 'left': entry['start'] * 100 / scale, 'width': max(entry['duration'] * 100 / scale, 0.2)}
+                    for entry in profile.templates
+                ],
+            }
+        return super().change_view(request, object_id, form_url, extra_context)
@@ -0,0 +1,126 @@
+# courses/authentication.py
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+
+# Bekor qilingan token belgisi: ``cache.add`` eski yuklash natijasini ustiga yoza olmaydi
+REVOKED = 'revoked'
+
+
+def _token_cache_key(key):
+    return f'auth_token:{key}'
+
+
+def _cache_ttl():
+    return getattr(settings, 'AUTH_TOKEN_CACHE_TTL', 300)
+
+
+def _token_expires_at(token):
+    expire_seconds = getattr(settings, 'AUTH_TOKEN_EXPIRE_SECONDS', None)
+    if not expire_seconds:
+        return None
+    return token.created + timedelta(seconds=expire_seconds)
+
+
+def cache_enabled():
+    """Keshlash faqat umumiy kesh bilan - jarayon ichidagi keshda bekor qilish
+    boshqa workerlarga yetib bormaydi. ``AUTH_TOKEN_CACHE`` bilan majburlash mumkin."""
+    enabled = getattr(settings, 'AUTH_TOKEN_CACHE', None)
+    if enabled is None:
+        return not isinstance(caches[DEFAULT_CACHE_ALIAS], (LocMemCache, DummyCache))
+    return enabled
+
+
+def _mark_revoked(key):
+    cache.set(_token_cache_key(key), REVOKED, _cache_ttl())
+
+
+def revoke_token(key):
+    """Faqat shu tokenning kesh yozuvini bekor qilish.
+
+    Yozuv o'chirilmaydi, ``REVOKED`` belgisi bilan almashtiriladi - bekor
+    qilishdan oldin boshlangan yuklash uni ``cache.add`` bilan qayta yoza
+    olmaydi. Belgi darhol va tranzaksiya tugagach yana qo'yiladi; TTL
+    davomida token bazadan tekshiriladi.
+    """
+    _mark_revoked(key)
+    transaction.on_commit(lambda: _mark_revoked(key))
+
+
+def issue_token(user):
+    """Foydalanuvchi tokenini olish; muddati o'tgan bo'lsa yangisini yaratish"""
+    token, created = Token.objects.get_or_create(user=user)
+    expires_at = _token_expires_at(token)
+    if not created and expires_at and expires_at <= timezone.now():
+        token.delete()
+        token = Token.objects.create(user=user)
+    return token
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """Token -> foydalanuvchi natijasini keshlaydigan TokenAuthentication.
+
+    Issiq mijozlar uchun so'rov bazaga murojaat qilmaydi: umumiy keshdan
+    faqat shu tokenning yozuvi o'qiladi. Keshda ``User`` obyekti emas,
+    parolsiz maydonlar saqlanadi.
+    """
+
+    def authenticate_credentials(self, key):
+        if not cache_enabled():
+            token = self._load_token(key)
+        else:
+            cache_key = _token_cache_key(key)
+            entry = cache.get(cache_key)
+            if entry is None or entry == REVOKED:
+                token = self._load_token(key)
+                if entry is None:
+                    cache.add(cache_key, _cache_entry(token), _cache_ttl())
+            else:
+                token = _token_from_entry(key, entry)
+
+        expires_at = _token_expires_at(token)
+        if expires_at and expires_at <= timezone.now():
+            Token.objects.filter(key=key).delete()
+            revoke_token(key)
+            raise exceptions.AuthenticationFailed('Token muddati tugagan.')
+        return (token.user, token)
+
+    def _load_token(self, key):
+        try:
+            token = Token.objects.select_related('user').get(key=key)
+        except Token.DoesNotExist:
+            raise exceptions.AuthenticationFailed(_('Invalid token.'))
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+        return token
+
+
+def _user_fields():
+    return [field.attname for field in get_user_model()._meta.concrete_fields if field.attname != 'password']
+
+
+def _cache_entry(token):
+    return {
+        'created': token.created,
+        'user': tuple(getattr(token.user, name) for name in _user_fields()),
+    }
+
+
+def _token_from_entry(key, entry):
+    # Har so'rovga yangi obyekt; parol kerak bo'lsa bazadan (deferred) o'qiladi
+    user = get_user_model().from_db(DEFAULT_DB_ALIAS, _user_fields(), entry['user'])
+    token = Token(key=key, user_id=user.pk, created=entry['created'])
+    token.user = user
+    return token
@@ -0,0 +1,167 @@
+# courses/batch.py
+
+import io
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIRequest
+from django.db import close_old_connections
+from django.urls import Resolver404, resolve, reverse
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+
+from . import metrics
+from .request_cache import request_cache
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_API = {
+    'MAX_REQUESTS': 20,
+    'MAX_WORKERS': 4,
+    'CONCURRENT': True,
+    'PREFIX': '/api/',
+}
+METHODS = {'GET', 'HEAD', 'OPTIONS', 'POST', 'PUT', 'PATCH', 'DELETE'}
+
+
+# ========================
+# BATCH
+# ========================
+
+_executor = None
+
+
+def _config():
+    return {**DEFAULT_BATCH_API, **getattr(settings, 'BATCH_API', {})}
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(_config()['MAX_WORKERS'], thread_name_prefix='batch')
+    return _executor
+
+
+def validate(items):
+    config = _config()
+    if not isinstance(items, list) or not items:
+        raise ValueError("'requests' bo'sh bo'lmagan ro'yxat bo'lishi kerak")
+    if len(items) > config['MAX_REQUESTS']:
+        raise ValueError(f"Bitta batchda ko'pi bilan {config['MAX_REQUESTS']} ta so'rov")
+    for item in items:
+        if not isinstance(item, dict) or not isinstance(item.get('url'), str):
+            raise ValueError("Har bir so'rovda 'url' bo'lishi kerak")
+        if str(item.get('method', 'GET')).upper() not in METHODS:
+            raise ValueError(f"Noma'lum metod: {item.get('method')}")
+
+
+def execute_batch(request, items):
+    """Sub-so'rovlarni jarayon ichida bajarib, javoblarni tartib bo'yicha qaytaradi.
+
+    Ketma-ket kelgan o'qish (GET/HEAD/OPTIONS) so'rovlari thread pool da
+    parallel bajariladi; yozish so'rovlari navbat bilan va oradagi
+    chegara bo'lib qoladi. Barcha sub-so'rovlar tashqi so'rov
+    foydalanuvchisi nomidan ishlaydi va bitta request cache ni bo'lishadi.
+    """
+    validate(items)
+    metrics.incr('batch.requests')
+    metrics.incr('batch.subrequests', len(items))
+
+    token = request_cache.set({})
+    try:
+        results = [None] * len(items)
+        pending = []
+        for index, item in enumerate(items):
+            if str(item.get('method', 'GET')).upper() in SAFE_METHODS:
+                pending.append(index)
+                continue
+            _run_concurrently(request, items, pending, results)
+            pending = []
+            results[index] = _run(request, item)
+            # Yozishdan keyin eski qiymatlar qaytmasligi uchun
+            request_cache.get().clear()
+        _run_concurrently(request, items, pending, results)
+        return results
+    finally:
+        request_cache.reset(token)
+
+
+def _run_concurrently(request, items, indexes, results):
+    if len(indexes) < 2 or not _config()['CONCURRENT']:
+        for index in indexes:
+            results[index] = _run(request, items[index])
+        return
+    futures = {
+        index: _get_executor().submit(copy_context().run, _run_in_thread, request, items[index])
+        for index in indexes
+    }
+    for index, future in futures.items():
+        results[index] = future.result()
+
+
+def _run_in_thread(request, item):
+    try:
+        return _run(request, item)
+    finally:
+        # Har thread o'z DB ulanishini ochadi - CONN_MAX_AGE bo'yicha yopiladi
+        close_old_connections()
+
+
+def _run(request, item):
+    method = str(item.get('method', 'GET')).upper()
+    url = urlsplit(item['url'])
+    if not url.path.startswith(_config()['PREFIX']) or url.path == reverse('api_batch'):
+        return {'status': 400, 'body': {'detail': "Bu manzilni batch orqali chaqirib bo'lmaydi."}}
+    try:
+        match = resolve(url.path)
+    except Resolver404:
+        return {'status': 404, 'body': {'detail': 'Topilmadi.'}}
+
+    sub_request = _build_request(request, method, url, item.get('body'))
+    sub_request.resolver_match = match
+    try:
+        response = match.func(sub_request, *match.args, **match.kwargs)
+    except Exception:
+        logger.exception('Batch sub-request failed: %s %s', method, item['url'])
+        return {'status': 500, 'body': {'detail': 'Server xatosi.'}}
+    return {'status': response.status_code, 'body': _body(response)}
+
+
+def _build_request(request, method, url, body):
+    raw = json.dumps(body).encode() if body is not None else b''
+    outer = request._request
+    environ = {
+        **outer.META,
+        # ASGI so'rovining META sida WSGI kalitlari yo'q - sxema va server tashqi so'rovdan
+        'wsgi.url_scheme': outer.scheme,
+        'SERVER_NAME': outer.META.get('SERVER_NAME') or outer.get_host().rsplit(':', 1)[0],
+        'SERVER_PORT': str(outer.get_port()),
+        'REQUEST_METHOD': method,
+        'PATH_INFO': url.path,
+        'QUERY_STRING': url.query,
+        'CONTENT_TYPE': 'application/json',
+        'CONTENT_LENGTH': str(len(raw)),
+        'HTTP_ACCEPT': 'application/json',
+        'wsgi.input': io.BytesIO(raw),
+    }
+    sub_request = WSGIRequest(environ)
+    # DRF ForcedAuthentication - token/sessiya qayta tekshirilmaydi
+    sub_request._force_auth_user = request.user
+    sub_request._force_auth_token = request.auth
+    if hasattr(outer, 'session'):
+        sub_request.session = outer.session
+    return sub_request
+
+
+def _body(response):
+    if isinstance(response, Response):
+        return response.data
+    content = getattr(response, 'content', b'')
+    if response.get('Content-Type', '').startswith('application/json'):
+        return json.loads(content) if content else None
+    return content.decode(response.charset or 'utf-8')
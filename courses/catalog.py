@@ -0,0 +1,75 @@
+# courses/catalog.py
+
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils.html import strip_tags
+from django.utils.text import Truncator
+
+from .models import Course
+
+
+SUBJECT_COURSES_CACHE_TIMEOUT = 60 * 60
+EXCERPT_WORDS = 25
+
+
+def _cache_key(subject_id):
+    return f'subject_courses:{subject_id}'
+
+
+def subject_courses(subject_id):
+    """Fanning nashr qilingan kurslari ``order`` bo'yicha - keshdan.
+
+    Kurs sahifasining yon paneli, oldingi/keyingi havolalar va fan
+    sahifasi shu ro'yxatdan olinadi. Kurslar, ularning darslari yoki
+    o'qituvchisi o'zgarganda signal orqali o'chiriladi.
+    """
+    if subject_id is None:
+        return []
+    courses = cache.get(_cache_key(subject_id))
+    if courses is None:
+        courses = build_subject_courses(subject_id)
+        cache.set(_cache_key(subject_id), courses, SUBJECT_COURSES_CACHE_TIMEOUT)
+    return courses
+
+
+def invalidate_subject_courses(*subject_ids):
+    """Tranzaksiya tugagach - aks holda eski ro'yxat bir soatga qayta keshlanishi mumkin"""
+    keys = [_cache_key(subject_id) for subject_id in subject_ids if subject_id]
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def build_subject_courses(subject_id):
+    rows = (
+        Course.objects.filter(subject_id=subject_id, is_published=True)
+        .order_by('order', '-created_at')
+        .values(
+            'pk', 'slug', 'title', 'order', 'image', 'level', 'is_free', 'price', 'duration',
+            'description', 'lessons_count', 'instructor__first_name', 'instructor__last_name',
+        )
+    )
+    return [
+        {
+            'id': row['pk'],
+            'slug': row['slug'],
+            'title': row['title'],
+            'order': row['order'],
+            'image_url': default_storage.url(row['image']) if row['image'] else None,
+            'level': row['level'],
+            'is_free': row['is_free'],
+            'price': row['price'],
+            'duration': row['duration'],
+            'excerpt': Truncator(strip_tags(row['description'])).words(EXCERPT_WORDS),
+            'lessons_count': row['lessons_count'],
+            'instructor_name': f"{row['instructor__first_name'] or ''} {row['instructor__last_name'] or ''}".strip(),
+        }
+        for row in rows
+    ]
+
+
+def course_neighbours(courses, course):
+    """Ro'yxatdagi oldingi va keyingi kurs (``Course.get_prev/next_course`` bilan bir xil)"""
+    prev_course = next((c for c in reversed(courses) if c['order'] < course.order), None)
+    next_course = next((c for c in courses if c['order'] > course.order), None)
+    return prev_course, next_course
@@ -0,0 +1,94 @@
+# courses/counters.py
+
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+
+from .models import Course, Enrollment, Lesson, Subject
+from .response_cache import bump_model_version
+
+
+# Hisoblagich: (model, ustun, bog'liq model, FK, qo'shimcha filtr)
+COUNTERS = [
+    (Subject, 'published_courses_count', Course, 'subject', {'is_published': True}),
+    (Course, 'lessons_count', Lesson, 'course', {}),
+    (Course, 'enrollments_count', Enrollment, 'course', {}),
+]
+
+
+def adjust(model, pk, field, delta):
+    """Bitta qatorni ``F()`` bilan o'zgartirish - parallel so'rovlarda ham to'g'ri.
+
+    Chaqiruvchi saqlash bilan bir tranzaksiyada bo'ladi; hisoblagich
+    manfiy bo'lib qolmasligi uchun kamaytirish 0 da to'xtaydi.
+    """
+    if pk is None or not delta:
+        return
+    value = F(field) + delta if delta > 0 else Greatest(F(field) + delta, 0)
+    model.objects.filter(pk=pk).update(**{field: value})
+
+
+# Hisoblagichga ta'sir qiluvchi maydonlar
+TRACKED_FIELDS = {
+    Course: ('subject_id', 'is_published'),
+    Lesson: ('course_id',),
+    Enrollment: ('course_id',),
+}
+
+
+def _contributions(model, state):
+    """Obyekt qaysi hisoblagichlarga +1 qo'shadi: ``{(model, pk, ustun)}``"""
+    if state is None:
+        return set()
+    if model is Course:
+        subject_id, is_published = state
+        return {(Subject, subject_id, 'published_courses_count')} if subject_id and is_published else set()
+    if model is Lesson:
+        return {(Course, state[0], 'lessons_count')}
+    return {(Course, state[0], 'enrollments_count')}
+
+
+def current_state(instance):
+    return tuple(getattr(instance, name) for name in TRACKED_FIELDS[type(instance)])
+
+
+def saved_state(instance):
+    """Bazadagi oldingi holat (yangi obyekt uchun ``None``) - pre_save da chaqiriladi"""
+    if instance._state.adding or instance.pk is None:
+        return None
+    fields = TRACKED_FIELDS[type(instance)]
+    return type(instance)._base_manager.filter(pk=instance.pk).values_list(*fields).first()
+
+
+def apply_change(model, old_state, new_state):
+    old, new = _contributions(model, old_state), _contributions(model, new_state)
+    for target, pk, field in old - new:
+        adjust(target, pk, field, -1)
+    for target, pk, field in new - old:
+        adjust(target, pk, field, 1)
+
+
+def _actual_count(related, fk, filters):
+    counts = (
+        related.objects.filter(**{fk: OuterRef('pk')}, **filters)
+        .order_by().values(fk).annotate(count=Count('pk')).values('count')
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+def reconcile():
+    """Barcha hisoblagichlarni haqiqiy sonlar bilan tenglash.
+
+    Har bir ustun uchun bitta UPDATE - faqat farq qilgan qatorlar
+    yoziladi. ``{'Course.lessons_count': tuzatilgan_qatorlar, ...}`` qaytaradi.
+    """
+    repaired = {}
+    for model, field, related, fk, filters in COUNTERS:
+        actual = _actual_count(related, fk, filters)
+        drifted = model.objects.annotate(actual=actual).exclude(**{field: F('actual')})
+        repaired[f'{model.__name__}.{field}'] = model.objects.filter(
+            pk__in=drifted.values('pk')
+        ).update(**{field: _actual_count(related, fk, filters)})
+        if repaired[f'{model.__name__}.{field}']:
+            # .update() signal yubormaydi - keshlangan API javoblarini eskirtirish
+            bump_model_version(model)
+    return repaired
@@ -0,0 +1,132 @@
+# courses/dashboard.py
+
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+
+from .fast_serializers import count_subquery
+from .models import AssignmentSubmission, Enrollment, FinalTestResult, LessonProgress
+from .request_cache import memoize
+
+
+DASHBOARD_CACHE_TIMEOUT = 60 * 5
+RECENT_LESSONS_LIMIT = 5
+
+
+def _cache_key(user_id):
+    return f'dashboard:{user_id}'
+
+
+def get_dashboard(user_id):
+    """Talaba paneli ma'lumotlari - keshdan, bo'lmasa ``build_dashboard``"""
+    return memoize(_cache_key(user_id), lambda: _load_dashboard(user_id))
+
+
+def _load_dashboard(user_id):
+    data = cache.get(_cache_key(user_id))
+    if data is None:
+        data = build_dashboard(user_id)
+        cache.set(_cache_key(user_id), data, DASHBOARD_CACHE_TIMEOUT)
+    return data
+
+
+def invalidate_dashboards(user_ids):
+    """Signallar va ``.update()`` dan keyin; tranzaksiya tugagach o'chiriladi"""
+    keys = [_cache_key(user_id) for user_id in user_ids]
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def build_dashboard(user_id):
+    """Kurslar, progress, chiqish testlari va kutilayotgan ishlar - 4 ta so'rov.
+
+    Natija faqat oddiy turlardan iborat (kesh va JSON uchun).
+    """
+    enrollments = (
+        Enrollment.objects.filter(user_id=user_id)
+        .annotate(
+            completed_lessons=count_subquery(
+                LessonProgress, 'lesson__course', outer_ref='course', user_id=user_id, completed=True
+            ),
+        )
+        .order_by('-enrolled_at')
+        .values(
+            'course_id', 'course__title', 'course__slug', 'course__image',
+            'completed', 'enrolled_at', 'course__lessons_count', 'completed_lessons',
+        )
+    )
+
+    latest_result = (
+        FinalTestResult.objects.filter(user_id=user_id, test=OuterRef('test'))
+        .order_by('-completed_at', '-pk').values('pk')[:1]
+    )
+    results = (
+        FinalTestResult.objects.filter(user_id=user_id, pk=Subquery(latest_result))
+        .annotate(attempts=count_subquery(FinalTestResult, 'test', outer_ref='test', user_id=user_id))
+        .order_by('-completed_at')
+        .values('test_id', 'test__title', 'score', 'correct', 'total', 'passed', 'completed_at', 'attempts')
+    )
+
+    pending = (
+        AssignmentSubmission.objects.filter(user_id=user_id, status='submitted')
+        .order_by('-submitted_at')
+        .values('pk', 'assignment_id', 'assignment__title', 'assignment__lesson__title', 'submitted_at')
+    )
+
+    recent_lessons = (
+        LessonProgress.objects.filter(user_id=user_id, completed=True)
+        .order_by('-completed_at')
+        .values('lesson_id', 'lesson__title', 'lesson__course__title', 'completed_at')[:RECENT_LESSONS_LIMIT]
+    )
+
+    return {
+        'enrollments': [_enrollment(row) for row in enrollments],
+        'final_tests': [
+            {
+                'test_id': row['test_id'],
+                'title': row['test__title'],
+                'score': row['score'],
+                'correct': row['correct'],
+                'total': row['total'],
+                'passed': row['passed'],
+                'attempts': row['attempts'],
+                'completed_at': row['completed_at'],
+            }
+            for row in results
+        ],
+        'pending_submissions': [
+            {
+                'id': row['pk'],
+                'assignment_id': row['assignment_id'],
+                'title': row['assignment__title'],
+                'lesson_title': row['assignment__lesson__title'],
+                'submitted_at': row['submitted_at'],
+            }
+            for row in pending
+        ],
+        'recent_lessons': [
+            {
+                'lesson_id': row['lesson_id'],
+                'title': row['lesson__title'],
+                'course_title': row['lesson__course__title'],
+                'completed_at': row['completed_at'],
+            }
+            for row in recent_lessons
+        ],
+    }
+
+
+def _enrollment(row):
+    total, completed = row['course__lessons_count'], row['completed_lessons']
+    return {
+        'course_id': row['course_id'],
+        'title': row['course__title'],
+        'slug': row['course__slug'],
+        'image_url': default_storage.url(row['course__image']) if row['course__image'] else None,
+        'total_lessons': total,
+        'completed_lessons': completed,
+        'progress': completed * 100 // total if total else 0,
+        'completed': row['completed'],
+        'enrolled_at': row['enrolled_at'],
+    }
@@ -0,0 +1,17 @@
+# courses/db.py
+
+from django.conf import settings
+
+
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    """Har bir yangi SQLite ulanishiga ``SQLITE_PRAGMAS`` ni qo'llash.
+
+    WAL rejimida o'quvchilar yozuvchini kutmaydi, ``busy_timeout`` esa
+    qulf bo'shashini kutadi - parallel benchmark va testlarda
+    ``database is locked`` xatolari kamayadi.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for name, value in getattr(settings, 'SQLITE_PRAGMAS', {}).items():
+            cursor.execute(f'PRAGMA {name} = {value}')
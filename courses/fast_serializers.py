@@ -0,0 +1,113 @@
+# courses/fast_serializers.py
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.storage import default_storage
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from rest_framework import serializers
+from rest_framework.response import Response
+
+
+def count_subquery(model, fk, outer_ref='pk', **filters):
+    """Bog'liq qatorlar soni - JOIN qatorlarni ko'paytirmasligi uchun subquery"""
+    counts = (
+        model.objects.filter(**{fk: OuterRef(outer_ref)}, **filters)
+        .order_by().values(fk).annotate(count=Count('pk')).values('count')
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+class FastListSerializer:
+    """ModelSerializer bilan bir xil JSON ni ``.values()`` qatorlaridan yig'adi.
+
+    Maydonlar ro'yxati va ``to_representation`` mavjud serializerdan
+    olinadi, shuning uchun chiqish o'zgarmaydi; faqat model obyektlari,
+    ichki serializerlar va har qator uchun alohida so'rovlar yo'qoladi.
+    Ichki obyektlar bitta JOIN li so'rovdan, ``SerializerMethodField``
+    lar esa ``annotations`` dagi ifodalardan olinadi
+    (kalit - nuqtali yo'l, masalan ``'subject.courses_count'``).
+    """
+
+    def __init__(self, serializer, annotations=None):
+        self.annotations = annotations or {}
+        self.request = serializer.context.get('request')
+        self.paths = []
+        self.extra = {}
+        self.spec = self._build_spec(serializer, '', '')
+
+    def _build_spec(self, serializer, prefix, dotted):
+        spec = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            key = dotted + name
+            if isinstance(field, serializers.BaseSerializer):
+                path = prefix + field.source
+                self.paths.append(path)
+                spec.append((name, path, self._build_spec(field, path + '__', key + '.'), None))
+            elif isinstance(field, serializers.RelatedField):
+                # ?fields= da kengaytirilmagan bog'liq obyekt - faqat id
+                path = prefix + field.source
+                self.paths.append(path)
+                spec.append((name, path, None, None))
+            elif key in self.annotations:
+                alias = 'fast_' + key.replace('.', '_')
+                self.extra[alias] = self.annotations[key]
+                spec.append((name, alias, None, None))
+            elif isinstance(field, serializers.SerializerMethodField):
+                raise ImproperlyConfigured(f"'{key}' uchun annotatsiya berilmagan")
+            else:
+                path = prefix + field.source.replace('.', '__')
+                self.paths.append(path)
+                spec.append((name, path, None, field))
+        return spec
+
+    def queryset(self, queryset, *columns):
+        """``.values()`` queryset; ``columns`` - chiqishga kirmaydigan qo'shimcha ustunlar (kursor uchun)"""
+        columns = [column for column in columns if column not in self.paths]
+        return queryset.annotate(**self.extra).values(*self.paths, *columns, *self.extra)
+
+    def to_representation(self, rows):
+        return [self._row(row, self.spec) for row in rows]
+
+    def _row(self, row, spec):
+        data = {}
+        for name, path, nested, field in spec:
+            value = row[path]
+            if value is None:
+                data[name] = None
+            elif nested is not None:
+                data[name] = self._row(row, nested)
+            elif field is None:
+                data[name] = value
+            elif isinstance(field, serializers.FileField):
+                data[name] = self._file_url(value)
+            else:
+                data[name] = field.to_representation(value)
+        return data
+
+    def _file_url(self, name):
+        # serializers.FileField.to_representation bilan bir xil, lekin FieldFile siz
+        if not name:
+            return None
+        url = default_storage.url(name)
+        if self.request is not None:
+            return self.request.build_absolute_uri(url)
+        return url
+
+
+class FastListMixin:
+    """ViewSet ``list()`` ini FastListSerializer orqali beradi"""
+    fast_list_annotations = {}
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        return self.fast_list_response(queryset, self.get_serializer())
+
+    def fast_list_response(self, queryset, serializer, paginate=True):
+        fast = FastListSerializer(serializer, self.fast_list_annotations)
+        queryset = fast.queryset(queryset)
+        page = self.paginate_queryset(queryset) if paginate else None
+        if page is not None:
+            return self.get_paginated_response(fast.to_representation(page))
+        return Response(fast.to_representation(queryset))
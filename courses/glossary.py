@@ -0,0 +1,177 @@
+# courses/glossary.py
+
+import base64
+import json
+import threading
+import time
+import unicodedata
+from bisect import bisect_left
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q
+
+from .models import Term
+from .request_cache import memoize
+
+
+GLOSSARY_PAGE_SIZE = 30
+LETTERS_CACHE_KEY = 'glossary:letters'
+VERSION_CACHE_KEY = 'glossary:version'
+AUTOCOMPLETE_LIMIT = 10
+# To'liq qidiruv (icontains) natijalari chegarasi
+SEARCH_LIMIT = 50
+# Keyset tartibi; ``.values()`` queryseti bu ustunlarni doim o'z ichiga olishi kerak
+CURSOR_FIELDS = ('order', 'title', 'id')
+
+
+def letter_index():
+    """Faol atamalar harflar bo'yicha: ``[{'letter': 'A', 'count': 12}, ...]``.
+
+    Natija keshda saqlanadi va atamalar o'zgarganda signal orqali o'chiriladi.
+    """
+    return memoize(LETTERS_CACHE_KEY, _load_letter_index)
+
+
+def _load_letter_index():
+    letters = cache.get(LETTERS_CACHE_KEY)
+    if letters is None:
+        letters = list(
+            Term.objects.filter(is_active=True).order_by('letter')
+            .values('letter').annotate(count=Count('pk'))
+        )
+        cache.set(LETTERS_CACHE_KEY, letters, None)
+    return letters
+
+
+def invalidate_letter_index():
+    """Tranzaksiya tugagach - aks holda eski sonlar muddatsiz qayta keshlanishi mumkin"""
+    transaction.on_commit(lambda: cache.delete(LETTERS_CACHE_KEY))
+
+
+def encode_cursor(order, title, pk):
+    data = json.dumps([order, title, pk], ensure_ascii=False).encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Kursordan ``(order, title, pk)``; noto'g'ri bo'lsa ``ValueError``"""
+    try:
+        order, title, pk = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except (TypeError, ValueError):
+        raise ValueError("Noto'g'ri kursor")
+    if not isinstance(order, int) or not isinstance(title, str) or not isinstance(pk, int):
+        raise ValueError("Noto'g'ri kursor")
+    return order, title, pk
+
+
+def term_page(queryset=None, letter=None, cursor=None, limit=GLOSSARY_PAGE_SIZE):
+    """(order, title, id) bo'yicha keyset sahifa.
+
+    ``queryset`` ``.values()`` bo'lishi ham mumkin - unda ``CURSOR_FIELDS``
+    ustunlari tanlangan bo'lishi kerak. ``(items, next_cursor)`` qaytaradi;
+    oxirgi sahifada ``next_cursor`` ``None``.
+    """
+    if queryset is None:
+        queryset = Term.objects.filter(is_active=True)
+    if letter:
+        queryset = queryset.filter(letter=letter)
+    if cursor:
+        order, title, pk = decode_cursor(cursor)
+        queryset = queryset.filter(
+            Q(order__gt=order)
+            | Q(order=order, title__gt=title)
+            | Q(order=order, title=title, pk__gt=pk)
+        )
+
+    items = list(queryset.order_by('order', 'title', 'pk')[:limit + 1])
+    if len(items) <= limit:
+        return items, None
+    last = items[limit - 1]
+    if isinstance(last, dict):
+        return items[:limit], encode_cursor(*(last[name] for name in CURSOR_FIELDS))
+    return items[:limit], encode_cursor(last.order, last.title, last.pk)
+
+
+# ========================
+# AUTOCOMPLETE
+# ========================
+APOSTROPHES = str.maketrans({'\u2018': "'", '\u2019': "'", '\u02bb': "'", '\u02bc': "'", '`': "'"})
+
+
+def normalize(text):
+    """Qidiruv uchun: kichik harf, diakritikasiz, apostroflar bir xil (o‘ -> o')"""
+    text = unicodedata.normalize('NFKD', text.translate(APOSTROPHES).casefold())
+    return ' '.join(''.join(ch for ch in text if not unicodedata.combining(ch)).split())
+
+
+def bump_version():
+    """Atamalar o'zgardi - jarayonlardagi autocomplete indekslari qayta quriladi.
+
+    Versiya tranzaksiya tugagach yoziladi va hech qachon takrorlanmaydi
+    (``time_ns``) - aks holda boshqa jarayon eski qatorlardan yangi versiya
+    ostida indeks qurishi yoki eski versiyani qayta ko'rishi mumkin.
+    """
+    transaction.on_commit(lambda: cache.set(VERSION_CACHE_KEY, time.time_ns(), None))
+
+
+def current_version():
+    version = cache.get(VERSION_CACHE_KEY)
+    if version is None:
+        # Kalit o'chib ketgan - yangi versiya, shunda barcha jarayonlar qayta quradi
+        cache.add(VERSION_CACHE_KEY, time.time_ns(), None)
+        version = cache.get(VERSION_CACHE_KEY)
+    return version
+
+
+class AutocompleteIndex:
+    """Atama nomlarining xotiradagi saralangan indeksi.
+
+    Har bir nomdagi har so'z boshidan boshlangan qism alohida kalit, shuning
+    uchun "sav" "Media savodxonligi" ni ham topadi. Qidiruv ``bisect`` bilan;
+    bazaga faqat keshdagi versiya o'zgarganda bir marta murojaat qilinadi.
+    """
+
+    def __init__(self):
+        self.version = None
+        self._data = ([], [])
+        self._lock = threading.Lock()
+
+    def ensure_current(self):
+        version = current_version()
+        if version == self.version:
+            return
+        with self._lock:
+            if version != self.version:
+                self._build(version)
+
+    def _build(self, version):
+        items = []
+        for pk, title, letter in Term.objects.filter(is_active=True).values_list('pk', 'title', 'letter'):
+            words = normalize(title).split(' ')
+            entry = {'id': pk, 'title': title, 'letter': letter}
+            for i in range(len(words)):
+                items.append((' '.join(words[i:]), pk, entry))
+        items.sort(key=lambda item: (item[0], item[1]))
+        # Ikkala ro'yxat birga almashtiriladi - o'quvchilar qulfsiz ishlaydi
+        self._data = ([item[0] for item in items], [item[2] for item in items])
+        self.version = version
+
+    def lookup(self, prefix, limit=AUTOCOMPLETE_LIMIT):
+        self.ensure_current()
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        keys, entries = self._data
+        results, seen = [], set()
+        i = bisect_left(keys, prefix)
+        while i < len(keys) and keys[i].startswith(prefix) and len(results) < limit:
+            entry = entries[i]
+            if entry['id'] not in seen:
+                seen.add(entry['id'])
+                results.append(entry)
+            i += 1
+        return results
+
+
+autocomplete_index = AutocompleteIndex()
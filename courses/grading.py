@@ -0,0 +1,73 @@
+# courses/grading.py
+
+from django.core.files.storage import default_storage
+from django.db.models.functions import Now
+
+from .dashboard import invalidate_dashboards
+from .models import AssignmentSubmission
+
+
+QUEUE_PAGE_SIZE = 25
+
+QUEUE_FIELDS = [
+    'pk', 'user_id', 'user__username', 'user__first_name', 'user__last_name',
+    'submission_file', 'comment', 'status', 'score', 'feedback', 'submitted_at',
+]
+
+
+def submission_queue(assignment, after=None, limit=QUEUE_PAGE_SIZE, status='submitted'):
+    """Baholash navbati - id bo'yicha keyset sahifalash.
+
+    ``(rows, next_cursor)`` qaytaradi; ``next_cursor`` keyingi sahifa uchun
+    ``after`` qiymati, navbat tugagan bo'lsa ``None``.
+    """
+    queryset = AssignmentSubmission.objects.filter(assignment=assignment, status=status)
+    if after:
+        queryset = queryset.filter(pk__gt=after)
+
+    rows = list(queryset.order_by('pk').values(*QUEUE_FIELDS)[:limit + 1])
+    next_cursor = rows[limit - 1]['pk'] if len(rows) > limit else None
+    return [_queue_item(row) for row in rows[:limit]], next_cursor
+
+
+def _queue_item(row):
+    full_name = f"{row['user__first_name']} {row['user__last_name']}".strip()
+    return {
+        'id': row['pk'],
+        'user_id': row['user_id'],
+        'username': row['user__username'],
+        'full_name': full_name or row['user__username'],
+        'file_url': default_storage.url(row['submission_file']) if row['submission_file'] else None,
+        'comment': row['comment'],
+        'status': row['status'],
+        'score': row['score'],
+        'feedback': row['feedback'],
+        'submitted_at': row['submitted_at'].isoformat(),
+    }
+
+
+def bulk_grade(assignment, ids, status, score=None, feedback=None):
+    """Tanlangan ishlarni bitta UPDATE bilan baholash.
+
+    ``reviewed_at`` bazaning joriy vaqti bilan belgilanadi. Yangilangan
+    qatorlar sonini qaytaradi.
+    """
+    valid_statuses = {key for key, _ in AssignmentSubmission.STATUS_CHOICES} - {'submitted'}
+    if status not in valid_statuses:
+        raise ValueError(f"Noto'g'ri holat: {status}")
+    if score is not None and not 0 <= score <= assignment.max_score:
+        raise ValueError(f"Ball 0 va {assignment.max_score} oralig'ida bo'lishi kerak")
+
+    values = {'status': status, 'reviewed_at': Now()}
+    if score is not None:
+        values['score'] = score
+    if feedback is not None:
+        values['feedback'] = feedback
+    submissions = AssignmentSubmission.objects.filter(assignment=assignment, pk__in=ids)
+    user_ids = set(submissions.values_list('user_id', flat=True))
+    # .update() post_save yubormaydi, bu ataylab: statistika faqat ``submitted_at``
+    # ni kuzatadi (o'zgarmaydi), jonli lenta faqat yangi ishlarni e'lon qiladi,
+    # javoblar keshi topshiriqlarni saqlamaydi. Faqat dashboardlar qo'lda tozalanadi.
+    updated = submissions.update(**values)
+    invalidate_dashboards(user_ids)
+    return updated
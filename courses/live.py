@@ -0,0 +1,215 @@
+# courses/live.py
+
+import asyncio
+import json
+import threading
+from collections import OrderedDict, deque
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db import DatabaseError, close_old_connections
+from django.db.models import Max
+
+from . import metrics
+from .models import AssignmentSubmission, FinalTestResult
+
+
+DEFAULT_LIVE_FEED = {
+    # Faqat ASGI da: WSGI da ochiq SSE ulanish butun ``MAX_AGE`` davomida workerni band qiladi
+    'ENABLED': False,
+    # Boshqa workerlarda yaratilgan yozuvlar uchun bazani so'rash oralig'i (0 - o'chiq)
+    'POLL_INTERVAL': 3,
+    # Kechroq commit bo'lgan kichik id larni ham ko'rish uchun orqaga qarash
+    'POLL_LOOKBACK': 50,
+    'HEARTBEAT': 15,
+    # Ulanish shu vaqtdan keyin yopiladi, brauzer Last-Event-ID bilan qayta ulanadi
+    'MAX_AGE': 300,
+    'RETRY': 3000,
+    'BUFFER': 200,
+    'QUEUE_SIZE': 100,
+}
+SEEN_LIMIT = 2000
+
+
+def _config():
+    return {**DEFAULT_LIVE_FEED, **getattr(settings, 'LIVE_FEED', {})}
+
+
+def live_feed_enabled(request=None):
+    """Lenta yoqilgan va (``request`` berilsa) so'rov ASGI orqali kelgan"""
+    if not _config()['ENABLED']:
+        return False
+    return request is None or isinstance(request, ASGIRequest)
+
+
+# ========================
+# EVENTS
+# ========================
+
+def _submission_event(row):
+    return {
+        'id': row['pk'],
+        'username': row['user__username'],
+        'assignment': row['assignment__title'],
+        'status': row['status'],
+        'submitted_at': row['submitted_at'].isoformat(),
+    }
+
+
+def _result_event(row):
+    return {
+        'id': row['pk'],
+        'username': row['user__username'],
+        'test': row['test__title'],
+        'score': row['score'],
+        'passed': row['passed'],
+        'completed_at': row['completed_at'].isoformat(),
+    }
+
+
+SOURCES = {
+    'submission': (
+        AssignmentSubmission,
+        ('pk', 'status', 'submitted_at', 'user__username', 'assignment__title'),
+        _submission_event,
+    ),
+    'result': (
+        FinalTestResult,
+        ('pk', 'score', 'passed', 'completed_at', 'user__username', 'test__title'),
+        _result_event,
+    ),
+}
+
+
+def load_events(kind, limit=None, **filters):
+    """``[{'type': kind, 'data': {...}}, ...]`` - bitta JOIN li so'rov"""
+    model, fields, build = SOURCES[kind]
+    rows = model.objects.filter(**filters).order_by('pk').values(*fields)
+    if limit:
+        rows = rows[:limit]
+    return [{'type': kind, 'data': build(row)} for row in rows]
+
+
+# ========================
+# FEED
+# ========================
+
+class LiveFeed:
+    """Jarayon ichidagi pub/sub: har bir SSE ulanish - bitta ``asyncio.Queue``.
+
+    Hodisalar ikki yo'ldan keladi: shu jarayondagi ``post_save`` signallari
+    (darhol) va bir nechta worker bo'lsa bazani so'raydigan yagona poller.
+    Ikkalasi ham ``(tur, id)`` bo'yicha takrorlardan tozalanadi. Kuzatuvchilar
+    soni qancha bo'lmasin, jarayon bo'yicha bitta poller ishlaydi; kuzatuvchi
+    bo'lmasa hech narsa so'ralmaydi.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = {}
+        self._buffer = deque(maxlen=_config()['BUFFER'])
+        self._seen = OrderedDict()
+        self._high = {}
+        self._seq = 0
+        self._poller = None
+
+    def has_subscribers(self):
+        return bool(self._subscribers)
+
+    def publish(self, events):
+        """Istalgan threaddan chaqirish mumkin"""
+        new = []
+        with self._lock:
+            for event in events:
+                key = (event['type'], event['data']['id'])
+                if key in self._seen:
+                    continue
+                self._seen[key] = None
+                if len(self._seen) > SEEN_LIMIT:
+                    self._seen.popitem(last=False)
+                self._high[key[0]] = max(self._high.get(key[0], 0), key[1])
+                self._seq += 1
+                new.append((self._seq, event))
+            self._buffer.extend(new)
+            subscribers = list(self._subscribers.items())
+        if not new:
+            return
+        metrics.incr('live.events', len(new))
+        for queue, loop in subscribers:
+            loop.call_soon_threadsafe(_deliver, queue, new)
+
+    def subscribe(self, last_id=None):
+        """Yangi ulanish; ``last_id`` dan keyingi buferdagi hodisalar ham beriladi"""
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(_config()['QUEUE_SIZE'])
+        with self._lock:
+            self._subscribers[queue] = loop
+            backlog = [item for item in self._buffer if last_id is not None and item[0] > last_id]
+            if _config()['POLL_INTERVAL'] and (self._poller is None or self._poller.done()):
+                self._poller = loop.create_task(self._poll())
+        _deliver(queue, backlog)
+        metrics.incr('live.connections')
+        return queue
+
+    def unsubscribe(self, queue):
+        with self._lock:
+            self._subscribers.pop(queue, None)
+
+    async def _poll(self):
+        config = _config()
+        while self._subscribers:
+            await asyncio.sleep(config['POLL_INTERVAL'])
+            try:
+                events = await sync_to_async(self._fetch)(config['POLL_LOOKBACK'])
+            except DatabaseError:
+                metrics.incr('live.poll_errors')
+                continue
+            self.publish(events)
+
+    def _fetch(self, lookback):
+        try:
+            events = []
+            for kind, (model, _, _) in SOURCES.items():
+                high = self._high.get(kind)
+                if high is None:
+                    # Birinchi so'rov: eski yozuvlar emas, faqat bundan keyingilari
+                    with self._lock:
+                        self._high.setdefault(kind, model.objects.aggregate(pk=Max('pk'))['pk'] or 0)
+                    continue
+                events.extend(load_events(kind, limit=lookback * 4, pk__gt=max(high - lookback, 0)))
+            metrics.incr('live.polls')
+            return events
+        finally:
+            close_old_connections()
+
+
+def _deliver(queue, items):
+    for item in items:
+        try:
+            queue.put_nowait(item)
+        except asyncio.QueueFull:
+            # Sekin mijoz - hodisa tashlanadi, sahifa yangilanganda ko'rinadi
+            metrics.incr('live.dropped')
+
+
+live_feed = LiveFeed()
+
+
+async def event_stream(last_id=None):
+    """SSE oqimi: hodisalar, ``HEARTBEAT`` da bir izoh qatori, ``MAX_AGE`` da yopilish"""
+    config = _config()
+    loop = asyncio.get_running_loop()
+    queue = live_feed.subscribe(last_id)
+    try:
+        yield f"retry: {config['RETRY']}\n\n"
+        deadline = loop.time() + config['MAX_AGE']
+        while loop.time() < deadline:
+            try:
+                seq, event = await asyncio.wait_for(queue.get(), config['HEARTBEAT'])
+            except asyncio.TimeoutError:
+                yield ': ping\n\n'
+                continue
+            yield f"id: {seq}\nevent: {event['type']}\ndata: {json.dumps(event['data'])}\n\n"
+    finally:
+        live_feed.unsubscribe(queue)
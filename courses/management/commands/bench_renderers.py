@@ -0,0 +1,67 @@
+import time
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import RequestFactory
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from courses.fast_serializers import FastListSerializer
+from courses.models import Course, Term
+from courses.renderers import FastJSONRenderer, MessagePackRenderer, msgpack, orjson
+from courses.serializers import CourseSerializer, TermSerializer
+from courses.views import CourseViewSet, TermViewSet
+
+from .bench_serializers import Command as SerializerBench, Rollback
+
+
+class Command(BaseCommand):
+    help = "JSONRenderer, FastJSONRenderer va MessagePack renderer tezligini solishtiradi (1000 obyektga ms)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=1000)
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            raise CommandError("orjson o'rnatilmagan")
+        try:
+            with transaction.atomic():
+                SerializerBench(stdout=self.stdout).seed(options['count'])
+                self.run(options['repeat'])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def run(self, repeat):
+        request = Request(RequestFactory().get('/api/'))
+        context = {'request': request}
+        cases = [
+            ('courses', CourseSerializer, CourseViewSet, Course.objects.filter(is_published=True)),
+            ('terms', TermSerializer, TermViewSet, Term.objects.filter(is_active=True)),
+        ]
+        renderers = [('json', JSONRenderer()), ('orjson', FastJSONRenderer())]
+        if msgpack is not None:
+            renderers.append(('msgpack', MessagePackRenderer()))
+
+        self.stdout.write(f"Baza: {connection.vendor}")
+        header = ''.join(f'{name + " (ms)":>16}{"bayt":>10}' for name, _ in renderers)
+        self.stdout.write(f"{'Endpoint':<10}{'Obyekt':>8}{header}")
+        for name, serializer_class, viewset, queryset in cases:
+            fast = FastListSerializer(serializer_class(context=context), viewset.fast_list_annotations)
+            data = fast.to_representation(fast.queryset(queryset))
+            count = len(data) or 1
+
+            outputs, line = {}, ''
+            for renderer_name, renderer in renderers:
+                started = time.perf_counter()
+                for _ in range(repeat):
+                    output = renderer.render(data)
+                elapsed = (time.perf_counter() - started) / repeat
+                outputs[renderer_name] = output
+                line += f'{elapsed * 1e6 / count:>16.2f}{len(output):>10}'
+
+            if outputs['json'] != outputs['orjson']:
+                raise CommandError(f"{name}: JSON chiqishi farq qiladi")
+            self.stdout.write(f'{name:<10}{count:>8}{line}')
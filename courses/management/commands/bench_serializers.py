@@ -0,0 +1,90 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import RequestFactory
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from courses.fast_serializers import FastListSerializer
+from courses.models import Category, Course, Lesson, Post, Subject, Term, User
+from courses.serializers import CourseSerializer, PostSerializer, SubjectSerializer, TermSerializer
+from courses.views import CourseViewSet, PostViewSet, SubjectViewSet, TermViewSet
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "ModelSerializer va FastListSerializer ro'yxat serializatsiyasini solishtiradi (1000 obyektga ms)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        # Sinov ma'lumotlari tranzaksiya ichida yaratiladi va oxirida bekor qilinadi
+        try:
+            with transaction.atomic():
+                self.seed(options['count'])
+                self.run()
+                raise Rollback
+        except Rollback:
+            pass
+
+    def seed(self, count):
+        instructor = User.objects.create_user('bench_instructor', password=None)
+        category = Category.objects.create(name='Bench', slug='bench-category')
+        subjects = Subject.objects.bulk_create(
+            Subject(name=f'Fan {i}', slug=f'bench-subject-{i}') for i in range(count // 20 or 1)
+        )
+        courses = Course.objects.bulk_create(
+            Course(
+                title=f'Kurs {i}', slug=f'bench-course-{i}', subject=subjects[i % len(subjects)],
+                category=category, instructor=instructor, description='<p>Tavsif</p>' * 20,
+                image='courses/bench.jpg', duration='4 hafta', price='120000.00', is_published=True,
+            )
+            for i in range(count)
+        )
+        Lesson.objects.bulk_create(
+            Lesson(course=course, title=f'Dars {j}', content='...', order=j)
+            for course in courses for j in range(3)
+        )
+        Post.objects.bulk_create(
+            Post(title=f'Maqola {i}', slug=f'bench-post-{i}', content='<p>Matn</p>' * 20,
+                 author=instructor, is_published=True)
+            for i in range(count)
+        )
+        Term.objects.bulk_create(
+            Term(title=f'Atama {i}', description='<p>Ta\'rif</p>' * 10) for i in range(count)
+        )
+
+    def run(self):
+        request = Request(RequestFactory().get('/api/'))
+        context = {'request': request}
+        cases = [
+            ('courses', CourseSerializer, CourseViewSet, Course.objects.filter(is_published=True)),
+            ('subjects', SubjectSerializer, SubjectViewSet, Subject.objects.filter(is_active=True)),
+            ('posts', PostSerializer, PostViewSet, Post.objects.filter(is_published=True)),
+            ('terms', TermSerializer, TermViewSet, Term.objects.filter(is_active=True)),
+        ]
+        renderer = JSONRenderer()
+        self.stdout.write(f"Baza: {connection.vendor}")
+        self.stdout.write(f"{'Endpoint':<10}{'Obyekt':>8}{'Oldin (ms/1000)':>18}{'Keyin (ms/1000)':>18}{'Tezlanish':>11}")
+        for name, serializer_class, viewset, queryset in cases:
+            started = time.perf_counter()
+            before = serializer_class(queryset, many=True, context=context).data
+            before_time = time.perf_counter() - started
+
+            started = time.perf_counter()
+            fast = FastListSerializer(serializer_class(context=context), viewset.fast_list_annotations)
+            after = fast.to_representation(fast.queryset(queryset))
+            after_time = time.perf_counter() - started
+
+            if renderer.render(before) != renderer.render(after):
+                raise CommandError(f"{name}: JSON chiqishi farq qiladi")
+            count = len(after) or 1
+            self.stdout.write(
+                f"{name:<10}{count:>8}{before_time * 1e6 / count:>18.1f}"
+                f"{after_time * 1e6 / count:>18.1f}{before_time / after_time:>10.1f}x"
+            )
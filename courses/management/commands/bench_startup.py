@@ -0,0 +1,50 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from django.core.management.base import BaseCommand
+
+
+# Alohida jarayonda worker ishga tushishini takrorlaydi: WSGI ilova, URLconf va middleware
+STARTUP_SCRIPT = """
+import json, resource, sys, time
+started = time.perf_counter()
+from django.core.wsgi import get_wsgi_application
+application = get_wsgi_application()
+from django.urls import get_resolver
+get_resolver().url_patterns
+print(json.dumps({
+    'seconds': time.perf_counter() - started,
+    'rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    'modules': len(sys.modules),
+}))
+"""
+
+
+class Command(BaseCommand):
+    help = "Har bir deployment profili uchun worker ishga tushish vaqti va xotirasini o'lchaydi"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--profiles', nargs='+', default=['public', 'admin'])
+        parser.add_argument('--runs', type=int, default=5)
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'Profil':<10}{'Vaqt (ms)':>12}{'RSS (MB)':>12}{'Modullar':>12}")
+        for profile in options['profiles']:
+            samples = [self.measure(profile) for _ in range(options['runs'])]
+            self.stdout.write(
+                f"{profile:<10}"
+                f"{statistics.median(s['seconds'] for s in samples) * 1000:>12.1f}"
+                f"{statistics.median(s['rss_kb'] for s in samples) / 1024:>12.1f}"
+                f"{statistics.median(s['modules'] for s in samples):>12.0f}"
+            )
+
+    def measure(self, profile):
+        env = {**os.environ, 'APP_PROFILE': profile}
+        output = subprocess.run(
+            [sys.executable, '-c', STARTUP_SCRIPT],
+            env=env, capture_output=True, text=True, check=True,
+        ).stdout
+        return json.loads(output.strip().splitlines()[-1])
@@ -0,0 +1,65 @@
+import json
+import os
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.utils import matches_patterns
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Statik fayllarni yig'adi (hash nomlar, gzip/brotli) va hajm tejamini hisoblaydi"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--no-clear', action='store_true',
+                            help="STATIC_ROOT ni oldindan tozalamaslik")
+
+    def handle(self, *args, **options):
+        pruned_files, pruned_bytes = self.pruned_sources()
+        call_command('collectstatic', interactive=False, clear=not options['no_clear'], verbosity=0)
+
+        manifest_path = os.path.join(settings.STATIC_ROOT, 'staticfiles.json')
+        with open(manifest_path) as manifest:
+            hashed_names = json.load(manifest)['paths'].values()
+
+        raw = gzip = brotli = transfer = 0
+        for name in hashed_names:
+            path = os.path.join(settings.STATIC_ROOT, name)
+            size = os.path.getsize(path)
+            gz_size = self.size_or_none(path + '.gz')
+            br_size = self.size_or_none(path + '.br')
+            raw += size
+            gzip += gz_size if gz_size is not None else size
+            brotli += br_size if br_size is not None else size
+            transfer += min(s for s in (size, gz_size, br_size) if s is not None)
+
+        self.stdout.write(f"Fayllar: {len(hashed_names)} ta (hash nomli, immutable)")
+        self.stdout.write(f"O'tkazib yuborilgan vendor fayllar: {pruned_files} ta, {self.mb(pruned_bytes)}")
+        self.stdout.write(f"Asl hajm:      {self.mb(raw)}")
+        self.stdout.write(f"gzip bilan:    {self.mb(gzip)}")
+        self.stdout.write(f"brotli bilan:  {self.mb(brotli)}")
+        saved = raw - transfer
+        percent = saved * 100 / raw if raw else 0
+        self.stdout.write(self.style.SUCCESS(f"Uzatishda tejam: {self.mb(saved)} ({percent:.1f}%)"))
+
+    def pruned_sources(self):
+        patterns = getattr(settings, 'STATIC_PRUNE_PATTERNS', [])
+        count = size = 0
+        seen = set()
+        for finder in finders.get_finders():
+            for path, storage in finder.list([]):
+                if path in seen or not matches_patterns(path, patterns):
+                    continue
+                seen.add(path)
+                count += 1
+                size += storage.size(path)
+        return count, size
+
+    @staticmethod
+    def size_or_none(path):
+        return os.path.getsize(path) if os.path.exists(path) else None
+
+    @staticmethod
+    def mb(size):
+        return f"{size / 1024 / 1024:.2f} MB"
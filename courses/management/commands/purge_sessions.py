@@ -0,0 +1,33 @@
+import time
+
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = "Muddati o'tgan sessiyalarni kichik bo'laklarda o'chiradi"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000,
+                            help="Bitta DELETE dagi sessiyalar soni")
+        parser.add_argument('--sleep', type=float, default=0.0,
+                            help="Bo'laklar orasidagi pauza (sekund)")
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        now = timezone.now()
+        total = 0
+        while True:
+            # Har bir bo'lak alohida qisqa tranzaksiyada o'chiriladi
+            keys = list(
+                Session.objects.filter(expire_date__lt=now)
+                .values_list('session_key', flat=True)[:chunk_size]
+            )
+            if not keys:
+                break
+            deleted, _ = Session.objects.filter(session_key__in=keys).delete()
+            total += deleted
+            if options['sleep']:
+                time.sleep(options['sleep'])
+        self.stdout.write(self.style.SUCCESS(f"{total} ta sessiya o'chirildi"))
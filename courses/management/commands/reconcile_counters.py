@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from courses.counters import reconcile
+
+
+class Command(BaseCommand):
+    help = "Fan va kurs hisoblagichlarini haqiqiy sonlar bilan tenglaydi"
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            repaired = reconcile()
+        for name, count in repaired.items():
+            self.stdout.write(f"{name}: {count} ta qator tuzatildi")
+        self.stdout.write(self.style.SUCCESS(f"Jami: {sum(repaired.values())}"))
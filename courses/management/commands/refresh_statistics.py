@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from courses.statistics import refresh
+
+
+class Command(BaseCommand):
+    help = "Platforma statistikasini (Statistic jadvali) haqiqiy sonlar bilan qayta hisoblaydi"
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            changed = refresh()
+        for key, (old, new) in sorted(changed.items()):
+            self.stdout.write(f"{key}: {old} -> {new}")
+        self.stdout.write(self.style.SUCCESS(f"Jami: {len(changed)} ta ko'rsatkich yangilandi"))
@@ -0,0 +1,33 @@
+# courses/metrics.py
+
+import threading
+from collections import defaultdict
+
+
+_lock = threading.Lock()
+_counters = defaultdict(int)
+_gauges = {}
+
+
+def incr(name, value=1):
+    """Jarayon ichidagi hisoblagichni oshirish"""
+    with _lock:
+        _counters[name] += value
+
+
+def value(name):
+    with _lock:
+        return _counters.get(name, 0)
+
+
+def register_gauge(name, func):
+    """Joriy qiymatni so'rov paytida hisoblaydigan o'lchov"""
+    _gauges[name] = func
+
+
+def snapshot():
+    with _lock:
+        data = dict(_counters)
+    for name, func in list(_gauges.items()):
+        data[name] = func()
+    return dict(sorted(data.items()))
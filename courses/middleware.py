@@ -0,0 +1,427 @@
+# courses/middleware.py
+
+import gzip
+import io
+import re
+import secrets
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.sessions.middleware import SessionMiddleware as BaseSessionMiddleware
+from django.http import HttpResponse
+from django.urls import Resolver404, resolve
+from django.utils.cache import patch_vary_headers
+from django.utils.crypto import get_random_string
+
+from . import metrics
+from .profiling import DEFAULT_REQUEST_PROFILER, Profile
+
+try:
+    import brotli
+except ImportError:  # brotli o'rnatilmagan bo'lsa faqat gzip
+    brotli = None
+
+
+# ========================
+# SESSION
+# ========================
+class SessionMiddleware(BaseSessionMiddleware):
+    """Sessiya muddatini har so'rovda emas, ``SESSION_REFRESH_INTERVAL`` da bir marta yangilaydi.
+
+    Faol foydalanuvchining sessiyasi ``SESSION_COOKIE_AGE`` tugashidan oldin
+    uzaytiriladi, lekin bitta interval ichidagi boshqa so'rovlar sessiyani
+    qayta yozmaydi.
+    """
+
+    refreshed_key = '_session_refreshed_at'
+
+    def process_response(self, request, response):
+        session = getattr(request, 'session', None)
+        if session is not None and session.accessed and not session.modified and not session.is_empty():
+            now = int(time.time())
+            interval = getattr(settings, 'SESSION_REFRESH_INTERVAL', 60 * 60)
+            if now - session.get(self.refreshed_key, 0) >= interval:
+                session[self.refreshed_key] = now
+        return super().process_response(request, response)
+
+
+# ========================
+# ADMISSION CONTROL
+# ========================
+DEFAULT_ADMISSION_CONTROL = {
+    'ENABLED': True,
+    'MAX_CONCURRENT': 64,
+    'RETRY_AFTER': 5,
+    'CLASSES': {
+        'exam': {'limit': 48, 'queue': 200, 'timeout': 10, 'priority': 0},
+        'catalog': {'limit': 24, 'queue': 50, 'timeout': 2, 'priority': 1},
+        'admin': {'limit': 8, 'queue': 10, 'timeout': 2, 'priority': 2},
+    },
+    'ROUTES': {
+        'final_test_detail': 'exam',
+        'quiz_submit': 'exam',
+    },
+    'DEFAULT_CLASS': 'catalog',
+}
+
+
+class AdmissionController:
+    """Marshrut sinflari bo'yicha parallel so'rovlar chegarasi va navbati.
+
+    Har bir sinfning o'z limiti va navbat uzunligi bor; umumiy
+    ``MAX_CONCURRENT`` to'lganda bo'shagan joy yuqori ustuvorlikdagi
+    (kichik ``priority``) kutayotgan so'rovga beriladi.
+    """
+
+    def __init__(self, classes, max_concurrent):
+        self.classes = classes
+        self.max_concurrent = max_concurrent
+        self.active = {name: 0 for name in classes}
+        self.waiting = {name: 0 for name in classes}
+        self._cond = threading.Condition()
+        for name in classes:
+            metrics.register_gauge(f'admission.{name}.active', lambda name=name: self.active[name])
+            metrics.register_gauge(f'admission.{name}.waiting', lambda name=name: self.waiting[name])
+
+    def _can_enter(self, name):
+        config = self.classes[name]
+        if self.active[name] >= config['limit']:
+            return False
+        return sum(self.active.values()) < self.max_concurrent
+
+    def _yield_to_higher_priority(self, name):
+        # Umumiy sig'im uchun kutayotgan yuqori ustuvorlikdagi sinf bo'lsa, navbatni bo'shatamiz
+        priority = self.classes[name]['priority']
+        return any(
+            self.waiting[other] and self.active[other] < config['limit']
+            for other, config in self.classes.items()
+            if config['priority'] < priority
+        )
+
+    def acquire(self, name):
+        """Joy olinsa ``True``; navbat to'la yoki kutish muddati tugasa ``False``"""
+        config = self.classes[name]
+        with self._cond:
+            if self._can_enter(name) and not self._yield_to_higher_priority(name):
+                self.active[name] += 1
+                return True
+            if self.waiting[name] >= config['queue']:
+                metrics.incr(f'admission.{name}.rejected')
+                return False
+
+            self.waiting[name] += 1
+            deadline = time.monotonic() + config['timeout']
+            try:
+                while not (self._can_enter(name) and not self._yield_to_higher_priority(name)):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        metrics.incr(f'admission.{name}.timeouts')
+                        return False
+                    self._cond.wait(remaining)
+                self.active[name] += 1
+                return True
+            finally:
+                self.waiting[name] -= 1
+                self._cond.notify_all()
+
+    def release(self, name):
+        with self._cond:
+            self.active[name] -= 1
+            self._cond.notify_all()
+
+
+class AdmissionControlMiddleware:
+    """Imtihon paytidagi yuklamada so'rovlarni sinflar bo'yicha cheklaydi.
+
+    Joy bo'lmasa so'rov kutmasdan ``503`` va ``Retry-After`` bilan
+    qaytariladi, shuning uchun tizim bir tekis sekinlashadi.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.config = {**DEFAULT_ADMISSION_CONTROL, **getattr(settings, 'ADMISSION_CONTROL', {})}
+        self.controller = AdmissionController(self.config['CLASSES'], self.config['MAX_CONCURRENT'])
+
+    def __call__(self, request):
+        if not self.config['ENABLED']:
+            return self.get_response(request)
+
+        route_class = self.classify(request)
+        if not self.controller.acquire(route_class):
+            response = HttpResponse(
+                "Server hozir band, iltimos birozdan so'ng qayta urinib ko'ring.",
+                status=503, content_type='text/plain; charset=utf-8'
+            )
+            response['Retry-After'] = str(self.config['RETRY_AFTER'])
+            return response
+
+        metrics.incr(f'admission.{route_class}.admitted')
+        try:
+            return self.get_response(request)
+        finally:
+            self.controller.release(route_class)
+
+    def classify(self, request):
+        if request.path_info.startswith('/admin/'):
+            return 'admin'
+        try:
+            url_name = resolve(request.path_info).url_name
+        except Resolver404:
+            url_name = None
+        return self.config['ROUTES'].get(url_name, self.config['DEFAULT_CLASS'])
+
+
+# ========================
+# REQUEST PROFILER
+# ========================
+class RequestProfilerMiddleware:
+    """Xodim so'rovini ``?_profile=1`` yoki ``X-Profile: 1`` bilan profillaydi.
+
+    Stek namunalari, SQL va shablonlar vaqt chizig'i ``RequestProfile`` ga
+    yoziladi, javobga ``X-Profile-Id`` qo'shiladi. Belgisiz so'rovlar uchun
+    faqat sarlavha va query string tekshiriladi - sessiya ham o'qilmaydi.
+    ``AuthenticationMiddleware`` dan keyin turishi kerak.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.config = {**DEFAULT_REQUEST_PROFILER, **getattr(settings, 'REQUEST_PROFILER', {})}
+        self.header = 'HTTP_' + self.config['HEADER'].upper().replace('-', '_')
+
+    def __call__(self, request):
+        if not self.config['ENABLED'] or not self._requested(request) or not request.user.is_staff:
+            return self.get_response(request)
+
+        profile = Profile(self.config)
+        response = profile.run(self.get_response, request)
+        record = self._save(request, response, profile)
+        response.headers['X-Profile-Id'] = str(record.pk)
+        return response
+
+    def _requested(self, request):
+        if request.META.get(self.header):
+            return True
+        param = self.config['QUERY_PARAM']
+        return param in request.META.get('QUERY_STRING', '') and param in request.GET
+
+    def _save(self, request, response, profile):
+        from .models import RequestProfile
+
+        match = getattr(request, 'resolver_match', None)
+        record = RequestProfile.objects.create(
+            method=request.method,
+            path=request.get_full_path()[:500],
+            view_name=(match.view_name if match else '')[:200],
+            status_code=response.status_code,
+            user=request.user,
+            duration=round(profile.duration, 3),
+            sql_time=round(profile.sql_time, 3),
+            query_count=len(profile.queries),
+            sample_count=sum(profile.stacks.values()),
+            stacks=dict(profile.stacks),
+            queries=profile.queries,
+            templates=sorted(profile.templates, key=lambda entry: entry['start']),
+        )
+        stale = RequestProfile.objects.values_list('pk', flat=True)[self.config['KEEP']:]
+        RequestProfile.objects.filter(pk__in=list(stale)).delete()
+        metrics.incr('profiler.requests')
+        return record
+
+
+# ========================
+# COMPRESSION
+# ========================
+DEFAULT_COMPRESSION = {
+    'ENABLED': True,
+    'BROTLI_LEVEL': 5,
+    'GZIP_LEVEL': 6,
+    'MIN_SIZE': 512,
+    # CSRF tokenli sahifalar: 'pad' - tasodifiy uzunlikdagi gzip sarlavhasi, 'skip' - siqilmaydi
+    'CSRF_PAGES': 'pad',
+    'CSRF_RANDOM_BYTES': 100,
+}
+
+# Allaqachon siqilgan yoki siqishdan foyda yo'q turlar
+INCOMPRESSIBLE_TYPES = {
+    'application/gzip', 'application/zip', 'application/x-7z-compressed',
+    'application/x-rar-compressed', 'application/pdf', 'application/octet-stream',
+    'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+    'font/woff', 'font/woff2', 'text/event-stream',
+}
+
+re_accept_encoding = re.compile(r'\s*([^\s;,]+)\s*(?:;\s*q\s*=\s*([0-9.]+))?')
+
+
+def _accepted_encodings(header):
+    """``Accept-Encoding`` sarlavhasidan ``{kodlash: q}``"""
+    encodings = {}
+    for part in header.split(','):
+        match = re_accept_encoding.match(part)
+        if not match:
+            continue
+        try:
+            quality = float(match.group(2)) if match.group(2) else 1.0
+        except ValueError:
+            continue
+        encodings[match.group(1).lower()] = quality
+    return encodings
+
+
+def _is_compressible(content_type):
+    media_type = content_type.split(';')[0].strip().lower()
+    if media_type in INCOMPRESSIBLE_TYPES:
+        return False
+    main_type = media_type.split('/')[0]
+    if main_type in ('image', 'video', 'audio'):
+        return media_type == 'image/svg+xml'
+    return True
+
+
+class GzipCompressor:
+    """gzip oqimi; ``filename`` sarlavhaga yoziladi (Heal-the-BREACH uchun)"""
+
+    encoding = 'gzip'
+
+    def __init__(self, level, filename=''):
+        self._buffer = io.BytesIO()
+        self._file = gzip.GzipFile(filename=filename, mode='wb', compresslevel=level, fileobj=self._buffer, mtime=0)
+
+    def _drain(self):
+        data = self._buffer.getvalue()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return data
+
+    def process(self, data):
+        self._file.write(data)
+        return self._drain()
+
+    def finish(self):
+        self._file.close()
+        return self._drain()
+
+
+class BrotliCompressor:
+    encoding = 'br'
+
+    def __init__(self, level):
+        self._compressor = brotli.Compressor(mode=brotli.MODE_TEXT, quality=level)
+
+    def process(self, data):
+        return self._compressor.process(data)
+
+    def finish(self):
+        return self._compressor.finish()
+
+
+class CompressionMiddleware:
+    """HTML va JSON javoblarini Brotli yoki gzip bilan siqadi.
+
+    Kodlash ``Accept-Encoding`` bo'yicha tanlanadi (teng bo'lsa Brotli).
+    CSRF token ishlatgan sahifalar BREACH ga qarshi faqat gzip bilan,
+    sarlavhaga tasodifiy uzunlikdagi nom qo'shib siqiladi (yoki umuman
+    siqilmaydi). Shuning uchun middleware ``CsrfViewMiddleware`` dan
+    keyin turishi kerak - token ishlatilgani javob qaytishida tekshiriladi.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.config = {**DEFAULT_COMPRESSION, **getattr(settings, 'COMPRESSION', {})}
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if not self.config['ENABLED'] or not self._should_compress(response):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        compressor = self._select_compressor(request)
+        if compressor is None:
+            return response
+
+        if response.streaming:
+            self._compress_streaming(response, compressor)
+        else:
+            content = response.content
+            compressed = compressor.process(content) + compressor.finish()
+            if len(compressed) >= len(content):
+                return response
+            response.content = compressed
+            response.headers['Content-Length'] = str(len(compressed))
+            self._record(compressor.encoding, len(content), len(compressed))
+
+        # Kuchli ETag siqilgan tanaga mos kelmaydi - kuchsiz qilamiz
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = compressor.encoding
+        return response
+
+    def _should_compress(self, response):
+        if response.has_header('Content-Encoding'):
+            return False
+        if 'no-transform' in response.get('Cache-Control', ''):
+            return False
+        if not _is_compressible(response.get('Content-Type', '')):
+            return False
+        if response.streaming:
+            length = response.get('Content-Length')
+            return length is None or int(length) >= self.config['MIN_SIZE']
+        return len(response.content) >= self.config['MIN_SIZE']
+
+    def _select_compressor(self, request):
+        encodings = _accepted_encodings(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        gzip_quality = encodings.get('gzip', encodings.get('*', 0))
+        brotli_quality = encodings.get('br', encodings.get('*', 0))
+
+        if request.META.get('CSRF_COOKIE_NEEDS_UPDATE'):
+            # Sahifada CSRF token bor: faqat tasodifiy sarlavhali gzip
+            if self.config['CSRF_PAGES'] == 'skip' or gzip_quality <= 0:
+                return None
+            length = secrets.randbelow(self.config['CSRF_RANDOM_BYTES']) + 1
+            return GzipCompressor(self.config['GZIP_LEVEL'], get_random_string(length))
+
+        if brotli is not None and brotli_quality > 0 and brotli_quality >= gzip_quality:
+            return BrotliCompressor(self.config['BROTLI_LEVEL'])
+        if gzip_quality > 0:
+            return GzipCompressor(self.config['GZIP_LEVEL'])
+        return None
+
+    def _compress_streaming(self, response, compressor):
+        record = self._record
+        original = response.streaming_content
+
+        if response.is_async:
+            async def stream():
+                size = compressed = 0
+                async for chunk in original:
+                    size += len(chunk)
+                    data = compressor.process(chunk)
+                    compressed += len(data)
+                    yield data
+                data = compressor.finish()
+                record(compressor.encoding, size, compressed + len(data))
+                yield data
+        else:
+            def stream():
+                size = compressed = 0
+                for chunk in original:
+                    size += len(chunk)
+                    data = compressor.process(chunk)
+                    compressed += len(data)
+                    if data:
+                        yield data
+                data = compressor.finish()
+                record(compressor.encoding, size, compressed + len(data))
+                yield data
+
+        response.streaming_content = stream()
+        # Siqilgan hajm oldindan ma'lum emas
+        del response.headers['Content-Length']
+
+    @staticmethod
+    def _record(encoding, size, compressed):
+        metrics.incr(f'compression.{encoding}.responses')
+        metrics.incr('compression.bytes_in', size)
+        metrics.incr('compression.bytes_out', compressed)
+        metrics.incr('compression.bytes_saved', size - compressed)
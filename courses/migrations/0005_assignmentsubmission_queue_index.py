@@ -0,0 +1,17 @@
+# Generated by Django 4.2 on 2026-10-19 11:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0004_aboutpage'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='assignmentsubmission',
+            index=models.Index(fields=['assignment', 'status', 'id'], name='submission_queue_idx'),
+        ),
+    ]
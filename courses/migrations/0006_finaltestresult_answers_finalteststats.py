@@ -0,0 +1,35 @@
+# Generated by Django 4.2 on 2026-10-19 12:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0005_assignmentsubmission_queue_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='finaltestresult',
+            name='answers',
+            field=models.BinaryField(blank=True, default=b'', verbose_name='Javoblar'),
+        ),
+        migrations.CreateModel(
+            name='FinalTestStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('attempts', models.IntegerField(default=0, verbose_name='Urinishlar')),
+                ('score_sum', models.BigIntegerField(default=0)),
+                ('score_sq_sum', models.BigIntegerField(default=0)),
+                ('items', models.JSONField(default=dict)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('test', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='stats', to='courses.finaltest')),
+            ],
+            options={
+                'verbose_name': 'Test statistikasi',
+                'verbose_name_plural': 'Test statistikasi',
+            },
+        ),
+    ]
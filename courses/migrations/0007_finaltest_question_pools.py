@@ -0,0 +1,23 @@
+# Generated by Django 4.2 on 2026-10-19 12:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0006_finaltestresult_answers_finalteststats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='finaltest',
+            name='questions_per_attempt',
+            field=models.PositiveIntegerField(default=0, help_text='0 - barcha savollar belgilangan tartibda beriladi', verbose_name='Har urinishdagi savollar soni'),
+        ),
+        migrations.AddField(
+            model_name='finaltestresult',
+            name='seed',
+            field=models.BigIntegerField(blank=True, editable=False, null=True, verbose_name='Seed'),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 4.2 on 2026-10-19 12:11
+
+from django.db import migrations, models
+
+
+def youtube_video_id(url):
+    if 'watch?v=' in url:
+        return url.split('watch?v=')[-1].split('&')[0]
+    elif 'youtu.be/' in url:
+        return url.split('youtu.be/')[-1].split('?')[0]
+    elif 'embed/' in url:
+        return url.split('embed/')[-1].split('?')[0]
+    return None
+
+
+def video_fields(url):
+    # courses.models.video_fields ning shu paytdagi nusxasi
+    video_id = youtube_video_id(url)
+    embed_url = f"https://www.youtube-nocookie.com/embed/{video_id}?rel=0&modestbranding=1" if video_id else url
+    url_lower = url.lower()
+    if 'youtube.com' in url_lower or 'youtu.be' in url_lower:
+        video_type = 'youtube'
+    elif any(url_lower.endswith(ext) for ext in ['.mp4', '.webm', '.ogg', '.mov']):
+        video_type = 'direct'
+    else:
+        video_type = 'link'
+    return embed_url, video_type
+
+
+def fill_video_fields(apps, schema_editor):
+    Lesson = apps.get_model('courses', 'Lesson')
+    lessons = list(Lesson.objects.exclude(video_url__isnull=True).exclude(video_url='').only('pk', 'video_url'))
+    for lesson in lessons:
+        lesson.video_embed_url, lesson.video_type = video_fields(lesson.video_url)
+    Lesson.objects.bulk_update(lessons, ['video_embed_url', 'video_type'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0007_finaltest_question_pools'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lesson',
+            name='video_embed_url',
+            field=models.CharField(blank=True, editable=False, max_length=300, verbose_name='Embed URL'),
+        ),
+        migrations.AddField(
+            model_name='lesson',
+            name='video_type',
+            field=models.CharField(blank=True, choices=[('youtube', 'YouTube'), ('direct', 'Video fayl'), ('link', 'Havola')], editable=False, max_length=10, verbose_name='Video turi'),
+        ),
+        migrations.RunPython(fill_video_fields, migrations.RunPython.noop),
+    ]
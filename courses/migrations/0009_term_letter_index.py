@@ -0,0 +1,41 @@
+# Generated by Django 4.2 on 2026-10-19 12:15
+
+from django.db import migrations, models
+
+
+def letter_for(title):
+    # courses.models.Term.letter_for ning shu paytdagi nusxasi
+    first = title.strip()[:1].upper()
+    return first if first.isalpha() else '#'
+
+
+def fill_letters(apps, schema_editor):
+    Term = apps.get_model('courses', 'Term')
+    terms = list(Term.objects.only('pk', 'title'))
+    for term in terms:
+        term.letter = letter_for(term.title)
+    Term.objects.bulk_update(terms, ['letter'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0008_lesson_video_fields'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='term',
+            name='letter',
+            field=models.CharField(default='#', editable=False, max_length=1, verbose_name='Harf'),
+        ),
+        migrations.RunPython(fill_letters, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='term',
+            index=models.Index(fields=['is_active', 'order', 'title', 'id'], name='term_page_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='term',
+            index=models.Index(fields=['is_active', 'letter', 'order', 'title', 'id'], name='term_letter_page_idx'),
+        ),
+    ]
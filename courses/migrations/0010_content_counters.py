@@ -0,0 +1,51 @@
+# Generated by Django 4.2 on 2026-10-19 12:19
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def _count(model, fk, **filters):
+    counts = (
+        model.objects.filter(**{fk: OuterRef('pk')}, **filters)
+        .order_by().values(fk).annotate(count=Count('pk')).values('count')
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+def fill_counters(apps, schema_editor):
+    Subject = apps.get_model('courses', 'Subject')
+    Course = apps.get_model('courses', 'Course')
+    Lesson = apps.get_model('courses', 'Lesson')
+    Enrollment = apps.get_model('courses', 'Enrollment')
+    Subject.objects.update(published_courses_count=_count(Course, 'subject', is_published=True))
+    Course.objects.update(
+        lessons_count=_count(Lesson, 'course'),
+        enrollments_count=_count(Enrollment, 'course'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0009_term_letter_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='enrollments_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Talabalar soni'),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='lessons_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Darslar soni'),
+        ),
+        migrations.AddField(
+            model_name='subject',
+            name='published_courses_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Kurslar soni'),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 4.2 on 2026-10-19 12:34
+
+from datetime import timedelta
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncWeek
+from django.utils import timezone
+
+
+def fill_statistics(apps, schema_editor):
+    # courses.statistics.compute() ning shu paytdagi nusxasi - tarixiy modellar bilan
+    User = apps.get_model('courses', 'User')
+    Course = apps.get_model('courses', 'Course')
+    Enrollment = apps.get_model('courses', 'Enrollment')
+    LessonProgress = apps.get_model('courses', 'LessonProgress')
+    FinalTestResult = apps.get_model('courses', 'FinalTestResult')
+    AssignmentSubmission = apps.get_model('courses', 'AssignmentSubmission')
+    Statistic = apps.get_model('courses', 'Statistic')
+
+    values = {
+        'students': User.objects.filter(is_staff=False).count(),
+        'courses': Course.objects.filter(is_published=True).count(),
+        'enrollments': Enrollment.objects.count(),
+        'completed_lessons': LessonProgress.objects.filter(completed=True).count(),
+        'final_test_results': FinalTestResult.objects.count(),
+        'passed_final_tests': FinalTestResult.objects.filter(passed=True).count(),
+    }
+    weeks = (
+        AssignmentSubmission.objects.annotate(week=TruncWeek('submitted_at'))
+        .order_by().values('week').annotate(count=Count('pk'))
+    )
+    for row in weeks:
+        day = timezone.localdate(row['week']) if timezone.is_aware(row['week']) else row['week'].date()
+        values['submissions_week:' + (day - timedelta(days=day.weekday())).isoformat()] = row['count']
+    Statistic.objects.bulk_create(Statistic(key=key, value=value) for key, value in values.items())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0010_content_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Statistic',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=50, unique=True, verbose_name='Kalit')),
+                ('value', models.BigIntegerField(default=0, verbose_name='Qiymat')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Statistika',
+                'verbose_name_plural': 'Statistika',
+                'ordering': ['key'],
+            },
+        ),
+        migrations.RunPython(fill_statistics, migrations.RunPython.noop),
+    ]
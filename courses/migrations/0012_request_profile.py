@@ -0,0 +1,39 @@
+# Generated by Django 4.2 on 2026-10-19 12:41
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0011_statistics'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RequestProfile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('method', models.CharField(max_length=10)),
+                ('path', models.CharField(max_length=500, verbose_name='Manzil')),
+                ('view_name', models.CharField(blank=True, max_length=200, verbose_name='View')),
+                ('status_code', models.PositiveSmallIntegerField(verbose_name='Status')),
+                ('duration', models.FloatField(verbose_name='Davomiyligi (ms)')),
+                ('sql_time', models.FloatField(default=0, verbose_name='SQL (ms)')),
+                ('query_count', models.IntegerField(default=0, verbose_name="So'rovlar")),
+                ('sample_count', models.IntegerField(default=0, verbose_name='Namunalar')),
+                ('stacks', models.JSONField(default=dict)),
+                ('queries', models.JSONField(default=list)),
+                ('templates', models.JSONField(default=list)),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Vaqt')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': "So'rov profili",
+                'verbose_name_plural': "So'rov profillari",
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
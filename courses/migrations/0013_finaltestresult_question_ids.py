@@ -0,0 +1,50 @@
+# Generated by Django 4.2 on 2026-10-19 12:52
+
+import random
+import sys
+from array import array
+
+from django.db import migrations, models
+
+
+def freeze_question_ids(apps, schema_editor):
+    # Eski natijalar: hozirgi to'plam va seed dan tiklab, keyingi o'zgarishlardan himoyalash
+    FinalTestResult = apps.get_model('courses', 'FinalTestResult')
+    FinalTestQuestion = apps.get_model('courses', 'FinalTestQuestion')
+    pools = {}
+    results = list(FinalTestResult.objects.select_related('test').only(
+        'pk', 'seed', 'test__questions_per_attempt'
+    ))
+    for result in results:
+        if result.test_id not in pools:
+            pools[result.test_id] = list(
+                FinalTestQuestion.objects.filter(test_id=result.test_id)
+                .order_by('order', 'pk').values_list('pk', flat=True)
+            )
+        pool = pools[result.test_id]
+        size = result.test.questions_per_attempt
+        if result.seed is None or not size or size >= len(pool):
+            ids = pool
+        else:
+            ids = random.Random(result.seed).sample(pool, size)
+        packed = array('I', ids)
+        if sys.byteorder == 'big':
+            packed.byteswap()
+        result.question_ids = packed.tobytes()
+    FinalTestResult.objects.bulk_update(results, ['question_ids'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0012_request_profile'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='finaltestresult',
+            name='question_ids',
+            field=models.BinaryField(blank=True, default=b'', verbose_name='Savollar'),
+        ),
+        migrations.RunPython(freeze_question_ids, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 4.2 on 2026-10-19 12:57
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def split_items(apps, schema_editor):
+    # JSON dagi [ko'rgan, to'g'ri, ko'rganlar yig'indisi, to'g'rilar yig'indisi] -> alohida qatorlar
+    FinalTestStats = apps.get_model('courses', 'FinalTestStats')
+    FinalTestItemStats = apps.get_model('courses', 'FinalTestItemStats')
+    FinalTestItemStats.objects.bulk_create([
+        FinalTestItemStats(
+            test_id=stats.test_id, question_id=int(question_id),
+            seen=seen, correct=correct, seen_score_sum=seen_sum, correct_score_sum=correct_sum,
+        )
+        for stats in FinalTestStats.objects.all()
+        for question_id, (seen, correct, seen_sum, correct_sum) in stats.items.items()
+    ], batch_size=500)
+
+
+def join_items(apps, schema_editor):
+    FinalTestStats = apps.get_model('courses', 'FinalTestStats')
+    FinalTestItemStats = apps.get_model('courses', 'FinalTestItemStats')
+    for stats in FinalTestStats.objects.all():
+        stats.items = {
+            str(item.question_id): [item.seen, item.correct, item.seen_score_sum, item.correct_score_sum]
+            for item in FinalTestItemStats.objects.filter(test_id=stats.test_id)
+        }
+        stats.save(update_fields=['items'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0013_finaltestresult_question_ids'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FinalTestItemStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('question_id', models.PositiveIntegerField(verbose_name='Savol')),
+                ('seen', models.IntegerField(default=0, verbose_name="Ko'rgan")),
+                ('correct', models.IntegerField(default=0, verbose_name="To'g'ri")),
+                ('seen_score_sum', models.BigIntegerField(default=0)),
+                ('correct_score_sum', models.BigIntegerField(default=0)),
+                ('test', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='item_stats', to='courses.finaltest')),
+            ],
+            options={
+                'verbose_name': 'Savol statistikasi',
+                'verbose_name_plural': 'Savollar statistikasi',
+                'unique_together': {('test', 'question_id')},
+            },
+        ),
+        migrations.RunPython(split_items, join_items),
+        migrations.RemoveField(
+            model_name='finalteststats',
+            name='items',
+        ),
+    ]
@@ -1,8 +1,27 @@
 # courses/models.py
 
-from django.db import models
+import math
+import sys
+from array import array
+
+from django.conf import settings
+from django.db import models, transaction
 from django.contrib.auth.models import AbstractUser
-from ckeditor.fields import RichTextField
+from django.utils import timezone
+
+if settings.ADMIN_ENABLED:
+    from ckeditor.fields import RichTextField
+else:
+    class RichTextField(models.TextField):
+        """'public' profilida ckeditor yuklanmaydi: ustun va migratsiyalar bir xil, faqat admin vidjeti yo'q"""
+
+        def __init__(self, *args, config_name='default', **kwargs):
+            self.config_name = config_name
+            super().__init__(*args, **kwargs)
+
+        def deconstruct(self):
+            name, path, args, kwargs = super().deconstruct()
+            return name, 'ckeditor.fields.RichTextField', args, kwargs
 
 
 # ========================
@@ -34,15 +53,33 @@ class Term(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     order = models.IntegerField(default=0, verbose_name="Tartib")
     is_active = models.BooleanField(default=True, verbose_name="Faol")
+    # Alifbo indeksi uchun - title dan saqlanganda hisoblanadi
+    letter = models.CharField(max_length=1, editable=False, default='#', verbose_name="Harf")
     
     class Meta:
         ordering = ['order', 'title']
         verbose_name = "Atama"
         verbose_name_plural = "Atamalar"
+        indexes = [
+            models.Index(fields=['is_active', 'order', 'title', 'id'], name='term_page_idx'),
+            models.Index(fields=['is_active', 'letter', 'order', 'title', 'id'], name='term_letter_page_idx'),
+        ]
     
     def __str__(self):
         return self.title
 
+    @staticmethod
+    def letter_for(title):
+        first = title.strip()[:1].upper()
+        return first if first.isalpha() else '#'
+
+    def save(self, *args, **kwargs):
+        self.letter = self.letter_for(self.title)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'title' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'letter'}
+        super().save(*args, **kwargs)
+
 
 # ========================
 # ABOUT PAGE MODEL (Muallif haqida)
@@ -112,7 +149,26 @@ class AboutPage(models.Model):
 # ========================
 # SUBJECT MODEL (FAN)
 # ========================
-class Subject(models.Model):
+class CounterFieldsMixin:
+    """``F()`` bilan yuritiladigan hisoblagichlar oddiy ``save()`` da yozilmaydi.
+
+    Aks holda admin tahriri xotiradagi eski qiymatni yozib, parallel
+    so'rovlardagi o'zgarishlarni yo'qotadi. Hisoblagichni yozish uchun
+    ``update_fields`` da aniq ko'rsatish kerak.
+    """
+    counter_fields = ()
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.counter_fields and field.attname not in deferred
+            ]
+        super().save(*args, **kwargs)
+
+
+class Subject(CounterFieldsMixin, models.Model):
 
     """Fan - Matematika, Fizika, Informatika va h.k."""
     name = models.CharField(max_length=200, verbose_name="Fan nomi")
@@ -122,6 +178,9 @@ class Subject(models.Model):
     image = models.ImageField(upload_to='subjects/', blank=True, null=True, verbose_name="Rasm")
     order = models.IntegerField(default=0, verbose_name="Tartib")
     is_active = models.BooleanField(default=True, verbose_name="Faol")
+    # Signallar orqali yuritiladi (courses/counters.py)
+    published_courses_count = models.PositiveIntegerField(default=0, editable=False, verbose_name="Kurslar soni")
+    counter_fields = ('published_courses_count',)
     
     class Meta:
         ordering = ['order', 'name']
@@ -132,7 +191,7 @@ class Subject(models.Model):
         return self.name
     
     def get_courses_count(self):
-        return self.courses.filter(is_published=True).count()
+        return self.published_courses_count
 
 
 # ========================
@@ -155,7 +214,7 @@ class Category(models.Model):
         return self.name
 
 
-class Course(models.Model):
+class Course(CounterFieldsMixin, models.Model):
     """Kurslar"""
     title = models.CharField(max_length=200, verbose_name="Kurs nomi")
     slug = models.SlugField(unique=True)
@@ -178,6 +237,10 @@ class Course(models.Model):
     is_free = models.BooleanField(default=False, verbose_name="Bepul")
     is_published = models.BooleanField(default=False, verbose_name="Nashr qilingan")
     order = models.IntegerField(default=0, verbose_name="Fan ichidagi tartib")
+    # Signallar orqali yuritiladi (courses/counters.py)
+    lessons_count = models.PositiveIntegerField(default=0, editable=False, verbose_name="Darslar soni")
+    enrollments_count = models.PositiveIntegerField(default=0, editable=False, verbose_name="Talabalar soni")
+    counter_fields = ('lessons_count', 'enrollments_count')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -213,12 +276,54 @@ class Course(models.Model):
         return None
 
 
+def youtube_video_id(url):
+    """YouTube URL dan video ID ni ajratib oladi"""
+    if not url:
+        return None
+    if 'watch?v=' in url:
+        return url.split('watch?v=')[-1].split('&')[0]
+    elif 'youtu.be/' in url:
+        return url.split('youtu.be/')[-1].split('?')[0]
+    elif 'embed/' in url:
+        return url.split('embed/')[-1].split('?')[0]
+    return None
+
+
+def video_fields(url):
+    """Video URL dan ``(embed_url, video_type)`` - Lesson saqlanganda hisoblanadi"""
+    if not url:
+        return '', ''
+    video_id = youtube_video_id(url)
+    # youtube-nocookie.com - Error 153 ni kamaytiradi, privacy-enhanced
+    embed_url = f"https://www.youtube-nocookie.com/embed/{video_id}?rel=0&modestbranding=1" if video_id else url
+    url_lower = url.lower()
+    if 'youtube.com' in url_lower or 'youtu.be' in url_lower:
+        video_type = 'youtube'
+    elif any(url_lower.endswith(ext) for ext in ['.mp4', '.webm', '.ogg', '.mov']):
+        video_type = 'direct'
+    else:
+        video_type = 'link'
+    return embed_url, video_type
+
+
 class Lesson(models.Model):
     """Darslar"""
+    VIDEO_TYPE_CHOICES = [
+        ('youtube', 'YouTube'),
+        ('direct', 'Video fayl'),
+        ('link', 'Havola'),
+    ]
+
     course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='lessons')
     title = models.CharField(max_length=200, verbose_name="Dars nomi")
     content = RichTextField(verbose_name="Dars matni", config_name='default')
     video_url = models.URLField(blank=True, null=True, verbose_name="Video URL (YouTube)")
+    # video_url dan hisoblanadi - har so'rovda qayta parse qilinmaydi
+    video_embed_url = models.CharField(max_length=300, blank=True, editable=False, verbose_name="Embed URL")
+    video_type = models.CharField(
+        max_length=10, choices=VIDEO_TYPE_CHOICES, blank=True, editable=False,
+        verbose_name="Video turi"
+    )
     lecture_file = models.FileField(
         upload_to='lectures/', blank=True, null=True,
         verbose_name="Maruza fayli (PDF/Word)"
@@ -234,6 +339,13 @@ class Lesson(models.Model):
     
     def __str__(self):
         return f"{self.course.title} - {self.title}"
+
+    def save(self, *args, **kwargs):
+        self.video_embed_url, self.video_type = video_fields(self.video_url)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'video_url' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'video_embed_url', 'video_type'}
+        super().save(*args, **kwargs)
     
     def get_next_lesson(self):
         return Lesson.objects.filter(
@@ -247,27 +359,11 @@ class Lesson(models.Model):
     
     def get_youtube_video_id(self):
         """YouTube video ID ni ajratib oladi"""
-        if not self.video_url:
-            return None
-        url = self.video_url
-        if 'watch?v=' in url:
-            return url.split('watch?v=')[-1].split('&')[0]
-        elif 'youtu.be/' in url:
-            return url.split('youtu.be/')[-1].split('?')[0]
-        elif 'embed/' in url:
-            return url.split('embed/')[-1].split('?')[0]
-        return None
+        return youtube_video_id(self.video_url)
 
     def get_youtube_embed_url(self):
         """YouTube URL ni embed formatga o'tkazadi (privacy-enhanced mode)"""
-        if not self.video_url:
-            return None
-        video_id = self.get_youtube_video_id()
-        if video_id:
-            # youtube-nocookie.com - Error 153 ni kamaytiradi, privacy-enhanced
-            return f"https://www.youtube-nocookie.com/embed/{video_id}?rel=0&modestbranding=1"
-        # YouTube emas - URL ni to'g'ridan-to'g'ri qaytaradi
-        return self.video_url
+        return self.video_embed_url or video_fields(self.video_url)[0] or None
 
 
 class Enrollment(models.Model):
@@ -444,10 +540,25 @@ class AssignmentSubmission(models.Model):
         verbose_name = "Yuborilgan ish"
         verbose_name_plural = "Yuborilgan ishlar"
         ordering = ['-submitted_at']
+        indexes = [
+            # Baholash navbati: topshiriq + holat bo'yicha id keyset
+            models.Index(fields=['assignment', 'status', 'id'], name='submission_queue_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.assignment.title}"
 
+    def save(self, *args, **kwargs):
+        # Ko'rib chiqilgan vaqtni avtomatik belgilash
+        if self.status == 'submitted':
+            self.reviewed_at = None
+        elif self.reviewed_at is None:
+            self.reviewed_at = timezone.now()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'status' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'reviewed_at'}
+        super().save(*args, **kwargs)
+
     def get_status_badge(self):
         badges = {
             'submitted': 'warning',
@@ -500,6 +611,10 @@ class FinalTest(models.Model):
     title = models.CharField(max_length=200, verbose_name="Test nomi")
     description = models.TextField(blank=True, verbose_name="Tavsif")
     pass_score = models.IntegerField(default=60, verbose_name="O'tish balli (%)")
+    questions_per_attempt = models.PositiveIntegerField(
+        default=0, verbose_name="Har urinishdagi savollar soni",
+        help_text="0 - barcha savollar belgilangan tartibda beriladi"
+    )
     is_active = models.BooleanField(default=True, verbose_name="Faol")
     order = models.IntegerField(default=0, verbose_name="Tartib")
     created_at = models.DateTimeField(auto_now_add=True)
@@ -545,6 +660,22 @@ class FinalTestAnswer(models.Model):
         return f"{self.text[:50]} {'✓' if self.is_correct else '✗'}"
 
 
+def pack_ids(ids):
+    """Id lar ro'yxati -> uint32 little-endian baytlar"""
+    packed = array('I', ids)
+    if sys.byteorder == 'big':
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def unpack_ids(data):
+    packed = array('I')
+    packed.frombytes(bytes(data))
+    if sys.byteorder == 'big':
+        packed.byteswap()
+    return packed.tolist()
+
+
 class FinalTestResult(models.Model):
     """Foydalanuvchi chiqish testi natijasi"""
     test = models.ForeignKey(FinalTest, on_delete=models.CASCADE, related_name='results')
@@ -553,6 +684,12 @@ class FinalTestResult(models.Model):
     correct = models.IntegerField(default=0, verbose_name="To'g'ri javoblar")
     total = models.IntegerField(default=0, verbose_name="Jami savollar")
     passed = models.BooleanField(default=False, verbose_name="O'tdi")
+    # Tanlangan javob id lari savollar tartibida, uint32 little-endian (0 - javobsiz)
+    answers = models.BinaryField(default=b'', blank=True, editable=False, verbose_name="Javoblar")
+    # Savollar to'plamidan tanlov uchun seed (None - barcha savollar)
+    seed = models.BigIntegerField(null=True, blank=True, editable=False, verbose_name="Seed")
+    # Urinishdagi savol id lari, ``answers`` bilan bir xil formatda
+    question_ids = models.BinaryField(default=b'', blank=True, editable=False, verbose_name="Savollar")
     completed_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
@@ -561,4 +698,163 @@ class FinalTestResult(models.Model):
         verbose_name_plural = "Test natijalari"
 
     def __str__(self):
-        return f"{self.user.username} - {self.test.title} - {self.score}%"
\ No newline at end of file
+        return f"{self.user.username} - {self.test.title} - {self.score}%"
+
+    def set_answers(self, answer_ids):
+        """Javob id larini ixcham ko'rinishda saqlash (None - javobsiz)"""
+        self.answers = pack_ids(answer_id or 0 for answer_id in answer_ids)
+
+    def get_answer_ids(self):
+        return [answer_id or None for answer_id in unpack_ids(self.answers)]
+
+    def set_question_ids(self, question_ids):
+        self.question_ids = pack_ids(question_ids)
+
+    def get_question_ids(self):
+        """Urinishdagi savollar - ``answers`` bilan bir xil tartibda.
+
+        Id lar natija bilan birga saqlanadi; keyin savollar qo'shilsa yoki
+        o'chirilsa ham javoblar siljimaydi. Eski yozuvlar uchun seed orqali.
+        """
+        if self.question_ids:
+            return unpack_ids(self.question_ids)
+        from .pools import draw_question_ids
+        return draw_question_ids(self.test, self.seed)
+
+
+class FinalTestStats(models.Model):
+    """Chiqish testi statistikasi - har topshirishda ``F()`` bilan yangilanadi"""
+    test = models.OneToOneField(FinalTest, on_delete=models.CASCADE, related_name='stats')
+    attempts = models.IntegerField(default=0, verbose_name="Urinishlar")
+    score_sum = models.BigIntegerField(default=0)
+    score_sq_sum = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Test statistikasi"
+        verbose_name_plural = "Test statistikasi"
+
+    def __str__(self):
+        return f"{self.test.title} - {self.attempts} urinish"
+
+    @classmethod
+    def record_attempt(cls, test, outcomes, score):
+        """Bitta urinish natijasini qo'shish; ``outcomes`` - (question_id, is_correct) juftliklari.
+
+        Har bir ko'rsatkich ``UPDATE ... SET x = x + n`` bilan o'zgaradi - yangilanishlar
+        yo'qolmaydi. Lekin ``UPDATE`` test va savol qatorlarini tranzaksiya oxirigacha
+        qulflaydi: bir testga bir vaqtdagi topshirishlar shu yerda navbat kutadi.
+        Shuning uchun natija tranzaksiyasidan keyin (``on_commit``) chaqiriladi -
+        qulf faqat shu bir nechta ``UPDATE`` davomida ushlanadi.
+        """
+        seen_ids = [question_id for question_id, _ in outcomes]
+        correct_ids = [question_id for question_id, is_correct in outcomes if is_correct]
+        with transaction.atomic():
+            totals = {
+                'attempts': models.F('attempts') + 1,
+                'score_sum': models.F('score_sum') + score,
+                'score_sq_sum': models.F('score_sq_sum') + score * score,
+                'updated_at': timezone.now(),
+            }
+            if not cls.objects.filter(test=test).update(**totals):
+                cls.objects.bulk_create([cls(test=test)], ignore_conflicts=True)
+                cls.objects.filter(test=test).update(**totals)
+
+            items = FinalTestItemStats.objects.filter(test=test)
+            FinalTestItemStats.objects.bulk_create(
+                [FinalTestItemStats(test=test, question_id=question_id) for question_id in seen_ids],
+                ignore_conflicts=True,
+            )
+            items.filter(question_id__in=seen_ids).update(
+                seen=models.F('seen') + 1,
+                seen_score_sum=models.F('seen_score_sum') + score,
+            )
+            if correct_ids:
+                items.filter(question_id__in=correct_ids).update(
+                    correct=models.F('correct') + 1,
+                    correct_score_sum=models.F('correct_score_sum') + score,
+                )
+
+    def item_analysis(self):
+        """Savollar bo'yicha qiyinlik (p) va ajrata olish (point-biserial) ko'rsatkichlari"""
+        if not self.attempts:
+            return []
+        mean = self.score_sum / self.attempts
+        variance = self.score_sq_sum / self.attempts - mean * mean
+        std = math.sqrt(variance) if variance > 0 else 0
+        rows = []
+        for item in FinalTestItemStats.objects.filter(test_id=self.test_id).order_by('question_id'):
+            seen, correct = item.seen, item.correct
+            difficulty = correct / seen if seen else None
+            discrimination = None
+            if std and 0 < correct < seen:
+                mean_correct = item.correct_score_sum / correct
+                mean_wrong = (item.seen_score_sum - item.correct_score_sum) / (seen - correct)
+                discrimination = (mean_correct - mean_wrong) / std * math.sqrt(difficulty * (1 - difficulty))
+            rows.append({
+                'question_id': item.question_id,
+                'seen': seen,
+                'correct': correct,
+                'difficulty': difficulty,
+                'discrimination': discrimination,
+            })
+        return rows
+
+
+class FinalTestItemStats(models.Model):
+    """Bitta savol statistikasi. Savol o'chirilsa ham tahlil uchun qator qoladi"""
+    test = models.ForeignKey(FinalTest, on_delete=models.CASCADE, related_name='item_stats')
+    question_id = models.PositiveIntegerField(verbose_name="Savol")
+    seen = models.IntegerField(default=0, verbose_name="Ko'rgan")
+    correct = models.IntegerField(default=0, verbose_name="To'g'ri")
+    seen_score_sum = models.BigIntegerField(default=0)
+    correct_score_sum = models.BigIntegerField(default=0)
+
+    class Meta:
+        unique_together = ['test', 'question_id']
+        verbose_name = "Savol statistikasi"
+        verbose_name_plural = "Savollar statistikasi"
+
+    def __str__(self):
+        return f"#{self.question_id}: {self.correct}/{self.seen}"
+
+
+class Statistic(models.Model):
+    """Platforma statistikasi - signallar bilan yangilanadigan jamlanma jadval"""
+    key = models.CharField(max_length=50, unique=True, verbose_name="Kalit")
+    value = models.BigIntegerField(default=0, verbose_name="Qiymat")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['key']
+        verbose_name = "Statistika"
+        verbose_name_plural = "Statistika"
+
+    def __str__(self):
+        return f"{self.key}: {self.value}"
+
+
+class RequestProfile(models.Model):
+    """Xodim so'rovi bo'yicha yozilgan profil (``?_profile=1`` yoki ``X-Profile`` sarlavhasi)"""
+    method = models.CharField(max_length=10)
+    path = models.CharField(max_length=500, verbose_name="Manzil")
+    view_name = models.CharField(max_length=200, blank=True, verbose_name="View")
+    status_code = models.PositiveSmallIntegerField(verbose_name="Status")
+    user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    duration = models.FloatField(verbose_name="Davomiyligi (ms)")
+    sql_time = models.FloatField(default=0, verbose_name="SQL (ms)")
+    query_count = models.IntegerField(default=0, verbose_name="So'rovlar")
+    sample_count = models.IntegerField(default=0, verbose_name="Namunalar")
+    # {"modul.funksiya;modul.funksiya;...": namunalar soni}
+    stacks = models.JSONField(default=dict)
+    queries = models.JSONField(default=list)
+    templates = models.JSONField(default=list)
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Vaqt")
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = "So'rov profili"
+        verbose_name_plural = "So'rov profillari"
+
+    def __str__(self):
+        return f"{self.method} {self.path} - {self.duration:.0f} ms"
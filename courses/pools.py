@@ -0,0 +1,103 @@
+# courses/pools.py
+
+import random
+import secrets
+from array import array
+
+from django.core import signing
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import FinalTestQuestion
+
+
+POOL_CACHE_TIMEOUT = 60 * 60 * 24
+ATTEMPT_MAX_AGE = 60 * 60 * 6
+ATTEMPT_SALT = 'courses.final-test-attempt'
+
+
+def _pool_cache_key(test_id):
+    return f'final_test_pool:{test_id}'
+
+
+def get_question_pool(test_id):
+    """Test savollari id larining zich massivi, (order, pk) tartibida.
+
+    Massiv keshda ``bytes`` ko'rinishida saqlanadi va savollar o'zgarganda
+    signal orqali o'chiriladi.
+    """
+    return get_question_pools([test_id])[test_id]
+
+
+def get_question_pools(test_ids):
+    """Bir nechta test uchun ``{test_id: massiv}`` - keshdan bitta ``get_many``,
+    yo'q bo'lganlari bazadan bitta so'rov bilan"""
+    keys = {_pool_cache_key(test_id): test_id for test_id in test_ids}
+    cached = cache.get_many(keys)
+    pools = {test_id: array('I') for test_id in test_ids}
+    for key, packed in cached.items():
+        pools[keys[key]].frombytes(packed)
+    missing = [test_id for key, test_id in keys.items() if key not in cached]
+    if missing:
+        rows = (
+            FinalTestQuestion.objects.filter(test_id__in=missing)
+            .order_by('order', 'pk').values_list('test_id', 'pk')
+        )
+        for test_id, pk in rows:
+            pools[test_id].append(pk)
+        cache.set_many(
+            {_pool_cache_key(test_id): pools[test_id].tobytes() for test_id in missing}, POOL_CACHE_TIMEOUT
+        )
+    return pools
+
+
+def invalidate_question_pool(test_id):
+    """Tranzaksiya tugagach - admin inline saqlashlari ``atomic`` ichida"""
+    transaction.on_commit(lambda: cache.delete(_pool_cache_key(test_id)))
+
+
+def new_seed():
+    return secrets.randbits(63)
+
+
+def attempt_size(test, pool=None):
+    pool_size = len(get_question_pool(test.pk) if pool is None else pool)
+    if test.questions_per_attempt:
+        return min(test.questions_per_attempt, pool_size)
+    return pool_size
+
+
+def draw_question_ids(test, seed):
+    """Urinish uchun savollar id lari.
+
+    Bir xil seed va o'zgarmagan savollar to'plami har doim bir xil ro'yxat
+    beradi, shuning uchun forma tokenida faqat seed bo'ladi. Natijada esa
+    tanlangan id lar saqlanadi (``FinalTestResult.question_ids``).
+    """
+    pool = get_question_pool(test.pk)
+    size = test.questions_per_attempt
+    if seed is None or not size or size >= len(pool):
+        return pool.tolist()
+    return random.Random(seed).sample(pool.tolist(), size)
+
+
+def load_questions(question_ids):
+    """Savollarni javoblari bilan berilgan tartibda yuklash"""
+    questions = FinalTestQuestion.objects.filter(pk__in=question_ids).prefetch_related('answers')
+    by_id = {question.pk: question for question in questions}
+    return [by_id[question_id] for question_id in question_ids if question_id in by_id]
+
+
+def sign_attempt(test_id, seed):
+    return signing.dumps({'test': test_id, 'seed': seed}, salt=ATTEMPT_SALT)
+
+
+def unsign_attempt(token, test_id):
+    """Formadagi urinish tokenidan seed ni olish; yaroqsiz bo'lsa ``None``"""
+    try:
+        data = signing.loads(token, salt=ATTEMPT_SALT, max_age=ATTEMPT_MAX_AGE)
+    except signing.BadSignature:
+        return None
+    if data.get('test') != test_id:
+        return None
+    return data.get('seed')
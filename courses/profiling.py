@@ -0,0 +1,215 @@
+# courses/profiling.py
+
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from django.db import connections
+from django.template.base import Template
+
+
+DEFAULT_REQUEST_PROFILER = {
+    'ENABLED': True,
+    'QUERY_PARAM': '_profile',
+    'HEADER': 'X-Profile',
+    # Namuna olish oralig'i (sekund)
+    'INTERVAL': 0.001,
+    'MAX_DEPTH': 128,
+    'MAX_QUERIES': 500,
+    'MAX_SQL_LENGTH': 2000,
+    # Bazada saqlanadigan oxirgi profillar soni
+    'KEEP': 100,
+}
+
+# Flame graph da bundan tor tugunlar ko'rsatilmaydi (% hisobida)
+FLAME_MIN_WIDTH = 0.5
+
+_active = ContextVar('request_profile', default=None)
+
+
+# ========================
+# SAMPLER
+# ========================
+def frame_label(frame):
+    code = frame.f_code
+    return f"{frame.f_globals.get('__name__', '?')}.{code.co_qualname}"
+
+
+class StackSampler(threading.Thread):
+    """Bitta oqimning stekini ``sys._current_frames()`` orqali muntazam o'qiydi.
+
+    Profillanayotgan kod o'zgartirilmaydi; natija - "folded" steklar
+    (``"a;b;c": namunalar soni``). ``root`` kadrdan yuqoridagi (server va
+    tashqi middleware) kadrlar tashlab yuboriladi.
+    """
+
+    def __init__(self, thread_id, root, interval, max_depth):
+        super().__init__(name='request-profiler', daemon=True)
+        self.thread_id = thread_id
+        self.root = root
+        self.interval = interval
+        self.max_depth = max_depth
+        self.stacks = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            self.sample()
+
+    def sample(self):
+        frame = sys._current_frames().get(self.thread_id)
+        if self._stop_event.is_set():
+            # So'rov tugagan - namuna ``stop()`` ning o'zini ko'rsatadi
+            return
+        labels = []
+        while frame is not None and frame is not self.root:
+            labels.append(frame_label(frame))
+            frame = frame.f_back
+        if labels:
+            self.stacks[';'.join(reversed(labels[-self.max_depth:]))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+# ========================
+# TEMPLATES
+# ========================
+_template_lock = threading.Lock()
+_template_users = 0
+_original_render = None
+
+
+def _profiled_render(self, context):
+    profile = _active.get()
+    if profile is None:
+        return _original_render(self, context)
+    entry = {'name': self.name or '<string>', 'depth': profile.template_depth}
+    profile.template_depth += 1
+    start = time.perf_counter()
+    try:
+        return _original_render(self, context)
+    finally:
+        profile.template_depth -= 1
+        entry['start'] = round((start - profile.started) * 1000, 3)
+        entry['duration'] = round((time.perf_counter() - start) * 1000, 3)
+        profile.templates.append(entry)
+
+
+def _install_template_hook():
+    """``Template._render`` faqat profil yozilayotgan paytda almashtiriladi"""
+    global _template_users, _original_render
+    with _template_lock:
+        if not _template_users:
+            _original_render = Template._render
+            Template._render = _profiled_render
+        _template_users += 1
+
+
+def _remove_template_hook():
+    global _template_users
+    with _template_lock:
+        _template_users -= 1
+        if not _template_users:
+            Template._render = _original_render
+
+
+# ========================
+# PROFILE
+# ========================
+class Profile:
+    """Bitta so'rov davomida yig'ilgan ma'lumot: steklar, SQL va shablonlar vaqt chizig'i"""
+
+    def __init__(self, config):
+        self.config = config
+        self.queries = []
+        self.templates = []
+        self.template_depth = 0
+        self.stacks = Counter()
+        self.started = None
+        self.duration = None
+
+    def _sql_wrapper(self, alias):
+        def wrapper(execute, sql, params, many, context):
+            start = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                if len(self.queries) < self.config['MAX_QUERIES']:
+                    self.queries.append({
+                        'alias': alias,
+                        'sql': sql[:self.config['MAX_SQL_LENGTH']],
+                        'many': many,
+                        'start': round((start - self.started) * 1000, 3),
+                        'duration': round((time.perf_counter() - start) * 1000, 3),
+                    })
+        return wrapper
+
+    def run(self, func, *args):
+        """``func(*args)`` ni profil ostida bajarish va natijasini qaytarish"""
+        sampler = StackSampler(
+            threading.get_ident(), sys._getframe(), self.config['INTERVAL'], self.config['MAX_DEPTH']
+        )
+        token = _active.set(self)
+        _install_template_hook()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(self._sql_wrapper(connection.alias)))
+                self.started = time.perf_counter()
+                sampler.start()
+                try:
+                    return func(*args)
+                finally:
+                    self.duration = (time.perf_counter() - self.started) * 1000
+                    sampler.stop()
+        finally:
+            _remove_template_hook()
+            _active.reset(token)
+            self.stacks = sampler.stacks
+
+    @property
+    def sql_time(self):
+        return sum(query['duration'] for query in self.queries)
+
+
+def flame_graph(stacks, min_width=FLAME_MIN_WIDTH):
+    """Folded steklardan flame graph qatorlari.
+
+    Har bir chuqurlik - bitta qator; tugun ``left``/``width`` foizlarda,
+    shuning uchun admin shablonida oddiy absolyut joylashgan bloklar
+    bilan chiziladi. Juda tor tugunlar (``min_width`` dan kichik) tashlanadi.
+    """
+    total = sum(stacks.values())
+    if not total:
+        return []
+    root = {'children': {}, 'value': 0}
+    for stack, count in stacks.items():
+        node = root
+        for label in stack.split(';'):
+            node = node['children'].setdefault(label, {'children': {}, 'value': 0})
+            node['value'] += count
+
+    rows = []
+
+    def walk(children, depth, left):
+        for label, node in sorted(children.items()):
+            width = node['value'] * 100 / total
+            if width >= min_width:
+                if len(rows) <= depth:
+                    rows.append([])
+                rows[depth].append({
+                    'name': label,
+                    'samples': node['value'],
+                    'left': round(left, 3),
+                    'width': round(width, 3),
+                })
+                walk(node['children'], depth + 1, left)
+            left += width
+
+    walk(root['children'], 0, 0)
+    return rows
@@ -0,0 +1,153 @@
+# courses/renderers.py
+
+import re
+
+from rest_framework import renderers
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+
+from . import metrics
+
+try:
+    import orjson
+except ImportError:  # orjson o'rnatilmagan bo'lsa standart json ishlaydi
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+# orjson eksponentni "1e16" ko'rinishida yozadi, json esa "1e+16" / "1e-09";
+# 1e-5 ... 1e-8 ni esa "0.00001" deb yozadi, json eksponent bilan ("1e-05").
+# Oldidagi raqam alohida tekshiriladi - 'e' bilan boshlangan regex ancha tez.
+re_exponent = re.compile(rb'e[-0-9]')
+SMALL_FLOAT = b'0.0000'
+# Faqat JSON qiymati boshidagi son (matn ichidagi "0.0000" emas)
+re_small_float = re.compile(rb'(?:^|[:,\[])-?0\.0000')
+NUMBER_BYTES = b'0123456789.-'
+VALUE_START = b':,['
+re_line_separator = re.compile(rb'\xe2\x80[\xa8\xa9]')
+
+NON_FINITE = object()
+
+
+def scan_floats(data):
+    """Ma'lumotdagi floatlar: ``False`` - yo'q, ``True`` - bor, ``NON_FINITE`` - NaN/Infinity bor.
+
+    Javob baytlarini regex bilan skanerlashdan ancha arzon; float bo'lmasa
+    (ko'pchilik endpointlar) chiqish umuman tekshirilmaydi. ``default``
+    orqali o'tadigan noma'lum turlar ehtiyot uchun float deb hisoblanadi.
+    """
+    found = False
+    stack = [(data,)]
+    pop, push = stack.pop, stack.append
+    while stack:
+        container = pop()
+        for value in (container.values() if isinstance(container, dict) else container):
+            cls = type(value)
+            if cls is str or cls is int or value is None or cls is bool:
+                continue
+            if cls is float:
+                # NaN va Infinity uchun value - value == nan
+                if value - value != 0:
+                    return NON_FINITE
+                found = True
+            elif isinstance(value, (dict, list, tuple)):
+                push(value)
+            else:
+                found = True
+    return found
+
+
+def _in_number(data, index):
+    """``data[index]`` JSON son ichidami - oldida raqamlar, ulardan oldin ``:``/``,``/``[``"""
+    start = index
+    while start and data[start - 1] in NUMBER_BYTES:
+        start -= 1
+    return start < index and (start == 0 or data[start - 1] in VALUE_START)
+
+
+def has_float_exponent(data):
+    """Python ``repr`` da eksponentli bo'ladigan float bormi (matn ichidagi "1e5" hisobga olinmaydi)"""
+    if SMALL_FLOAT in data and re_small_float.search(data):
+        return True
+    return any(_in_number(data, m.start()) for m in re_exponent.finditer(data))
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+    """orjson asosidagi JSONRenderer - chiqish standart renderer bilan baytma-bayt bir xil.
+
+    datetime, Decimal, lazy matnlar kabi turlar DRF ``JSONEncoder`` orqali
+    o'tadi. orjson qo'llamaydigan holatlarda (indent, katta butun sonlar,
+    str bo'lmagan kalitlar, eksponentli floatlar, NaN/Infinity) standart rendererga
+    qaytiladi - u NaN da xuddi avvalgidek ``ValueError`` beradi.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if orjson is None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        floats = scan_floats(data)
+        if floats is NON_FINITE:
+            # orjson NaN ni jimgina null qiladi; JSONRenderer ValueError beradi
+            metrics.incr('renderer.json.fallback')
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(
+                data, default=self.encoder_class().default,
+                option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS,
+            )
+        except orjson.JSONEncodeError:
+            metrics.incr('renderer.json.fallback')
+            return super().render(data, accepted_media_type, renderer_context)
+        if floats and has_float_exponent(ret):
+            metrics.incr('renderer.json.fallback')
+            return super().render(data, accepted_media_type, renderer_context)
+        if re_line_separator.search(ret):
+            # JSONRenderer kabi - JavaScript bilan mos bo'lishi uchun
+            ret = ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
+        return ret
+
+
+class FastJSONParser(JSONParser):
+    """orjson bilan JSON parser; orjson bo'lmasa standart parser"""
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
+
+
+class MessagePackRenderer(renderers.BaseRenderer):
+    """Mobil ilova uchun MessagePack (``Accept: application/msgpack``)"""
+
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+    encoder_class = renderers.JSONRenderer.encoder_class
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=self.encoder_class().default, use_bin_type=True)
+
+
+class MessagePackParser(BaseParser):
+    media_type = 'application/msgpack'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read(), raw=False)
+        except (ValueError, msgpack.ExtraData, msgpack.FormatError, msgpack.StackError) as exc:
+            raise ParseError('MessagePack parse error - %s' % str(exc))
@@ -0,0 +1,22 @@
+# courses/request_cache.py
+
+from contextvars import ContextVar
+
+
+# Joriy batch so'rovi davomidagi qiymatlar; batch tashqarisida ``None``
+request_cache = ContextVar('request_cache', default=None)
+
+
+def memoize(key, loader):
+    """Batch ichida bir xil qiymatni bir marta yuklash.
+
+    Batch tashqarisida ``loader()`` ni shunchaki chaqiradi. Ichida esa
+    natija batch davomida saqlanadi va boshqa sub-so'rovlar qayta ishlatadi.
+    """
+    store = request_cache.get()
+    if store is None:
+        return loader()
+    try:
+        return store[key]
+    except KeyError:
+        return store.setdefault(key, loader())
@@ -0,0 +1,138 @@
+# courses/response_cache.py
+
+import hashlib
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+from rest_framework.response import Response
+
+from . import metrics
+
+
+DEFAULT_RESPONSE_CACHE = {
+    'ENABLED': True,
+    # Kalitlar model versiyalari bilan eskiradi - muddat faqat xotirani bo'shatish uchun
+    'TIMEOUT': 60 * 60,
+    'FORMATS': ('json', 'msgpack'),
+}
+
+
+def _config():
+    return {**DEFAULT_RESPONSE_CACHE, **getattr(settings, 'RESPONSE_CACHE', {})}
+
+
+# ========================
+# MODEL VERSIONS
+# ========================
+
+def _version_key(model):
+    return f'version:{model._meta.label_lower}'
+
+
+def model_versions(models):
+    """Modellarning joriy versiyalari - bitta ``get_many``.
+
+    Kesh tozalangan bo'lsa versiya vaqtdan olinadi, shuning uchun eski
+    javoblar kalitlari hech qachon qayta to'g'ri kelib qolmaydi.
+    """
+    keys = [_version_key(model) for model in models]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, time.time_ns(), None)
+            versions[key] = cache.get(key, 0)
+    return [versions[key] for key in keys]
+
+
+def bump_model_version(model):
+    """Model yozuvi o'zgardi - shu modelga bog'liq barcha javoblar eskiradi"""
+    def bump():
+        try:
+            cache.incr(_version_key(model))
+        except ValueError:
+            cache.set(_version_key(model), time.time_ns(), None)
+    transaction.on_commit(bump)
+
+
+# ========================
+# RESPONSE CACHE
+# ========================
+
+def response_cache_key(request, models):
+    params = sorted(
+        (key, request.query_params.getlist(key))
+        for key in request.query_params if key != 'format'
+    )
+    parts = [
+        request.scheme, request.get_host(), request.path, repr(params),
+        request.accepted_renderer.format, *map(str, model_versions(models)),
+    ]
+    return 'response:' + hashlib.md5('|'.join(parts).encode()).hexdigest()
+
+
+def _hit_ratio():
+    hits, misses = metrics.value('response_cache.hit'), metrics.value('response_cache.miss')
+    return round(hits / (hits + misses), 3) if hits + misses else None
+
+
+metrics.register_gauge('response_cache.hit_ratio', _hit_ratio)
+
+
+def cached_response(view, request, handler):
+    """``handler()`` javobini umumiy keshdan olish yoki keshga yozish.
+
+    Kalit: yo'l, tartiblangan query parametrlar, tanlangan format va
+    ``view.cache_models`` versiyalari. Faqat GET/HEAD va JSON/MessagePack
+    javoblari keshlanadi (Browsable API sahifasi emas).
+    """
+    config = _config()
+    if (not config['ENABLED'] or request.method not in ('GET', 'HEAD')
+            or request.accepted_renderer.format not in config['FORMATS']):
+        return handler()
+
+    key = response_cache_key(request, view.cache_models)
+    cached = cache.get(key)
+    if cached is not None:
+        metrics.incr('response_cache.hit')
+        metrics.incr(f'response_cache.{view.basename}.hit')
+        content, content_type = cached
+        return HttpResponse(content, content_type=content_type)
+
+    metrics.incr('response_cache.miss')
+    metrics.incr(f'response_cache.{view.basename}.miss')
+    response = handler()
+    if isinstance(response, Response) and response.status_code == 200:
+        # finalize_response qiladigan ishni oldinroq: render qilingan baytlarni saqlash
+        response.accepted_renderer = request.accepted_renderer
+        response.accepted_media_type = request.accepted_media_type
+        response.renderer_context = view.get_renderer_context()
+        response.render()
+        cache.set(key, (response.content, response['Content-Type']), config['TIMEOUT'])
+    return response
+
+
+def cache_response(method):
+    """ViewSet action uchun ``cached_response`` dekoratori"""
+    @wraps(method)
+    def wrapper(self, request, *args, **kwargs):
+        return cached_response(self, request, lambda: method(self, request, *args, **kwargs))
+    return wrapper
+
+
+class ResponseCacheMixin:
+    """``list`` va ``retrieve`` javoblarini keshlaydi.
+
+    ``cache_models`` - javobga kiradigan barcha modellar; ulardan biri
+    o'zgarsa (signal orqali versiya oshadi) kesh o'z-o'zidan eskiradi.
+    """
+    cache_models = ()
+
+    def list(self, request, *args, **kwargs):
+        return cached_response(self, request, lambda: super(ResponseCacheMixin, self).list(request, *args, **kwargs))
+
+    def retrieve(self, request, *args, **kwargs):
+        return cached_response(self, request, lambda: super(ResponseCacheMixin, self).retrieve(request, *args, **kwargs))
@@ -4,6 +4,7 @@ from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
 from .models import Term, Subject, Course, Category, Lesson, Enrollment, Post, Quiz, QuizQuestion, QuizAnswer
+from .sparse import SparseFieldsMixin
 
 User = get_user_model()
 
@@ -11,7 +12,7 @@ User = get_user_model()
 # ========================
 # USER SERIALIZERS
 # ========================
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ['id', 'username', 'email', 'first_name', 'last_name',
@@ -48,7 +49,7 @@ class LoginSerializer(serializers.Serializer):
 # ========================
 # GLOSSARY SERIALIZERS
 # ========================
-class TermSerializer(serializers.ModelSerializer):
+class TermSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Term
         fields = ['id', 'title', 'description', 'created_at', 'order', 'is_active']
@@ -57,21 +58,18 @@ class TermSerializer(serializers.ModelSerializer):
 # ========================
 # SUBJECT SERIALIZERS
 # ========================
-class SubjectSerializer(serializers.ModelSerializer):
-    courses_count = serializers.SerializerMethodField()
+class SubjectSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    courses_count = serializers.IntegerField(source='published_courses_count', read_only=True)
 
     class Meta:
         model = Subject
         fields = ['id', 'name', 'slug', 'description', 'icon', 'image', 'order', 'courses_count']
 
-    def get_courses_count(self, obj):
-        return obj.courses.filter(is_published=True).count()
-
 
 # ========================
 # COURSE SERIALIZERS
 # ========================
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Category
         fields = ['id', 'name', 'slug', 'description', 'icon']
@@ -99,27 +97,44 @@ class QuizSerializer(serializers.ModelSerializer):
         fields = ['id', 'title', 'pass_score', 'questions']
 
 
-class LessonSerializer(serializers.ModelSerializer):
+class LessonSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     has_quiz = serializers.SerializerMethodField()
+    has_assignment = serializers.SerializerMethodField()
     embed_url = serializers.SerializerMethodField()
+    quiz = QuizSerializer(read_only=True, allow_null=True)
 
     class Meta:
         model = Lesson
         fields = ['id', 'title', 'content', 'video_url', 'embed_url',
-                  'lecture_file', 'order', 'duration', 'is_free', 'has_quiz']
+                  'lecture_file', 'order', 'duration', 'is_free', 'has_quiz',
+                  'has_assignment', 'quiz']
+
+    def get_fields(self):
+        fields = super().get_fields()
+        # To'liq test daraxti faqat ?include=quiz bilan
+        if 'quiz' not in self.context.get('include', ()):
+            fields.pop('quiz', None)
+        return fields
 
     def get_has_quiz(self, obj):
+        # Exists() annotatsiyasi bo'lsa undan, aks holda OneToOne so'rovi
+        if hasattr(obj, 'quiz_exists'):
+            return obj.quiz_exists
         return hasattr(obj, 'quiz')
 
+    def get_has_assignment(self, obj):
+        if hasattr(obj, 'assignment_exists'):
+            return obj.assignment_exists
+        return hasattr(obj, 'assignment')
+
     def get_embed_url(self, obj):
         return obj.get_youtube_embed_url()
 
 
-class CourseSerializer(serializers.ModelSerializer):
+class CourseSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     category = CategorySerializer(read_only=True)
     subject = SubjectSerializer(read_only=True)
     instructor = UserSerializer(read_only=True)
-    lessons_count = serializers.SerializerMethodField()
 
     class Meta:
         model = Course
@@ -127,11 +142,8 @@ class CourseSerializer(serializers.ModelSerializer):
                   'image', 'video_url', 'instructor', 'duration', 'level',
                   'price', 'is_free', 'order', 'lessons_count', 'created_at']
 
-    def get_lessons_count(self, obj):
-        return obj.lessons.count()
-
 
-class CourseDetailSerializer(serializers.ModelSerializer):
+class CourseDetailSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     category = CategorySerializer(read_only=True)
     subject = SubjectSerializer(read_only=True)
     instructor = UserSerializer(read_only=True)
@@ -147,7 +159,7 @@ class CourseDetailSerializer(serializers.ModelSerializer):
 # ========================
 # POST SERIALIZERS
 # ========================
-class PostSerializer(serializers.ModelSerializer):
+class PostSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     author = UserSerializer(read_only=True)
 
     class Meta:
@@ -0,0 +1,36 @@
+# courses/sessions.py
+
+import hashlib
+
+from django.contrib.sessions.backends.cached_db import SessionStore as CachedDBStore
+
+
+class SessionStore(CachedDBStore):
+    """Kesh + baza sessiyalari; ma'lumot o'zgarmagan bo'lsa qayta yozmaydi.
+
+    O'qish avval keshdan, keyin bazadan bo'ladi (``cached_db``). Saqlashda
+    yuklangan va joriy ma'lumotlarning izi solishtiriladi - ``modified``
+    belgilangan, lekin aslida hech narsa o'zgarmagan sessiya bazaga
+    yozilmaydi.
+    """
+
+    _loaded_fingerprint = None
+
+    def _fingerprint(self, data):
+        return hashlib.blake2b(self.serializer().dumps(data), digest_size=16).digest()
+
+    def load(self):
+        data = super().load()
+        self._loaded_fingerprint = self._fingerprint(data)
+        return data
+
+    def save(self, must_create=False):
+        if (
+            not must_create
+            and self.session_key is not None
+            and self._loaded_fingerprint is not None
+            and self._loaded_fingerprint == self._fingerprint(self._get_session())
+        ):
+            return
+        super().save(must_create)
+        self._loaded_fingerprint = self._fingerprint(self._get_session())
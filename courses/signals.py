@@ -0,0 +1,190 @@
+# courses/signals.py
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from . import counters, statistics
+from .authentication import revoke_token
+from .catalog import invalidate_subject_courses
+from .dashboard import invalidate_dashboards
+from .glossary import bump_version, invalidate_letter_index
+from .live import live_feed, load_events
+from .models import (
+    User, Term, Subject, Category, Course, Lesson, Quiz, QuizQuestion, QuizAnswer, Post,
+    PracticalAssignment, Enrollment, LessonProgress, AssignmentSubmission,
+    FinalTestQuestion, FinalTestResult
+)
+from .pools import invalidate_question_pool
+from .response_cache import bump_model_version
+
+
+# ========================
+# COUNTERS
+# ========================
+@receiver(pre_save, sender=Course)
+@receiver(pre_save, sender=Lesson)
+@receiver(pre_save, sender=Enrollment)
+def counted_pre_save(sender, instance, raw=False, **kwargs):
+    instance._counted_state = None if raw else counters.saved_state(instance)
+
+
+@receiver(post_save, sender=Course)
+@receiver(post_save, sender=Lesson)
+@receiver(post_save, sender=Enrollment)
+def counted_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    counters.apply_change(sender, getattr(instance, '_counted_state', None), counters.current_state(instance))
+
+
+@receiver(post_delete, sender=Course)
+@receiver(post_delete, sender=Lesson)
+@receiver(post_delete, sender=Enrollment)
+def counted_deleted(sender, instance, **kwargs):
+    counters.apply_change(sender, counters.current_state(instance), None)
+
+
+# ========================
+# STATISTICS
+# ========================
+@receiver(pre_save, sender=User)
+@receiver(pre_save, sender=Course)
+@receiver(pre_save, sender=Enrollment)
+@receiver(pre_save, sender=LessonProgress)
+@receiver(pre_save, sender=FinalTestResult)
+@receiver(pre_save, sender=AssignmentSubmission)
+def statistics_pre_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    instance._statistics_state = None if raw else statistics.saved_state(instance, update_fields)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=Course)
+@receiver(post_save, sender=Enrollment)
+@receiver(post_save, sender=LessonProgress)
+@receiver(post_save, sender=FinalTestResult)
+@receiver(post_save, sender=AssignmentSubmission)
+def statistics_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    statistics.apply_change(
+        sender, getattr(instance, '_statistics_state', None), statistics.current_state(instance)
+    )
+
+
+@receiver(post_delete, sender=User)
+@receiver(post_delete, sender=Course)
+@receiver(post_delete, sender=Enrollment)
+@receiver(post_delete, sender=LessonProgress)
+@receiver(post_delete, sender=FinalTestResult)
+@receiver(post_delete, sender=AssignmentSubmission)
+def statistics_deleted(sender, instance, **kwargs):
+    statistics.apply_change(sender, statistics.current_state(instance), None)
+
+
+# ========================
+# SUBJECT COURSE STRIP
+# ========================
+@receiver([post_save, post_delete], sender=Course)
+def course_changed(sender, instance, **kwargs):
+    # Kurs boshqa fanga o'tgan bo'lsa, eski fan ro'yxati ham yangilanadi
+    old_state = getattr(instance, '_counted_state', None)
+    invalidate_subject_courses(instance.subject_id, old_state[0] if old_state else None)
+
+
+@receiver([post_save, post_delete], sender=Lesson)
+def lesson_changed(sender, instance, **kwargs):
+    # Ro'yxatda darslar soni bor
+    subject_ids = Course.objects.filter(pk=instance.course_id).values_list('subject_id', flat=True)
+    invalidate_subject_courses(*subject_ids)
+
+
+@receiver(post_save, sender=User)
+def instructor_changed(sender, instance, created, update_fields=None, **kwargs):
+    # Ro'yxatda o'qituvchi ismi bor
+    if created or (update_fields and set(update_fields) <= {'last_login'}):
+        return
+    subject_ids = (
+        Course.objects.filter(instructor=instance).order_by().values_list('subject_id', flat=True).distinct()
+    )
+    invalidate_subject_courses(*subject_ids)
+
+
+# ========================
+# FINAL TEST POOL
+# ========================
+@receiver([post_save, post_delete], sender=FinalTestQuestion)
+def final_test_question_changed(sender, instance, **kwargs):
+    invalidate_question_pool(instance.test_id)
+
+
+# ========================
+# GLOSSARY
+# ========================
+@receiver([post_save, post_delete], sender=Term)
+def term_changed(sender, instance, **kwargs):
+    invalidate_letter_index()
+    bump_version()
+
+
+# ========================
+# DASHBOARD
+# ========================
+@receiver([post_save, post_delete], sender=Enrollment)
+@receiver([post_save, post_delete], sender=LessonProgress)
+@receiver([post_save, post_delete], sender=AssignmentSubmission)
+@receiver([post_save, post_delete], sender=FinalTestResult)
+def dashboard_changed(sender, instance, **kwargs):
+    invalidate_dashboards([instance.user_id])
+
+
+# ========================
+# LIVE FEED
+# ========================
+@receiver(post_save, sender=AssignmentSubmission)
+@receiver(post_save, sender=FinalTestResult)
+def live_event_created(sender, instance, created, raw=False, **kwargs):
+    # Shu jarayonda kuzatuvchi bo'lmasa so'rov ham bajarilmaydi
+    if not created or raw or not live_feed.has_subscribers():
+        return
+    kind = 'submission' if sender is AssignmentSubmission else 'result'
+    transaction.on_commit(lambda: live_feed.publish(load_events(kind, pk=instance.pk)))
+
+
+# ========================
+# RESPONSE CACHE
+# ========================
+@receiver([post_save, post_delete], sender=Term)
+@receiver([post_save, post_delete], sender=Subject)
+@receiver([post_save, post_delete], sender=Category)
+@receiver([post_save, post_delete], sender=Course)
+@receiver([post_save, post_delete], sender=Lesson)
+@receiver([post_save, post_delete], sender=Quiz)
+@receiver([post_save, post_delete], sender=QuizQuestion)
+@receiver([post_save, post_delete], sender=QuizAnswer)
+@receiver([post_save, post_delete], sender=PracticalAssignment)
+@receiver([post_save, post_delete], sender=Post)
+@receiver([post_save, post_delete], sender=User)
+def cached_model_changed(sender, instance, update_fields=None, **kwargs):
+    # Login paytida faqat last_login yangilanadi - javoblarga ta'sir qilmaydi
+    if update_fields and set(update_fields) <= {'last_login'}:
+        return
+    bump_model_version(sender)
+
+
+# ========================
+# TOKEN CACHE
+# ========================
+@receiver(post_delete, sender=Token)
+def token_deleted(sender, instance, **kwargs):
+    revoke_token(instance.key)
+
+
+@receiver(post_save, sender=User)
+def user_changed(sender, instance, created, update_fields=None, **kwargs):
+    # Login paytida faqat last_login yangilanadi - keshni tozalash shart emas
+    if created or (update_fields and set(update_fields) <= {'last_login'}):
+        return
+    for key in Token.objects.filter(user=instance).values_list('key', flat=True):
+        revoke_token(key)
@@ -0,0 +1,137 @@
+# courses/sparse.py
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+
+def parse_paths(value):
+    """``'id,subject.name'`` -> ``{'id': {}, 'subject': {'name': {}}}``"""
+    tree = {}
+    for path in filter(None, (part.strip() for part in value.split(','))):
+        node = tree
+        for name in path.split('.'):
+            node = node.setdefault(name, {})
+    return tree
+
+
+class SparseFieldsMixin:
+    """Serializer maydonlarini ``?fields=`` va ``?expand=`` bo'yicha tanlash.
+
+    Parametrlar berilmasa javob o'zgarmaydi. Berilsa, faqat tanlangan
+    maydonlar qoladi; ichki obyektlar (subject, instructor, ...) faqat
+    ``expand`` da yoki nuqtali ``fields`` da (``subject.name``) bo'lsa
+    to'liq beriladi, aks holda faqat id si qaytadi.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        selection = self._sparse_selection()
+        if selection is None:
+            return fields
+
+        only, expand = selection
+        selected = {}
+        for name, field in fields.items():
+            if only is not None and name not in only and name not in expand:
+                continue
+            if isinstance(field, serializers.BaseSerializer):
+                child_only = (only or {}).get(name) or None
+                if name in expand or child_only:
+                    child = field.child if isinstance(field, serializers.ListSerializer) else field
+                    child.sparse_selection = (child_only, expand.get(name, {}))
+                else:
+                    many = isinstance(field, serializers.ListSerializer)
+                    field = serializers.PrimaryKeyRelatedField(read_only=True, many=many, source=field.source)
+            selected[name] = field
+        return selected
+
+    def _sparse_selection(self):
+        if hasattr(self, 'sparse_selection'):
+            return self.sparse_selection
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        if parent is not None:
+            return None
+        # Eng yuqori serializer - parametrlar contextda
+        only, expand = self.context.get('fields'), self.context.get('expand')
+        if only is None and expand is None:
+            return None
+        return only, expand or {}
+
+
+def sparse_queryset(queryset, serializer):
+    """Tanlangan maydonlar bo'yicha ``only()``, ``select_related`` va prefetch.
+
+    JOIN lar faqat kengaytirilgan (nested) obyektlar uchun, prefetch lar
+    faqat tanlangan ``many`` maydonlar uchun qoladi. Maydonni modeldan
+    topib bo'lmasa (method field va h.k.) queryset o'zgarmaydi.
+    """
+    plan = _plan(serializer, queryset.model, '')
+    if plan is None:
+        return queryset
+    columns, related, roots = plan
+
+    prefetches = []
+    for lookup in queryset._prefetch_related_lookups:
+        path = lookup.prefetch_to if isinstance(lookup, Prefetch) else lookup
+        if path.split('__')[0] in roots:
+            prefetches.append(lookup)
+    queryset = queryset.select_related(None).prefetch_related(None)
+    if related:
+        queryset = queryset.select_related(*related)
+    return queryset.prefetch_related(*prefetches).only(*columns)
+
+
+def _plan(serializer, model, prefix):
+    columns, related, roots = [prefix + model._meta.pk.name], [], set()
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+        source = field.source
+        if source == '*' or '.' in source:
+            return None
+        if isinstance(field, (serializers.ListSerializer, serializers.ManyRelatedField)):
+            roots.add(source)
+            continue
+        try:
+            model_field = model._meta.get_field(source)
+        except FieldDoesNotExist:
+            return None
+        if isinstance(field, serializers.BaseSerializer):
+            nested = _plan(field, model_field.related_model, prefix + source + '__')
+            if nested is None:
+                return None
+            related.append(prefix + source)
+            related.extend(nested[1])
+            columns.extend(nested[0])
+        else:
+            columns.append(prefix + source)
+    return columns, related, roots
+
+
+class SparseFieldsViewMixin:
+    """ViewSet uchun: parametrlarni contextga beradi va querysetni toraytiradi"""
+
+    def sparse_context(self):
+        if self.request is None or self.request.method not in SAFE_METHODS:
+            return {}
+        params = self.request.query_params
+        context = {}
+        # Bo'sh ``?fields=`` - barcha maydonlar
+        for name in ('fields', 'expand'):
+            paths = parse_paths(params.get(name, ''))
+            if paths:
+                context[name] = paths
+        return context
+
+    def get_serializer_context(self):
+        return {**super().get_serializer_context(), **self.sparse_context()}
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.sparse_context():
+            queryset = sparse_queryset(queryset, self.get_serializer())
+        return queryset
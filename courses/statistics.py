@@ -0,0 +1,154 @@
+# courses/statistics.py
+
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db.models import Count, F
+from django.db.models.functions import Greatest, TruncWeek
+from django.utils import timezone
+
+from .models import (
+    AssignmentSubmission, Course, Enrollment, FinalTestResult, FinalTestStats,
+    LessonProgress, Statistic, User
+)
+
+
+STATISTICS_CACHE_KEY = 'statistics'
+STATISTICS_CACHE_TIMEOUT = 60
+WEEK_PREFIX = 'submissions_week:'
+WEEKS_SHOWN = 12
+
+# Statistikaga ta'sir qiluvchi maydonlar
+TRACKED_FIELDS = {
+    User: ('is_staff',),
+    Course: ('is_published',),
+    Enrollment: (),
+    LessonProgress: ('completed',),
+    FinalTestResult: ('passed',),
+    AssignmentSubmission: ('submitted_at',),
+}
+# Yaratilgandan keyin kuzatilayotgan maydonlari o'zgarmaydi - oldingi holat so'ralmaydi
+IMMUTABLE = {Enrollment, FinalTestResult, AssignmentSubmission}
+
+
+def _week_key(value):
+    day = timezone.localdate(value) if timezone.is_aware(value) else value.date()
+    return WEEK_PREFIX + (day - timedelta(days=day.weekday())).isoformat()
+
+
+def _contributions(model, state):
+    """Obyekt qaysi ko'rsatkichlarga +1 qo'shadi"""
+    if state is None:
+        return set()
+    if model is User:
+        return set() if state[0] else {'students'}
+    if model is Course:
+        return {'courses'} if state[0] else set()
+    if model is Enrollment:
+        return {'enrollments'}
+    if model is LessonProgress:
+        return {'completed_lessons'} if state[0] else set()
+    if model is FinalTestResult:
+        return {'final_test_results', 'passed_final_tests'} if state[0] else {'final_test_results'}
+    return {_week_key(state[0])} if state[0] else set()
+
+
+def adjust(key, delta):
+    """Bitta ko'rsatkichni ``F()`` bilan o'zgartirish (0 dan pastga tushmaydi)"""
+    value = F('value') + delta if delta > 0 else Greatest(F('value') + delta, 0)
+    if Statistic.objects.filter(key=key).update(value=value, updated_at=timezone.now()):
+        return
+    if delta > 0:
+        statistic, created = Statistic.objects.get_or_create(key=key, defaults={'value': delta})
+        if not created:
+            Statistic.objects.filter(pk=statistic.pk).update(value=value, updated_at=timezone.now())
+
+
+def current_state(instance):
+    return tuple(getattr(instance, name) for name in TRACKED_FIELDS[type(instance)])
+
+
+def saved_state(instance, update_fields=None):
+    """Bazadagi oldingi holat - pre_save da chaqiriladi.
+
+    ``update_fields`` kuzatilayotgan maydonlarni o'z ichiga olmasa (masalan
+    login paytidagi ``last_login``) so'rov bajarilmaydi.
+    """
+    if instance._state.adding or instance.pk is None:
+        return None
+    fields = TRACKED_FIELDS[type(instance)]
+    if type(instance) in IMMUTABLE or (update_fields is not None and not set(fields) & set(update_fields)):
+        return current_state(instance)
+    return type(instance)._base_manager.filter(pk=instance.pk).values_list(*fields).first()
+
+
+def apply_change(model, old_state, new_state):
+    old, new = _contributions(model, old_state), _contributions(model, new_state)
+    for key in old - new:
+        adjust(key, -1)
+    for key in new - old:
+        adjust(key, 1)
+
+
+def compute():
+    """Barcha ko'rsatkichlar to'liq hisoblanganda (``refresh_statistics`` uchun)"""
+    values = {
+        'students': User.objects.filter(is_staff=False).count(),
+        'courses': Course.objects.filter(is_published=True).count(),
+        'enrollments': Enrollment.objects.count(),
+        'completed_lessons': LessonProgress.objects.filter(completed=True).count(),
+        'final_test_results': FinalTestResult.objects.count(),
+        'passed_final_tests': FinalTestResult.objects.filter(passed=True).count(),
+    }
+    weeks = (
+        AssignmentSubmission.objects.annotate(week=TruncWeek('submitted_at'))
+        .order_by().values('week').annotate(count=Count('pk'))
+    )
+    for row in weeks:
+        values[_week_key(row['week'])] = row['count']
+    return values
+
+
+def refresh():
+    """Jadvalni haqiqiy sonlar bilan tenglash; o'zgargan ko'rsatkichlar ``{kalit: (eski, yangi)}``"""
+    values = compute()
+    existing = dict(Statistic.objects.values_list('key', 'value'))
+    changed = {}
+    for key, value in values.items():
+        if existing.get(key) != value:
+            Statistic.objects.update_or_create(key=key, defaults={'value': value})
+            changed[key] = (existing.get(key), value)
+    stale = [key for key in existing if key.startswith(WEEK_PREFIX) and key not in values]
+    Statistic.objects.filter(key__in=stale).delete()
+    changed.update({key: (existing[key], None) for key in stale})
+    cache.delete(STATISTICS_CACHE_KEY)
+    return changed
+
+
+def site_statistics():
+    """Bosh sahifa, About va admin uchun tayyor sonlar - 2 ta kichik so'rov, 1 daqiqa keshda.
+
+    Chiqish testlari fanga bog'lanmagan, shuning uchun o'rtacha ball har
+    bir test bo'yicha ``FinalTestStats`` dan olinadi.
+    """
+    data = cache.get(STATISTICS_CACHE_KEY)
+    if data is not None:
+        return data
+    values = dict(Statistic.objects.values_list('key', 'value'))
+    weeks = sorted(
+        ((key[len(WEEK_PREFIX):], value) for key, value in values.items() if key.startswith(WEEK_PREFIX)),
+        reverse=True,
+    )[:WEEKS_SHOWN]
+    data = {key: value for key, value in values.items() if not key.startswith(WEEK_PREFIX)}
+    data['submissions_per_week'] = [{'week': week, 'count': count} for week, count in weeks]
+    data['final_tests'] = [
+        {
+            'title': title,
+            'attempts': attempts,
+            'average_score': round(score_sum / attempts, 1),
+        }
+        for title, attempts, score_sum in FinalTestStats.objects.filter(attempts__gt=0)
+        .order_by('test__order', 'test__title').values_list('test__title', 'attempts', 'score_sum')
+    ]
+    cache.set(STATISTICS_CACHE_KEY, data, STATISTICS_CACHE_TIMEOUT)
+    return data
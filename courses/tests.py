@@ -1,3 +1,1507 @@
-from django.test import TestCase
+import asyncio
+import gzip
+import importlib.util
+import io
+import json
+import math
+import os
+import statistics
+import tempfile
+import threading
+import time
+import uuid
+from datetime import date, datetime, time as dt_time, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.apps import apps
+from django.conf import settings
+from django.contrib.staticfiles.utils import matches_patterns
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.db import connection
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import AsyncClient, AsyncRequestFactory, RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.authtoken.models import Token
+from rest_framework.renderers import JSONRenderer
+
+from core.storage import CompressedManifestStaticFilesStorage
+
+from . import metrics
+from .authentication import REVOKED, _token_cache_key
+from .catalog import subject_courses
+from .counters import reconcile
+from .dashboard import build_dashboard, get_dashboard
+from .db import apply_sqlite_pragmas
+from .glossary import autocomplete_index, decode_cursor, encode_cursor, letter_index, term_page
+from .grading import bulk_grade, submission_queue
+from .live import LiveFeed, event_stream
+from .middleware import AdmissionController, CompressionMiddleware, SessionMiddleware, brotli
+from .pools import draw_question_ids, get_question_pool, get_question_pools, new_seed, sign_attempt, unsign_attempt
+from .profiling import flame_graph
+from .renderers import FastJSONParser, FastJSONRenderer, MessagePackParser, MessagePackRenderer, msgpack
+from .request_cache import memoize
+from .response_cache import model_versions
+from .serializers import CourseSerializer, PostSerializer, SubjectSerializer, TermSerializer
+from .sessions import SessionStore
+from .statistics import compute, refresh, site_statistics
+from .views import live_events
+from .models import (
+    AboutPage, AssignmentSubmission, Category, Course, Enrollment, FinalTest, FinalTestAnswer,
+    FinalTestItemStats, FinalTestQuestion, FinalTestResult, FinalTestStats, Lesson, LessonProgress, Post,
+    PracticalAssignment, Quiz, QuizAnswer, QuizQuestion, Reference, RequestProfile, Statistic, Subject, Term, User
+)
+
+
+def seed(scale):
+    """Barcha sahifalar uchun ma'lumotlar; ``scale`` oshganda hamma narsa proporsional ko'payadi"""
+    instructor = User.objects.create_user('teacher', password='parol12345', is_staff=True)
+    student = User.objects.create_user('student', password='parol12345')
+    AboutPage.get_instance()
+
+    categories = [Category.objects.create(name=f'Kategoriya {i}', slug=f'category-{i}') for i in range(2 * scale)]
+    for s in range(2 * scale):
+        subject = Subject.objects.create(name=f'Fan {s}', slug=f'subject-{s}', order=s)
+        for c in range(3):
+            course = Course.objects.create(
+                title=f'Kurs {s}-{c}', slug=f'course-{s}-{c}', subject=subject,
+                category=categories[c % len(categories)], instructor=instructor,
+                description='<p>Tavsif</p>', duration='4 hafta', price='0', is_free=True,
+                is_published=True, order=c,
+            )
+            Enrollment.objects.create(user=student, course=course)
+            for l in range(3):
+                lesson = Lesson.objects.create(
+                    course=course, title=f'Dars {l}', content='<p>Matn</p>', order=l,
+                    video_url='https://youtu.be/dQw4w9WgXcQ',
+                )
+                LessonProgress.objects.create(user=student, lesson=lesson, completed=l == 0)
+                if l == 0:
+                    quiz = Quiz.objects.create(lesson=lesson, title='Test')
+                    for q in range(2):
+                        question = QuizQuestion.objects.create(quiz=quiz, question=f'Savol {q}', order=q)
+                        for a in range(3):
+                            QuizAnswer.objects.create(question=question, text=f'Javob {a}', is_correct=a == 0)
+                if l == 1:
+                    assignment = PracticalAssignment.objects.create(
+                        lesson=lesson, title=f'Topshiriq {s}-{c}', description='Vazifa',
+                    )
+                    AssignmentSubmission.objects.create(
+                        assignment=assignment, user=student, submission_file='assignments/submissions/ish.pdf',
+                    )
+
+    for i in range(3 * scale):
+        Post.objects.create(
+            title=f'Maqola {i}', slug=f'post-{i}', content='<p>Matn</p>', author=instructor, is_published=True,
+        )
+        Reference.objects.create(title=f'Manba {i}', category=('book', 'article', 'website')[i % 3])
+    for i in range(10 * scale):
+        Term.objects.create(title=f'{"ABCDE"[i % 5]}tama {i}', description="<p>Ta'rif</p>", order=i)
+
+    for t in range(2 * scale):
+        test = FinalTest.objects.create(title=f'Chiqish testi {t}', order=t)
+        for q in range(5):
+            question = FinalTestQuestion.objects.create(test=test, question=f'Savol {q}', order=q)
+            for a in range(3):
+                FinalTestAnswer.objects.create(question=question, text=f'Javob {a}', is_correct=a == 0)
+        FinalTestResult.objects.create(test=test, user=student, score=60, correct=3, total=5, passed=True)
+
+
+def urls():
+    """``(nom, url)`` - courses/urls.py dagi har bir GET sahifa va API action.
+
+    ``live_events`` (cheksiz SSE oqimi), ``logout`` va POST-only API lar
+    (register/login/logout/batch) bu ro'yxatga kirmaydi; batch alohida tekshiriladi.
+    """
+    course = Course.objects.get(slug='course-0-0')
+    lesson = course.lessons.get(order=0)
+    assignment = PracticalAssignment.objects.filter(lesson__course=course).get()
+    test = FinalTest.objects.get(order=0)
+    term = Term.objects.order_by('pk').first()
+    post = Post.objects.get(slug='post-0')
+    return [
+        ('index', reverse('index')),
+        ('glossary', reverse('glossary')),
+        ('glossary_rows', reverse('glossary_rows') + '?letter=A'),
+        ('subjects', reverse('subjects')),
+        ('subject_detail', reverse('subject_detail', args=['subject-0'])),
+        ('courses', reverse('courses')),
+        ('course_detail', reverse('course_detail', args=[course.slug])),
+        ('lesson', reverse('lesson', args=[lesson.pk])),
+        ('lesson_complete', reverse('lesson_complete', args=[lesson.pk])),
+        ('quiz_submit', reverse('quiz_submit', args=[lesson.pk])),
+        ('contact', reverse('contact')),
+        ('login', reverse('login')),
+        ('register', reverse('register')),
+        ('profile', reverse('profile')),
+        ('games', reverse('games')),
+        ('about', reverse('about')),
+        ('assignments', reverse('assignments')),
+        ('submit_assignment', reverse('submit_assignment', args=[assignment.pk])),
+        ('references', reverse('references')),
+        ('final_test_list', reverse('final_test_list')),
+        ('final_test_detail', reverse('final_test_detail', args=[test.pk])),
+        ('api_root', '/api/'),
+        ('term-list', reverse('term-list')),
+        ('term-detail', reverse('term-detail', args=[term.pk])),
+        ('term-search', reverse('term-search') + '?q=tama'),
+        ('term-autocomplete', reverse('term-autocomplete') + '?q=at'),
+        ('term-page', reverse('term-page') + '?letter=A'),
+        ('subject-list', reverse('subject-list')),
+        ('subject-detail', reverse('subject-detail', args=[course.subject_id])),
+        ('course-list', reverse('course-list')),
+        ('course-detail', reverse('course-detail', args=[course.pk])),
+        ('course-detail-quiz', reverse('course-detail', args=[course.pk]) + '?include=quiz'),
+        ('course-categories', reverse('course-categories')),
+        ('course-by-subject', reverse('course-by-subject') + '?slug=subject-0'),
+        ('post-list', reverse('post-list')),
+        ('post-detail', reverse('post-detail', args=[post.pk])),
+        ('user-me', reverse('user-me')),
+        ('user-dashboard', reverse('user-dashboard')),
+        ('api_metrics', reverse('api_metrics')),
+    ]
+
+
+def load_settings(**environ):
+    """``core/settings.py`` ni berilgan muhit bilan alohida modul sifatida yuklash"""
+    spec = importlib.util.spec_from_file_location('profile_settings', settings.BASE_DIR / 'core' / 'settings.py')
+    module = importlib.util.module_from_spec(spec)
+    with mock.patch.dict(os.environ, environ):
+        spec.loader.exec_module(module)
+    return module
+
+
+# So'rovlar soni: (mehmon, talaba). Talaba uchun sessiya va foydalanuvchi
+# o'qilishi ham kiradi. Ma'lumotlar ikki barobar ko'payganda ham shu sonlar
+# saqlanishi kerak (QueryCountDoubledTests).
+EXPECTED_QUERIES = {
+    'index': (9, 14),
+    'glossary': (2, 4),
+    'glossary_rows': (1, 1),
+    'subjects': (1, 3),
+    'subject_detail': (2, 4),
+    'courses': (3, 5),
+    'course_detail': (3, 6),
+    'lesson': (7, 14),
+    'lesson_complete': (0, 8),
+    'quiz_submit': (0, 4),
+    'contact': (0, 2),
+    'login': (0, 2),
+    'register': (0, 2),
+    'profile': (0, 6),
+    'games': (0, 2),
+    'about': (3, 5),
+    'assignments': (0, 4),
+    'submit_assignment': (0, 4),
+    'references': (1, 3),
+    'final_test_list': (2, 5),
+    'final_test_detail': (4, 6),
+    'api_root': (0, 2),
+    'term-list': (2, 4),
+    'term-detail': (1, 3),
+    'term-search': (1, 3),
+    'term-autocomplete': (1, 3),
+    'term-page': (2, 4),
+    'subject-list': (2, 4),
+    'subject-detail': (1, 3),
+    'course-list': (2, 4),
+    'course-detail': (2, 4),
+    'course-detail-quiz': (5, 7),
+    'course-categories': (1, 3),
+    'course-by-subject': (1, 3),
+    'post-list': (2, 4),
+    'post-detail': (2, 4),
+    'user-me': (0, 2),
+    'user-dashboard': (0, 6),
+    'api_metrics': (0, 2),
+    'batch': 33,
+}
+
+
+@override_settings(BATCH_API={'CONCURRENT': False})
+class QueryCountTests(TestCase):
+    """Har bir sahifa va API uchun aniq so'rovlar soni (kesh sovuq holatda)"""
+    scale = 1
+
+    @classmethod
+    def setUpTestData(cls):
+        seed(cls.scale)
+
+    def setUp(self):
+        cache.clear()
+        self.urls = urls()
+
+    def assert_query_counts(self, login):
+        if login:
+            self.client.login(username='student', password='parol12345')
+        index = 1 if login else 0
+        for name, url in self.urls:
+            with self.subTest(name, login=login):
+                cache.clear()
+                with self.assertNumQueries(EXPECTED_QUERIES[name][index]):
+                    response = self.client.get(url)
+                self.assertLess(response.status_code, 500)
+
+    def test_anonymous(self):
+        self.assert_query_counts(login=False)
+
+    def test_student(self):
+        self.assert_query_counts(login=True)
+
+    @skipUnless(settings.PUBLIC_ENABLED, "batch endpoint 'admin' profilida yo'q")
+    def test_batch(self):
+        self.client.login(username='student', password='parol12345')
+        payload = {'requests': [{'url': url} for name, url in self.urls if name.split('-')[0] in (
+            'term', 'subject', 'course', 'post', 'user'
+        )]}
+        with self.assertNumQueries(EXPECTED_QUERIES['batch']):
+            response = self.client.post(reverse('api_batch'), payload, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(all(item['status'] == 200 for item in response.json()['responses']))
+
+
+class QueryCountDoubledTests(QueryCountTests):
+    """Ma'lumotlar ikki barobar - so'rovlar soni o'zgarmasligi kerak"""
+    scale = 2
+
+
+class AppProfileTests(TestCase):
+    """APP_PROFILE: 'public' va 'admin' workerlarda yuklanadigan qismlar"""
+
+    def test_profiles(self):
+        admin_apps = {'jazzmin', 'django.contrib.admin', 'ckeditor', 'ckeditor_uploader'}
+        public_middleware = {'courses.middleware.AdmissionControlMiddleware', 'courses.middleware.CompressionMiddleware'}
+        for profile, has_admin, has_public in (('full', True, True), ('admin', True, False), ('public', False, True)):
+            with self.subTest(profile):
+                module = load_settings(APP_PROFILE=profile)
+                self.assertEqual((module.ADMIN_ENABLED, module.PUBLIC_ENABLED), (has_admin, has_public))
+                installed = admin_apps & set(module.INSTALLED_APPS)
+                self.assertEqual(installed, admin_apps if has_admin else set())
+                loaded = public_middleware & set(module.MIDDLEWARE)
+                self.assertEqual(loaded, public_middleware if has_public else set())
+
+    @skipUnless(not settings.ADMIN_ENABLED, "faqat 'public' profilida")
+    def test_public_models_skip_ckeditor(self):
+        field = Term._meta.get_field('description')
+        self.assertEqual(type(field).__module__, 'courses.models')
+        # Migratsiyalar profilga bog'liq emas
+        self.assertEqual(field.deconstruct()[1], 'ckeditor.fields.RichTextField')
+
+
+class RequestProfilerTests(TestCase):
+    """Xodim so'rovi profili - belgisiz va xodim bo'lmagan so'rovlarga ta'sir qilmaydi"""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed(1)
+        User.objects.create_superuser('admin', password='parol12345')
+
+    def profile(self, url):
+        self.client.login(username='admin', password='parol12345')
+        response = self.client.get(url + '?_profile=1')
+        return RequestProfile.objects.get(pk=response['X-Profile-Id'])
+
+    def test_staff_request_is_profiled(self):
+        profile = self.profile(reverse('course_detail', args=['course-0-0']))
+        self.assertEqual(profile.view_name, 'course_detail')
+        self.assertEqual(profile.status_code, 200)
+        self.assertEqual(profile.query_count, len(profile.queries))
+        self.assertGreater(profile.query_count, 0)
+        self.assertIn('course_detail.html', [entry['name'] for entry in profile.templates])
+        self.assertEqual(profile.sample_count, sum(profile.stacks.values()))
+
+    @skipUnless(settings.ADMIN_ENABLED, "admin 'public' profilida yo'q")
+    def test_admin_shows_flame_graph(self):
+        profile = self.profile(reverse('subjects'))
+        response = self.client.get(reverse('admin:courses_requestprofile_change', args=[profile.pk]))
+        self.assertContains(response, 'Flame graph')
+
+    def test_header_enables_profiling(self):
+        self.client.login(username='admin', password='parol12345')
+        response = self.client.get(reverse('subjects'), HTTP_X_PROFILE='1')
+        self.assertTrue(RequestProfile.objects.filter(pk=response['X-Profile-Id']).exists())
+
+    def test_non_staff_request_is_not_profiled(self):
+        self.client.login(username='student', password='parol12345')
+        response = self.client.get(reverse('subjects') + '?_profile=1')
+        self.assertNotIn('X-Profile-Id', response)
+        self.assertFalse(RequestProfile.objects.exists())
+
+    def test_flame_graph(self):
+        rows = flame_graph({'a;b': 30, 'a;c': 1, 'd': 969})
+        self.assertEqual([node['name'] for node in rows[0]], ['a', 'd'])
+        self.assertEqual(rows[0][1]['left'], 3.1)
+        # c 0.1% - chizish uchun juda tor
+        self.assertEqual([node['name'] for node in rows[1]], ['b'])
+
+
+@skipUnless(settings.PUBLIC_ENABLED, "batch endpoint 'admin' profilida yo'q")
+@override_settings(BATCH_API={'CONCURRENT': False})
+class BatchApiTests(TestCase):
+    """/api/batch/ - sub-so'rovlar tartibi, statuslari va ASGI orqali ishlashi"""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed(1)
+
+    def setUp(self):
+        cache.clear()
+        self.course = Course.objects.get(slug='course-0-0')
+        self.payload = {'requests': [
+            {'url': reverse('course-detail', args=[self.course.pk])},
+            {'url': reverse('course-detail', args=[0])},
+            {'url': '/api/nowhere/'},
+            {'url': reverse('index')},
+            {'url': reverse('api_batch'), 'method': 'POST'},
+            {'url': reverse('user-me')},
+        ]}
+
+    def assert_responses(self, responses):
+        self.assertEqual([item['status'] for item in responses], [200, 404, 404, 400, 400, 200])
+        self.assertEqual(responses[0]['body']['slug'], self.course.slug)
+        self.assertEqual(responses[5]['body']['username'], 'student')
+
+    def test_mixed_statuses(self):
+        self.client.login(username='student', password='parol12345')
+        response = self.client.post(reverse('api_batch'), self.payload, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assert_responses(response.json()['responses'])
+
+    def test_invalid_payload(self):
+        for payload in ({}, {'requests': []}, {'requests': [{'method': 'GET'}]},
+                        {'requests': [{'url': '/api/terms/', 'method': 'TRACE'}]},
+                        {'requests': [{'url': '/api/terms/'}] * 21}):
+            with self.subTest(payload=payload):
+                response = self.client.post(reverse('api_batch'), payload, content_type='application/json')
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('error', response.json())
+
+    async def test_asgi(self):
+        client = AsyncClient()
+        await sync_to_async(client.force_login)(await User.objects.aget(username='student'))
+        response = await client.post(reverse('api_batch'), self.payload, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assert_responses(response.json()['responses'])
+
+    def test_memoize(self):
+        calls = []
+        self.assertEqual(memoize('key', lambda: calls.append(1) or 1), 1)
+        self.assertEqual(memoize('key', lambda: calls.append(1) or 1), 1)
+        # Batch tashqarisida kesh yo'q
+        self.assertEqual(len(calls), 2)
+
+
+class SparseFieldsTests(TestCase):
+    """?fields= va ?expand= - tanlangan maydonlar, kursorli sahifa va bo'sh parametr"""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed(1)
+        for i in range(40):
+            Term.objects.create(title=f'Atama {i:02}', description="<p>Ta'rif</p>", order=100 + i)
+
+    def setUp(self):
+        cache.clear()
+
+    def get(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_term_page_cursor_with_sparse_fields(self):
+        for fields, keys in (('id', {'id'}), ('title,order', {'title', 'order'}), ('description', {'description'})):
+            with self.subTest(fields=fields):
+                data = self.get(reverse('term-page') + f'?letter=A&fields={fields}')
+                self.assertTrue(data['next_cursor'])
+                self.assertEqual({key for item in data['results'] for key in item}, keys)
+                rest = self.get(reverse('term-page') + f'?letter=A&fields={fields}&cursor={data["next_cursor"]}')
+                self.assertIsNone(rest['next_cursor'])
+                self.assertEqual(len(data['results']) + len(rest['results']), Term.objects.filter(letter='A').count())
+
+    def test_empty_fields_means_all(self):
+        full = self.get(reverse('term-list'))['results']
+        self.assertEqual(self.get(reverse('term-list') + '?fields=')['results'], full)
+        self.assertEqual(self.get(reverse('term-page') + '?fields=&letter=A')['results'][0].keys(),
+                         self.get(reverse('term-page') + '?letter=A')['results'][0].keys())
+
+    def test_nested_fields_and_expand(self):
+        course = Course.objects.get(slug='course-0-0')
+        url = reverse('course-detail', args=[course.pk])
+        self.assertEqual(self.get(url + '?fields=id,subject'), {'id': course.pk, 'subject': course.subject_id})
+        self.assertEqual(self.get(url + '?fields=id,subject.name'), {'id': course.pk, 'subject': {'name': 'Fan 0'}})
+        data = self.get(url + '?fields=title&expand=instructor')
+        self.assertEqual(data['instructor']['username'], 'teacher')
+        rows = self.get(reverse('course-list') + '?fields=slug,category.slug')['results']
+        self.assertIn({'slug': 'course-0-0', 'category': {'slug': 'category-0'}}, rows)
+
+
+class GlossaryTests(TestCase):
+    """Harflar indeksi va keyset sahifalar"""
+
+    @classmethod
+    def setUpTestData(cls):
+        for i in range(7):
+            Term.objects.create(title=f'{"AAB"[i % 3]}tama {i}', description="<p>Ta'rif</p>", order=i % 2)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_letter_index_invalidated_on_commit(self):
+        self.assertEqual(letter_index(), [{'letter': 'A', 'count': 5}, {'letter': 'B', 'count': 2}])
+        with self.captureOnCommitCallbacks(execute=True):
+            Term.objects.create(title='1-misol', description='x')
+            # Tranzaksiya tugamaguncha eski qiymat keshda qoladi
+            self.assertEqual(len(letter_index()), 2)
+        self.assertEqual(letter_index()[0], {'letter': '#', 'count': 1})
+
+    def test_keyset_pages_cover_all_terms_once(self):
+        seen, cursor = [], None
+        while True:
+            items, cursor = term_page(cursor=cursor, limit=3)
+            seen.extend(term.pk for term in items)
+            if cursor is None:
+                break
+        expected = list(Term.objects.order_by('order', 'title', 'pk').values_list('pk', flat=True))
+        self.assertEqual(seen, expected)
+        items, cursor = term_page(letter='B', limit=3)
+        self.assertEqual({term.letter for term in items}, {'B'})
+        self.assertIsNone(cursor)
+
+    def test_cursor(self):
+        self.assertEqual(decode_cursor(encode_cursor(3, "O'zbek", 7)), (3, "O'zbek", 7))
+        for cursor in ('', 'xyz', encode_cursor('3', 'a', 1)):
+            with self.subTest(cursor=cursor), self.assertRaises(ValueError):
+                decode_cursor(cursor)
+        response = self.client.get(reverse('term-page') + '?cursor=xyz')
+        self.assertEqual(response.status_code, 400)
+
+    def test_autocomplete(self):
+        Term.objects.create(title="Media savodxonligi", description='x')
+        self.assertEqual([item['title'] for item in autocomplete_index.lookup('sav')], ['Media savodxonligi'])
+        self.assertEqual([item['title'] for item in autocomplete_index.lookup('ATAMA 1')], ['Atama 1'])
+        self.assertEqual(autocomplete_index.lookup(''), [])
+
+    def test_search_is_capped(self):
+        with mock.patch('courses.views.SEARCH_LIMIT', 3):
+            response = self.client.get(reverse('term-search') + '?q=tama')
+        self.assertEqual([term['title'] for term in response.json()], ['Atama 0', 'Atama 4', 'Atama 6'])
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(reverse('term-search') + '?q=+').json(), [])
+
+    def test_autocomplete_rebuilt_after_commit(self):
+        autocomplete_index.lookup('a')
+        with self.captureOnCommitCallbacks(execute=True):
+            Term.objects.create(title="Yangi atama", description='x')
+            self.assertEqual(autocomplete_index.lookup('yangi'), [])
+        self.assertEqual(len(autocomplete_index.lookup('yangi')), 1)
+
+    def test_autocomplete_rebuilt_after_version_eviction(self):
+        autocomplete_index.lookup('a')
+        version = autocomplete_index.version
+        Term.objects.filter(title='Atama 1').update(title='Yangi atama')
+        cache.clear()
+        self.assertEqual(len(autocomplete_index.lookup('yangi')), 1)
+        self.assertNotEqual(autocomplete_index.version, version)
+
+
+class LessonVideoTests(TestCase):
+    """Saqlanganda hisoblanadigan video maydonlari va ularsiz yozilgan qatorlar"""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed(1)
+        cls.course = Course.objects.first()
+
+    def test_fields_computed_on_save(self):
+        lesson = self.course.lessons.first()
+        self.assertEqual(lesson.video_type, 'youtube')
+        self.assertIn('/embed/dQw4w9WgXcQ', lesson.video_embed_url)
+
+    def test_bulk_written_rows_fall_back(self):
+        Lesson.objects.bulk_create([
+            Lesson(course=self.course, title='Ommaviy', order=10, video_url='https://cdn.example.com/dars.mp4'),
+        ])
+        Lesson.objects.filter(course=self.course, order=0).update(video_type='', video_embed_url='')
+        for order, video_type in ((10, 'direct'), (0, 'youtube')):
+            lesson = self.course.lessons.get(order=order)
+            response = self.client.get(reverse('lesson', args=[lesson.pk]))
+            self.assertEqual(response.context['video_type'], video_type)
+            self.assertTrue(response.context['embed_url'])
+
+
+class FinalTestPoolTests(TestCase):
+    """Savollar to'plami, seed bo'yicha tanlov va natijadagi savollar tartibi"""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed(1)
+        cls.test = FinalTest.objects.get(order=0)
+        cls.test.questions_per_attempt = 3
+        cls.test.save()
+
+    def setUp(self):
+        cache.clear()
+        self.client.login(username='student', password='parol12345')
+
+    def test_seed_draw_is_deterministic(self):
+        pool = list(self.test.questions.order_by('order', 'pk').values_list('pk', flat=True))
+        self.assertEqual(get_question_pool(self.test.pk).tolist(), pool)
+        self.assertEqual(get_question_pools([self.test.pk])[self.test.pk].tolist(), pool)
+        drawn = draw_question_ids(self.test, 12345)
+        self.assertEqual(len(drawn), 3)
+        self.assertEqual(len(set(drawn) - set(pool)), 0)
+        self.assertEqual(draw_question_ids(self.test, 12345), drawn)
+        self.assertEqual(draw_question_ids(self.test, None), pool)
+
+    def test_attempt_token(self):
+        attempt_seed = new_seed()
+        token = sign_attempt(self.test.pk, attempt_seed)
+        self.assertEqual(unsign_attempt(token, self.test.pk), attempt_seed)
+        self.assertIsNone(unsign_attempt(token, self.test.pk + 1))
+        self.assertIsNone(unsign_attempt(token + 'x', self.test.pk))
+
+    def test_pool_invalidated_on_commit(self):
+        get_question_pool(self.test.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            FinalTestQuestion.objects.create(test=self.test, question='Yangi', order=99)
+            self.assertEqual(len(get_question_pool(self.test.pk)), 5)
+        self.assertEqual(len(get_question_pool(self.test.pk)), 6)
+
+    def test_result_keeps_question_order_after_pool_changes(self):
+        url = reverse('final_test_detail', args=[self.test.pk])
+        response = self.client.get(url)
+        questions = response.context['questions']
+        data = {'attempt': response.context['attempt_token']}
+        for question in questions:
+            data[f'question_{question.pk}'] = question.answers.get(is_correct=True).pk
+        response = self.client.post(url, data)
+        result = response.context['result']
+        self.assertEqual(result.score, 100)
+        self.assertEqual(result.get_question_ids(), [question.pk for question in questions])
+
+        # Savollar o'zgarsa ham saqlangan urinish siljimaydi
+        with self.captureOnCommitCallbacks(execute=True):
+            FinalTestQuestion.objects.create(test=self.test, question='Yangi', order=-1)
+            self.test.questions.exclude(pk__in=[question.pk for question in questions]).first().delete()
+        result.refresh_from_db()
+        self.assertEqual(result.get_question_ids(), [question.pk for question in questions])
+        correct_ids = [question.answers.get(is_correct=True).pk for question in questions]
+        self.assertEqual(result.get_answer_ids(), correct_ids)
+
+    def test_expired_attempt_is_rejected(self):
+        url = reverse('final_test_detail', args=[self.test.pk])
+        response = self.client.post(url, {'attempt': 'yaroqsiz'})
+        self.assertRedirects(response, url)
+        self.assertEqual(FinalTestResult.objects.filter(test=self.test).count(), 1)
+
+
+class FinalTestStatsTests(TestCase):
+    """Savollar statistikasi: ``F()`` bilan yig'ish va item-tahlil hisobi"""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed(1)
+        cls.test = FinalTest.objects.get(order=0)
+        cls.first, cls.second = cls.test.questions.order_by('order')[:2]
+
+    def record(self, *attempts):
+        for score, first_correct in attempts:
+            FinalTestStats.record_attempt(
+                self.test, [(self.first.pk, first_correct), (self.second.pk, True)], score
+            )
+
+    def test_record_attempt_accumulates(self):
+        self.record((100, True), (80, True), (40, False))
+        stats = FinalTestStats.objects.get(test=self.test)
+        self.assertEqual((stats.attempts, stats.score_sum, stats.score_sq_sum), (3, 220, 100 ** 2 + 80 ** 2 + 40 ** 2))
+        items = {
+            item.question_id: (item.seen, item.correct, item.seen_score_sum, item.correct_score_sum)
+            for item in FinalTestItemStats.objects.filter(test=self.test)
+        }
+        self.assertEqual(items, {self.first.pk: (3, 2, 220, 180), self.second.pk: (3, 3, 220, 220)})
+
+    def test_item_analysis_matches_point_biserial(self):
+        scores = [(100, True), (80, True), (40, False), (20, False)]
+        self.record(*scores)
+        rows = {row['question_id']: row for row in FinalTestStats.objects.get(test=self.test).item_analysis()}
+
+        values = [score for score, _ in scores]
+        mean_correct = statistics.mean(score for score, ok in scores if ok)
+        mean_wrong = statistics.mean(score for score, ok in scores if not ok)
+        expected = (mean_correct - mean_wrong) / statistics.pstdev(values) * math.sqrt(0.5 * 0.5)
+        self.assertEqual(rows[self.first.pk]['difficulty'], 0.5)
+        self.assertAlmostEqual(rows[self.first.pk]['discrimination'], expected)
+        # Hamma to'g'ri topgan savol ajrata olmaydi
+        self.assertEqual(rows[self.second.pk]['difficulty'], 1)
+        self.assertIsNone(rows[self.second.pk]['discrimination'])
+
+    def test_answers_are_packed(self):
+        result = FinalTestResult(test=self.test)
+        result.set_answers([5, None, 70000])
+        self.assertEqual(bytes(result.answers), b'\x05\x00\x00\x00' b'\x00\x00\x00\x00' b'\x70\x11\x01\x00')
+        self.assertEqual(result.get_answer_ids(), [5, None, 70000])
+
+    def test_partial_submission_is_scored(self):
+        self.client.login(username='student', password='parol12345')
+        url = reverse('final_test_detail', args=[self.test.pk])
+        response = self.client.get(url)
+        questions = response.context['questions']
+        first, wrong = questions[0], questions[1]
+        data = {
+            'attempt': response.context['attempt_token'],
+            f'question_{first.pk}': first.answers.get(is_correct=True).pk,
+            f'question_{wrong.pk}': wrong.answers.filter(is_correct=False).first().pk,
+        }
+        with self.captureOnCommitCallbacks(execute=True):
+            result = self.client.post(url, data).context['result']
+        self.assertEqual((result.correct, result.total, result.score), (1, len(questions), 100 // len(questions)))
+        answer_ids = result.get_answer_ids()
+        self.assertEqual(answer_ids[:2], [data[f'question_{first.pk}'], data[f'question_{wrong.pk}']])
+        self.assertEqual(answer_ids[2:], [None] * (len(questions) - 2))
+        seen = FinalTestItemStats.objects.filter(test=self.test, seen=1)
+        self.assertEqual(seen.count(), len(questions))
+        self.assertEqual(list(seen.filter(correct=1).values_list('question_id', flat=True)), [first.pk])
+
+    def test_submission_records_stats(self):
+        self.client.login(username='student', password='parol12345')
+        url = reverse('final_test_detail', args=[self.test.pk])
+        response = self.client.get(url)
+        questions = response.context['questions']
+        data = {'attempt': response.context['attempt_token']}
+        for question in questions:
+            data[f'question_{question.pk}'] = question.answers.get(is_correct=True).pk
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(url, data)
+        self.assertEqual(FinalTestStats.objects.get(test=self.test).attempts, 1)
+        self.assertEqual(
+            set(FinalTestItemStats.objects.filter(test=self.test, correct=1).values_list('question_id', flat=True)),
+            {question.pk for question in questions},
+        )
+
+
+@override_settings(AUTH_TOKEN_CACHE=True)
+class TokenAuthenticationTests(TestCase):
+    """Token keshi, bekor qilish va muddat"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('student', password='parol12345', first_name='Ali')
+
+    def setUp(self):
+        cache.clear()
+        response = self.client.post(reverse('api_login'), {'username': 'student', 'password': 'parol12345'})
+        self.key = response.json()['token']
+
+    def me(self):
+        return self.client.get(reverse('user-me'), HTTP_AUTHORIZATION=f'Token {self.key}')
+
+    def test_cached_lookup(self):
+        self.assertEqual(self.me().json()['first_name'], 'Ali')
+        with self.assertNumQueries(0):
+            self.assertEqual(self.me().json()['username'], 'student')
+
+    def test_cache_has_no_password_hash(self):
+        self.me()
+        entry = cache.get(_token_cache_key(self.key))
+        self.assertNotIn(self.user.password, repr(entry))
+
+    def test_logout_revokes_immediately(self):
+        self.me()
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('api_logout'), HTTP_AUTHORIZATION=f'Token {self.key}')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.me().status_code, 401)
+
+    def test_stale_load_is_not_repopulated(self):
+        self.me()
+        entry = cache.get(_token_cache_key(self.key))
+        with self.captureOnCommitCallbacks(execute=True):
+            Token.objects.filter(key=self.key).delete()
+        # Bekor qilishdan oldin boshlangan yuklash natijasini yozishga urinadi
+        self.assertFalse(cache.add(_token_cache_key(self.key), entry))
+        self.assertEqual(self.me().status_code, 401)
+
+    def test_user_change_revokes(self):
+        self.me()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+        self.assertEqual(self.me().status_code, 401)
+
+    def test_revocation_is_per_token(self):
+        other = User.objects.create_user('other', password='parol12345')
+        other_key = Token.objects.create(user=other).key
+        self.me()
+        self.client.get(reverse('user-me'), HTTP_AUTHORIZATION=f'Token {other_key}')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('api_logout'), HTTP_AUTHORIZATION=f'Token {other_key}')
+            other.first_name = 'Vali'
+            other.save()
+            self.user.last_login = timezone.now()
+            self.user.save(update_fields=['last_login'])
+        self.assertEqual(cache.get(_token_cache_key(other_key)), REVOKED)
+        # Boshqa mijozlarning yozuvlari joyida - bazaga murojaat yo'q
+        with self.assertNumQueries(0):
+            self.assertEqual(self.me().status_code, 200)
+
+    def test_expired_token(self):
+        Token.objects.filter(key=self.key).update(created=timezone.now() - timedelta(hours=2))
+        with override_settings(AUTH_TOKEN_EXPIRE_SECONDS=3600):
+            self.assertEqual(self.me().status_code, 401)
+        self.assertFalse(Token.objects.filter(key=self.key).exists())
+
+    @override_settings(AUTH_TOKEN_CACHE=None)
+    def test_process_local_cache_disables_caching(self):
+        self.me()
+        with self.assertNumQueries(1):
+            self.assertEqual(self.me().status_code, 200)
+
+
+class SubjectCoursesCacheTests(TestCase):
+    """Fan kurslari ro'yxati keshi tranzaksiyadan keyin va o'qituvchi o'zgarganda yangilanadi"""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed(1)
+
+    def setUp(self):
+        cache.clear()
+        self.subject = Subject.objects.get(slug='subject-0')
+
+    def titles(self, subject):
+        return [course['title'] for course in subject_courses(subject.pk)]
+
+    def test_cached(self):
+        self.assertEqual(self.titles(self.subject), ['Kurs 0-0', 'Kurs 0-1', 'Kurs 0-2'])
+        with self.assertNumQueries(0):
+            subject_courses(self.subject.pk)
+
+    def test_course_change_invalidated_on_commit(self):
+        self.titles(self.subject)
+        course = Course.objects.get(slug='course-0-0')
+        with self.captureOnCommitCallbacks(execute=True):
+            course.title = 'Yangi nom'
+            course.save()
+            self.assertEqual(self.titles(self.subject)[0], 'Kurs 0-0')
+        self.assertEqual(self.titles(self.subject)[0], 'Yangi nom')
+
+    def test_course_moved_to_other_subject(self):
+        other = Subject.objects.get(slug='subject-1')
+        self.titles(self.subject)
+        self.titles(other)
+        with self.captureOnCommitCallbacks(execute=True):
+            course = Course.objects.get(slug='course-0-0')
+            course.subject = other
+            course.save()
+        self.assertNotIn('Kurs 0-0', self.titles(self.subject))
+        self.assertIn('Kurs 0-0', self.titles(other))
+
+    def test_lesson_count_and_instructor_name(self):
+        course = Course.objects.get(slug='course-0-0')
+        self.assertEqual(subject_courses(self.subject.pk)[0]['lessons_count'], 3)
+        with self.captureOnCommitCallbacks(execute=True):
+            Lesson.objects.create(course=course, title='Yangi dars', content='x', order=9)
+        self.assertEqual(subject_courses(self.subject.pk)[0]['lessons_count'], 4)
+        with self.captureOnCommitCallbacks(execute=True):
+            teacher = User.objects.get(username='teacher')
+            teacher.first_name, teacher.last_name = 'Olim', 'Karimov'
+            teacher.save()
+        self.assertEqual(subject_courses(self.subject.pk)[0]['instructor_name'], 'Olim Karimov')
+
+
+class CounterTests(TestCase):
+    """Denormallashtirilgan sonlar: signallar, eski obyektni saqlash va reconcile"""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed(1)
+
+    def setUp(self):
+        self.course = Course.objects.get(slug='course-0-0')
+        self.subject = self.course.subject
+
+    def counts(self):
+        self.course.refresh_from_db()
+        self.subject.refresh_from_db()
+        return self.course.lessons_count, self.course.enrollments_count, self.subject.published_courses_count
+
+    def test_signals(self):
+        self.assertEqual(self.counts(), (3, 1, 3))
+        Lesson.objects.create(course=self.course, title='Yangi', content='x')
+        Enrollment.objects.create(user=User.objects.get(username='teacher'), course=self.course)
+        self.course.is_published = False
+        self.course.save()
+        self.assertEqual(self.counts(), (4, 2, 2))
+        self.course.lessons.first().delete()
+        self.course.subject = Subject.objects.get(slug='subject-1')
+        self.course.is_published = True
+        self.course.save()
+        # self.subject - eski fan
+        self.assertEqual(self.counts(), (3, 2, 2))
+        self.assertEqual(Subject.objects.get(slug='subject-1').published_courses_count, 4)
+
+    def test_stale_instance_does_not_overwrite_counters(self):
+        stale_course = Course.objects.get(pk=self.course.pk)
+        stale_subject = Subject.objects.get(pk=self.subject.pk)
+        Lesson.objects.create(course=self.course, title='Yangi', content='x')
+        Course.objects.create(
+            title='Yangi kurs', slug='yangi', subject=self.subject, category=self.course.category,
+            description='x', duration='1', is_published=True,
+        )
+        stale_course.title = 'Tahrir'
+        stale_course.save()
+        stale_subject.name = 'Tahrir'
+        stale_subject.save()
+        self.assertEqual(self.counts(), (4, 1, 4))
+        self.assertEqual(self.course.title, 'Tahrir')
+
+    def test_reconcile(self):
+        Course.objects.filter(pk=self.course.pk).update(lessons_count=99)
+        Subject.objects.filter(pk=self.subject.pk).update(published_courses_count=0)
+        repaired = reconcile()
+        self.assertEqual(repaired['Course.lessons_count'], 1)
+        self.assertEqual(repaired['Subject.published_courses_count'], 1)
+        self.assertEqual(repaired['Course.enrollments_count'], 0)
+        self.assertEqual(self.counts(), (3, 1, 3))
+
+
+
+class GradingTests(TestCase):
+    """Baholash navbati (keyset) va bitta UPDATE bilan ommaviy baholash"""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed(1)
+        cls.assignment = PracticalAssignment.objects.first()
+        for i in range(4):
+            AssignmentSubmission.objects.create(
+                assignment=cls.assignment, user=User.objects.create_user(f'talaba{i}', first_name=f'Ism{i}'),
+            )
+        User.objects.create_superuser('admin', password='parol12345')
+
+    def test_queue_pages_by_id(self):
+        pending = list(
+            AssignmentSubmission.objects.filter(assignment=self.assignment).order_by('pk').values_list('pk', flat=True)
+        )
+        first, cursor = submission_queue(self.assignment, limit=3)
+        self.assertEqual([item['id'] for item in first], pending[:3])
+        self.assertEqual(cursor, pending[2])
+        rest, cursor = submission_queue(self.assignment, after=cursor, limit=3)
+        self.assertEqual([item['id'] for item in rest], pending[3:])
+        self.assertIsNone(cursor)
+        self.assertEqual(first[1]['full_name'], 'Ism0')
+        self.assertEqual(first[0]['full_name'], 'student')
+
+    def test_bulk_grade(self):
+        ids = list(
+            AssignmentSubmission.objects.filter(user__username__startswith='talaba').order_by('pk').values_list('pk', flat=True)
+        )
+        self.assertEqual(bulk_grade(self.assignment, ids[:2], 'accepted', score=90, feedback="Yaxshi"), 2)
+        graded = AssignmentSubmission.objects.filter(pk__in=ids[:2])
+        self.assertTrue(all(
+            (s.status, s.score, s.feedback) == ('accepted', 90, "Yaxshi") and s.reviewed_at for s in graded
+        ))
+        self.assertEqual([item['id'] for item in submission_queue(self.assignment)[0]][-2:], ids[2:])
+        # Boshqa topshiriqning ishlari tegilmaydi
+        other = AssignmentSubmission.objects.exclude(assignment=self.assignment).first()
+        self.assertEqual(bulk_grade(self.assignment, [other.pk], 'rejected'), 0)
+
+    def test_bulk_grade_validates(self):
+        with self.assertRaises(ValueError):
+            bulk_grade(self.assignment, [1], 'submitted')
+        with self.assertRaises(ValueError):
+            bulk_grade(self.assignment, [1], 'accepted', score=self.assignment.max_score + 1)
+
+    @skipUnless(settings.ADMIN_ENABLED, "admin 'public' profilida yo'q")
+    def test_admin_views(self):
+        self.client.login(username='admin', password='parol12345')
+        response = self.client.get(reverse('admin:courses_practicalassignment_grading', args=[self.assignment.pk]))
+        self.assertContains(response, 'talaba0')
+        ids = list(AssignmentSubmission.objects.filter(assignment=self.assignment).values_list('pk', flat=True))
+        url = reverse('admin:courses_practicalassignment_grading_bulk', args=[self.assignment.pk])
+        response = self.client.post(url, {'ids': ids, 'status': 'rejected', 'score': ''}, content_type='application/json')
+        self.assertEqual(response.json(), {'updated': 5})
+        response = self.client.post(url, {'ids': ids, 'status': 'nomalum'}, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        for body in ('[1, 2]', '"matn"', '5', 'null'):
+            with self.subTest(body=body):
+                response = self.client.post(url, body, content_type='application/json')
+                self.assertEqual(response.status_code, 400)
+        queue_url = reverse('admin:courses_practicalassignment_grading_queue', args=[self.assignment.pk])
+        self.assertEqual(self.client.get(queue_url).json(), {'results': [], 'next': None})
+
+
+class SessionTests(TestCase):
+    """Sessiya o'zgarmasa qayta yozilmaydi, muddat intervalda bir marta uzaytiriladi"""
+
+    @classmethod
+    def setUpTestData(cls):
+        User.objects.create_user('student', password='parol12345')
+
+    def setUp(self):
+        cache.clear()
+
+    def expire_date(self):
+        return Session.objects.get().expire_date
+
+    def test_unchanged_session_is_not_saved(self):
+        session = SessionStore()
+        session['key'] = 'qiymat'
+        session.create()
+        session = SessionStore(session.session_key)
+        self.assertEqual(session['key'], 'qiymat')
+        session.modified = True
+        with self.assertNumQueries(0):
+            session.save()
+        session['key'] = 'yangi'
+        session.save()
+        cache.clear()
+        self.assertEqual(SessionStore(session.session_key)['key'], 'yangi')
+
+    def test_expiry_refreshed_once_per_interval(self):
+        self.client.login(username='student', password='parol12345')
+        self.client.get(reverse('profile'))
+        refreshed = self.expire_date()
+        self.assertIn(SessionMiddleware.refreshed_key, self.client.session)
+        self.client.get(reverse('profile'))
+        self.assertEqual(self.expire_date(), refreshed)
+        # Interval o'tgandan keyingi so'rov muddatni uzaytiradi
+        session = self.client.session
+        session[SessionMiddleware.refreshed_key] -= settings.SESSION_REFRESH_INTERVAL
+        session.save()
+        stale = self.expire_date()
+        self.client.get(reverse('profile'))
+        self.assertGreater(self.expire_date(), stale)
+
+
+class AdmissionControlTests(TestCase):
+    """Sinflar bo'yicha limit, navbat, kutish muddati va ustuvorlik"""
+
+    def controller(self, max_concurrent=1, **classes):
+        config = {
+            'exam': {'limit': 1, 'queue': 5, 'timeout': 2, 'priority': 0},
+            'catalog': {'limit': 2, 'queue': 5, 'timeout': 2, 'priority': 1},
+        }
+        for name, overrides in classes.items():
+            config[name] = {**config[name], **overrides}
+        return AdmissionController(config, max_concurrent)
+
+    def test_full_queue_is_rejected(self):
+        controller = self.controller(catalog={'limit': 1, 'queue': 0})
+        self.assertTrue(controller.acquire('catalog'))
+        self.assertFalse(controller.acquire('catalog'))
+        controller.release('catalog')
+        self.assertTrue(controller.acquire('catalog'))
+
+    def test_wait_times_out(self):
+        controller = self.controller(catalog={'limit': 1, 'timeout': 0.05})
+        self.assertTrue(controller.acquire('catalog'))
+        started = time.monotonic()
+        self.assertFalse(controller.acquire('catalog'))
+        self.assertGreaterEqual(time.monotonic() - started, 0.05)
+        self.assertEqual(controller.waiting['catalog'], 0)
+
+    def test_released_slot_goes_to_higher_priority(self):
+        controller = self.controller(catalog={'timeout': 0.5})
+        self.assertTrue(controller.acquire('catalog'))
+        results = {}
+        threads = [
+            threading.Thread(target=lambda name=name: results.__setitem__(name, controller.acquire(name)))
+            for name in ('exam', 'catalog')
+        ]
+        for thread in threads:
+            thread.start()
+        while controller.waiting['exam'] + controller.waiting['catalog'] < 2:
+            time.sleep(0.001)
+        controller.release('catalog')
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, {'exam': True, 'catalog': False})
+        self.assertEqual(controller.active, {'exam': 1, 'catalog': 0})
+
+    @skipUnless(settings.PUBLIC_ENABLED, "admission control 'admin' profilida yo'q")
+    def test_middleware_returns_503(self):
+        classes = {
+            'exam': {'limit': 1, 'queue': 0, 'timeout': 1, 'priority': 0},
+            'catalog': {'limit': 0, 'queue': 0, 'timeout': 1, 'priority': 1},
+        }
+        with override_settings(ADMISSION_CONTROL={'CLASSES': classes, 'RETRY_AFTER': 7}):
+            response = self.client.get(reverse('subjects'))
+            self.assertEqual(response.status_code, 503)
+            self.assertEqual(response['Retry-After'], '7')
+            # Imtihon sinfida joy bor
+            response = self.client.get(reverse('final_test_detail', args=[0]))
+            self.assertNotEqual(response.status_code, 503)
+
+
+class StaticAssetsTests(TestCase):
+    """Hash nomli, oldindan siqilgan statik fayllar va tashlab yuboriladigan vendor fayllar"""
+
+    def test_post_process_keeps_source_maps(self):
+        with tempfile.TemporaryDirectory() as location:
+            storage = CompressedManifestStaticFilesStorage(location=location, base_url='/static/')
+            css = 'body { background: url("img.png"); }' * 40 + '\n/*# sourceMappingURL=app.css.map */\n'
+            storage.save('app.css', ContentFile(css.encode()))
+            storage.save('img.png', ContentFile(b'\x89PNG'))
+            for name, hashed_name, processed in storage.post_process(
+                {name: (storage, name) for name in ('app.css', 'img.png')}
+            ):
+                self.assertNotIsInstance(processed, Exception)
+
+            hashed_css = storage.stored_name('app.css')
+            self.assertRegex(hashed_css, r'^app\.[0-9a-f]{12}\.css$')
+            with storage.open(hashed_css) as handle:
+                content = handle.read().decode()
+            self.assertIn(storage.stored_name('img.png'), content)
+            self.assertIn('sourceMappingURL=app.css.map', content)
+            self.assertTrue(storage.exists(hashed_css + '.gz'))
+            if brotli is not None:
+                self.assertTrue(storage.exists(hashed_css + '.br'))
+
+    def test_unused_vendor_files_are_pruned(self):
+        patterns = apps.get_app_config('staticfiles').ignore_patterns
+        for path in ('vendor/bootswatch/cosmo/bootstrap.min.css', 'ckeditor/ckeditor/skins/moono/editor.css',
+                     'admin/js/vendor/jquery/jquery.min.map', 'rest_framework/docs/css/base.css'):
+            self.assertTrue(matches_patterns(path, patterns), path)
+        for path in ('vendor/bootswatch/default/bootstrap.min.css', 'admin/js/vendor/jquery/jquery.min.js'):
+            self.assertFalse(matches_patterns(path, patterns), path)
+
+
+class FastListTests(TestCase):
+    """``.values()`` dan yig'ilgan ro'yxat ModelSerializer bilan bayt-ba-bayt bir xil"""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed(1)
+        Subject.objects.filter(slug='subject-0').update(image='subjects/fan.png')
+        Post.objects.filter(slug='post-0').update(image='posts/rasm.jpg')
+        Course.objects.filter(slug='course-0-0').update(image='courses/kurs.png', instructor=None)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_lists_match_model_serializer(self):
+        for url_name, queryset, serializer_class in (
+            ('term-list', Term.objects.filter(is_active=True), TermSerializer),
+            ('subject-list', Subject.objects.filter(is_active=True), SubjectSerializer),
+            ('course-list', Course.objects.filter(is_published=True), CourseSerializer),
+            ('post-list', Post.objects.filter(is_published=True), PostSerializer),
+        ):
+            with self.subTest(url_name):
+                response = self.client.get(reverse(url_name))
+                expected = serializer_class(queryset, many=True, context={'request': response.wsgi_request}).data
+                self.assertEqual(response.json()['results'], json.loads(JSONRenderer().render(expected)))
+
+
+class CompressionTests(TestCase):
+    """Accept-Encoding bo'yicha Brotli/gzip tanlash va CSRF tokenli sahifalar"""
+
+    body = ('<p>Salom dunyo</p>' * 100).encode()
+
+    def compress(self, accept='', response=None, config=None, **meta):
+        request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING=accept, **meta)
+        if response is None:
+            response = HttpResponse(self.body)
+            response['ETag'] = '"abc"'
+        with override_settings(COMPRESSION={**settings.COMPRESSION, **(config or {})}):
+            middleware = CompressionMiddleware(lambda request: response)
+        return middleware(request)
+
+    def test_encoding_selection(self):
+        best = 'br' if brotli is not None else 'gzip'
+        for accept, encoding in (
+            ('gzip, deflate, br', best),
+            ('gzip;q=1.0, br;q=0.5', 'gzip'),
+            ('br;q=0, gzip', 'gzip'),
+            ('*', best),
+            ('identity', None),
+            ('', None),
+        ):
+            with self.subTest(accept):
+                response = self.compress(accept)
+                self.assertEqual(response.get('Content-Encoding'), encoding)
+                self.assertIn('Accept-Encoding', response['Vary'])
+                if encoding == 'br':
+                    self.assertEqual(brotli.decompress(response.content), self.body)
+                elif encoding == 'gzip':
+                    self.assertEqual(gzip.decompress(response.content), self.body)
+                    self.assertEqual(response['ETag'], 'W/"abc"')
+                    self.assertEqual(response['Content-Length'], str(len(response.content)))
+                else:
+                    self.assertEqual(response.content, self.body)
+
+    def test_skipped_responses(self):
+        small = HttpResponse(b'kichik')
+        image = HttpResponse(self.body, content_type='image/png')
+        encoded = HttpResponse(self.body)
+        encoded['Content-Encoding'] = 'identity'
+        for response in (small, image, encoded):
+            self.assertEqual(self.compress('gzip, br', response).content, response.content)
+
+    def test_streaming(self):
+        response = StreamingHttpResponse(iter([self.body[:500], self.body[500:]]))
+        response = self.compress('gzip', response)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(b''.join(response.streaming_content)), self.body)
+
+    def test_csrf_pages_get_padded_gzip(self):
+        lengths = set()
+        for _ in range(10):
+            response = self.compress('gzip, br', CSRF_COOKIE_NEEDS_UPDATE=True)
+            self.assertEqual(response['Content-Encoding'], 'gzip')
+            # FNAME bayrog'i: sarlavhada tasodifiy uzunlikdagi nom
+            self.assertTrue(response.content[3] & 0x08)
+            self.assertEqual(gzip.decompress(response.content), self.body)
+            lengths.add(len(response.content))
+        self.assertGreater(len(lengths), 1)
+
+        response = self.compress('gzip, br', config={'CSRF_PAGES': 'skip'}, CSRF_COOKIE_NEEDS_UPDATE=True)
+        self.assertNotIn('Content-Encoding', response)
+        self.assertEqual(response.content, self.body)
+
+    @skipUnless(settings.PUBLIC_ENABLED, "siqish 'admin' profilida yo'q")
+    def test_login_form_is_not_brotli(self):
+        response = self.client.get(reverse('login'), HTTP_ACCEPT_ENCODING='br, gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn(b'csrfmiddlewaretoken', gzip.decompress(response.content))
+
+
+class DashboardTests(TestCase):
+    """Talaba paneli: o'zgarmas so'rovlar soni, hisob-kitoblar va kesh"""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed(1)
+        cls.student = User.objects.get(username='student')
+        cls.test = FinalTest.objects.get(order=0)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_contents(self):
+        FinalTestResult.objects.create(test=self.test, user=self.student, score=90, correct=9, total=10, passed=True)
+        with self.assertNumQueries(4):
+            data = build_dashboard(self.student.pk)
+
+        enrollments = Enrollment.objects.filter(user=self.student)
+        self.assertEqual(len(data['enrollments']), enrollments.count())
+        for item in data['enrollments']:
+            self.assertEqual((item['total_lessons'], item['completed_lessons'], item['progress']), (3, 1, 33))
+        # Har test uchun oxirgi natija va urinishlar soni; eng yangisi birinchi
+        latest = data['final_tests'][0]
+        self.assertEqual(len(data['final_tests']), FinalTest.objects.count())
+        self.assertEqual(
+            (latest['test_id'], latest['score'], latest['correct'], latest['attempts']), (self.test.pk, 90, 9, 2)
+        )
+        self.assertEqual({item['attempts'] for item in data['final_tests'][1:]}, {1})
+        self.assertEqual(
+            len(data['pending_submissions']),
+            AssignmentSubmission.objects.filter(user=self.student, status='submitted').count(),
+        )
+        self.assertEqual(len(data['recent_lessons']), min(5, enrollments.count()))
+
+    def test_invalidated_on_commit(self):
+        progress = LessonProgress.objects.get(user=self.student, lesson__course__slug='course-0-0', lesson__order=2)
+        before = get_dashboard(self.student.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            progress.completed = True
+            progress.save()
+            self.assertEqual(get_dashboard(self.student.pk), before)
+        after = {item['slug']: item['completed_lessons'] for item in get_dashboard(self.student.pk)['enrollments']}
+        self.assertEqual(after['course-0-0'], 2)
+
+
+class RendererTests(TestCase):
+    """orjson renderer standart JSONRenderer bilan baytma-bayt bir xil"""
+
+    samples = [
+        None, True, 0, -7, 2 ** 63, 2 ** 70, 0.1, 1.5, -2.0, 1e15, 1e16, 1e-5, 1.5e300, 123456789.123,
+        '', 'Salom', "O'zbekiston — “tirnoq”", 'emoji 😀', 'ajratgich \u2028 va \u2029', 'nazorat \x00\x1f',
+        'e5 va 1e5 matnda', [1, 'e-1', [2.5e-7]],
+        {'a': 1, 'b': [None, {'c': 'd'}]}, {1: 'butun kalit'}, {'kalit': (1, 2)},
+        datetime(2026, 1, 2, 3, 4, 5, 678000, tzinfo=dt_timezone.utc), date(2026, 1, 2), dt_time(3, 4, 5),
+        timedelta(hours=1, seconds=3), Decimal('12.50'), uuid.UUID(int=1), gettext_lazy('Matn'),
+    ]
+
+    def test_byte_equality(self):
+        fast, standard = FastJSONRenderer(), JSONRenderer()
+        for sample in self.samples:
+            with self.subTest(sample=sample):
+                self.assertEqual(fast.render(sample), standard.render(sample))
+                self.assertEqual(fast.render({'qiymat': sample}), standard.render({'qiymat': sample}))
+        self.assertEqual(fast.render(self.samples), standard.render(self.samples))
+
+    def test_small_floats_and_non_finite(self):
+        fast, standard = FastJSONRenderer(), JSONRenderer()
+        for sample in (1e-5, -3.5e-8, [0.00012, 1e-5], {'a': 7e-6}):
+            self.assertEqual(fast.render(sample), standard.render(sample))
+        for sample in (float('nan'), {'a': [float('inf')]}, -float('inf')):
+            with self.assertRaises(ValueError):
+                fast.render(sample)
+
+    def test_fast_path_is_kept(self):
+        before = metrics.value('renderer.json.fallback')
+        FastJSONRenderer().render({'matn': 'v 0.00001 va 1e-5', 'slug': 'course-1', 'qiymat': 1.5, 'nol': None})
+        self.assertEqual(metrics.value('renderer.json.fallback'), before)
+
+    def test_indent_falls_back(self):
+        context = {'indent': 2}
+        data = {'a': [1, 2]}
+        self.assertEqual(
+            FastJSONRenderer().render(data, 'application/json', context),
+            JSONRenderer().render(data, 'application/json', context),
+        )
+
+    def test_parser(self):
+        parser = FastJSONParser()
+        self.assertEqual(parser.parse(io.BytesIO('{"a": [1, "ü"]}'.encode())), {'a': [1, 'ü']})
+        with self.assertRaises(ParseError):
+            parser.parse(io.BytesIO(b'{"a": '))
+
+    @skipUnless(msgpack is not None, "msgpack o'rnatilmagan")
+    def test_msgpack_round_trip(self):
+        data = {'a': [1, 'b', None], 'vaqt': datetime(2026, 1, 2, tzinfo=dt_timezone.utc)}
+        packed = MessagePackRenderer().render(data)
+        self.assertEqual(MessagePackParser().parse(io.BytesIO(packed)), {**data, 'vaqt': '2026-01-02T00:00:00Z'})
+        with self.assertRaises(ParseError):
+            MessagePackParser().parse(io.BytesIO(b'\xc1'))
+
+
+@override_settings(LIVE_FEED={'POLL_INTERVAL': 0, 'HEARTBEAT': 0.05, 'MAX_AGE': 5})
+class LiveFeedTests(TestCase):
+    """Xodimlar jonli lentasi: pub/sub, takrorlar, bufer va SSE formati"""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed(1)
+        cls.test = FinalTest.objects.get(order=0)
+        User.objects.create_superuser('admin', password='parol12345')
+
+    def setUp(self):
+        # Har test uchun toza lenta (bufer va takrorlar ro'yxati)
+        self.feed = LiveFeed()
+        for target in ('courses.live.live_feed', 'courses.signals.live_feed'):
+            patcher = mock.patch(target, self.feed)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def event(self, pk):
+        return {'type': 'result', 'data': {'id': pk}}
+
+    async def test_publish_deduplicates_and_replays(self):
+        queue = self.feed.subscribe()
+        self.feed.publish([self.event(1), self.event(2)])
+        self.feed.publish([self.event(2), self.event(3)])
+        await asyncio.sleep(0)
+        received = [queue.get_nowait() for _ in range(queue.qsize())]
+        self.assertEqual([(seq, event['data']['id']) for seq, event in received], [(1, 1), (2, 2), (3, 3)])
+        self.feed.unsubscribe(queue)
+        self.assertFalse(self.feed.has_subscribers())
+
+        # Qayta ulanish: Last-Event-ID dan keyingilari buferdan
+        queue = self.feed.subscribe(last_id=1)
+        self.assertEqual([queue.get_nowait()[0] for _ in range(queue.qsize())], [2, 3])
+        self.feed.unsubscribe(queue)
+
+    async def test_event_stream_format(self):
+        stream = event_stream()
+        self.assertEqual(await anext(stream), 'retry: 3000\n\n')
+        self.assertEqual(await anext(stream), ': ping\n\n')
+        self.feed.publish([self.event(7)])
+        self.assertEqual(await anext(stream), 'id: 1\nevent: result\ndata: {"id": 7}\n\n')
+        await stream.aclose()
+        self.assertFalse(self.feed.has_subscribers())
+
+    async def test_new_result_is_published_after_commit(self):
+        queue = self.feed.subscribe()
+
+        def submit():
+            with self.captureOnCommitCallbacks(execute=True):
+                result = FinalTestResult.objects.create(
+                    test=self.test, user=User.objects.get(username='student'), score=70, correct=7, total=10,
+                    passed=True,
+                )
+                self.assertTrue(queue.empty())
+            return result
+
+        result = await sync_to_async(submit)()
+        seq, event = await asyncio.wait_for(queue.get(), 1)
+        self.assertEqual(event['type'], 'result')
+        self.assertEqual(
+            {key: event['data'][key] for key in ('id', 'username', 'test', 'score')},
+            {'id': result.pk, 'username': 'student', 'test': self.test.title, 'score': 70},
+        )
+        self.feed.unsubscribe(queue)
+
+    def test_poller_sees_other_workers_rows(self):
+        self.assertEqual(self.feed._fetch(lookback=50), [])
+        result = FinalTestResult.objects.create(
+            test=self.test, user=User.objects.get(username='student'), score=70, correct=7, total=10, passed=True,
+        )
+        events = self.feed._fetch(lookback=50)
+        self.assertIn(result.pk, [event['data']['id'] for event in events if event['type'] == 'result'])
+
+    async def test_staff_only_and_asgi_only(self):
+        staff, student = await sync_to_async(lambda: (
+            User.objects.get(username='admin'), User.objects.get(username='student'),
+        ))()
+        with self.settings(LIVE_FEED={'ENABLED': True}):
+            request = AsyncRequestFactory().get('/live/events/')
+            request.user = student
+            self.assertEqual((await live_events(request)).status_code, 403)
+
+            request.user = staff
+            response = await live_events(request)
+            self.assertIsInstance(response, StreamingHttpResponse)
+            self.assertEqual(response['Content-Type'], 'text/event-stream')
+
+            # WSGI: oqim workerni band qiladi - 204, EventSource qayta ulanmaydi
+            request = RequestFactory().get('/live/events/')
+            request.user = staff
+            self.assertEqual((await live_events(request)).status_code, 204)
+
+    @skipUnless(settings.ADMIN_ENABLED, "admin 'public' profilida yo'q")
+    def test_no_banner_under_wsgi(self):
+        self.client.login(username='admin', password='parol12345')
+        for model in ('finaltestresult', 'assignmentsubmission'):
+            with self.settings(LIVE_FEED={'ENABLED': True}):
+                response = self.client.get(reverse(f'admin:courses_{model}_changelist'))
+            self.assertEqual(response.status_code, 200)
+            self.assertNotContains(response, 'EventSource')
+
+
+class ResponseCacheTests(TestCase):
+    """API javoblari keshi: model versiyalari bilan eskirish"""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed(1)
+        cls.course = Course.objects.get(slug='course-0-0')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_hit_and_param_order(self):
+        url = reverse('course-list')
+        first = self.client.get(url + '?page=1&ordering=x')
+        with self.assertNumQueries(0):
+            second = self.client.get(url + '?ordering=x&page=1')
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second['Content-Type'], first['Content-Type'])
+
+    def test_invalidated_by_related_models_on_commit(self):
+        url = reverse('course-detail', args=[self.course.pk])
+        self.client.get(url)
+        with self.captureOnCommitCallbacks(execute=True):
+            category = Category.objects.get(pk=self.course.category_id)
+            category.name = 'Yangi kategoriya'
+            category.save()
+            with self.assertNumQueries(0):
+                self.client.get(url)
+        self.assertEqual(self.client.get(url).json()['category']['name'], 'Yangi kategoriya')
+
+    def test_login_does_not_invalidate(self):
+        url = reverse('course-list')
+        self.client.get(url)
+        self.client.login(username='student', password='parol12345')
+        self.client.logout()
+        with self.assertNumQueries(0):
+            self.client.get(url)
+
+    def test_versions_are_not_reused_after_eviction(self):
+        before = model_versions([Course])
+        cache.clear()
+        self.assertNotEqual(model_versions([Course]), before)
+
+
+class StatisticsTests(TestCase):
+    """Signallar bilan yuritiladigan statistika to'liq hisob bilan teng"""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed(1)
+        cls.student = User.objects.get(username='student')
+
+    def setUp(self):
+        cache.clear()
+
+    def stored(self):
+        return dict(Statistic.objects.exclude(value=0).values_list('key', 'value'))
+
+    def expected(self):
+        return {key: value for key, value in compute().items() if value}
+
+    def test_incremental_matches_compute(self):
+        self.assertEqual(self.stored(), self.expected())
+
+        other = User.objects.create_user('boshqa')
+        other.is_staff = True
+        other.save()
+        User.objects.get(username='teacher').save(update_fields=['last_login'])
+        course = Course.objects.get(slug='course-0-0')
+        course.is_published = False
+        course.save()
+        progress = LessonProgress.objects.filter(user=self.student, completed=False).first()
+        progress.completed = True
+        progress.save()
+        LessonProgress.objects.filter(user=self.student, completed=True).first().delete()
+        test = FinalTest.objects.get(order=0)
+        FinalTestResult.objects.create(test=test, user=self.student, score=20, correct=1, total=5, passed=False)
+        submission = AssignmentSubmission.objects.order_by('pk').first()
+        AssignmentSubmission.objects.create(assignment=submission.assignment, user=other)
+        submission.status = 'accepted'
+        submission.save()
+        AssignmentSubmission.objects.order_by('pk').last().delete()
+        submission.delete()
+        Enrollment.objects.filter(user=self.student).first().delete()
+
+        self.assertEqual(self.stored(), self.expected())
+
+    def test_refresh_repairs_bulk_updates(self):
+        Course.objects.update(is_published=False)
+        changed = refresh()
+        self.assertEqual(changed['courses'][1], 0)
+        self.assertEqual(self.stored(), self.expected())
+        self.assertEqual(refresh(), {})
+
+    def test_site_statistics(self):
+        FinalTestStats.record_attempt(FinalTest.objects.get(order=0), [], 80)
+        FinalTestStats.record_attempt(FinalTest.objects.get(order=0), [], 45)
+        data = site_statistics()
+        self.assertEqual(data['students'], 1)
+        self.assertEqual(data['final_tests'], [{'title': 'Chiqish testi 0', 'attempts': 2, 'average_score': 62.5}])
+        self.assertEqual(sum(week['count'] for week in data['submissions_per_week']), AssignmentSubmission.objects.count())
+
+
+class DatabaseProfileTests(TestCase):
+    """DB_PROFILE bo'yicha baza tanlash va SQLite PRAGMA lari"""
+
+    def load_settings(self, **environ):
+        return load_settings(**environ).DATABASES['default']
+
+    def test_profile_selection(self):
+        database = self.load_settings(DB_PROFILE='sqlite', DB_NAME='/tmp/test.sqlite3')
+        self.assertEqual((database['ENGINE'], database['NAME']), ('django.db.backends.sqlite3', '/tmp/test.sqlite3'))
+        database = self.load_settings(DB_PROFILE='postgres', DB_NAME='qosim', DB_STATEMENT_TIMEOUT='1500')
+        self.assertEqual(database['ENGINE'], 'django.db.backends.postgresql')
+        self.assertEqual(database['OPTIONS']['options'], '-c statement_timeout=1500')
+
+    @skipUnless(connection.vendor == 'sqlite', 'faqat SQLite')
+    def test_sqlite_pragmas_applied(self):
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA busy_timeout')
+            self.assertEqual(cursor.fetchone()[0], settings.SQLITE_PRAGMAS['busy_timeout'])
+            cursor.execute('PRAGMA temp_store')
+            # 2 - MEMORY
+            self.assertEqual(cursor.fetchone()[0], 2)
+
+    def test_other_vendors_are_skipped(self):
+        other = mock.Mock(vendor='postgresql')
+        apply_sqlite_pragmas(None, other)
+        other.cursor.assert_not_called()
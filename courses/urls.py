@@ -1,8 +1,10 @@
 # courses/urls.py
 
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from . import views
+from .live import live_feed_enabled
 
 # API Router
 router = DefaultRouter()
@@ -18,6 +20,7 @@ urlpatterns = [
     # ========================
     path('', views.index, name='index'),
     path('glossary/', views.glossary_page, name='glossary'),
+    path('glossary/rows/', views.glossary_rows, name='glossary_rows'),
 
     # Fanlar
     path('subjects/', views.subjects_page, name='subjects'),
@@ -58,4 +61,11 @@ urlpatterns = [
     path('api/auth/register/', views.api_register, name='api_register'),
     path('api/auth/login/', views.api_login, name='api_login'),
     path('api/auth/logout/', views.api_logout, name='api_logout'),
-]
\ No newline at end of file
+    path('api/metrics/', views.api_metrics, name='api_metrics'),
+]
+
+# Batch endpoint - mobil ilova uchun, jonli lenta - admin banneri uchun (faqat ASGI)
+if settings.PUBLIC_ENABLED:
+    urlpatterns.append(path('api/batch/', views.api_batch, name='api_batch'))
+if settings.ADMIN_ENABLED and live_feed_enabled():
+    urlpatterns.append(path('live/events/', views.live_events, name='live_events'))
\ No newline at end of file
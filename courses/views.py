@@ -4,14 +4,16 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.db.models import Q
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Prefetch, Q
 from django.utils import timezone
-from django.http import JsonResponse
+from django.http import HttpResponse, HttpResponseBadRequest, HttpResponseForbidden, JsonResponse, StreamingHttpResponse
+from asgiref.sync import sync_to_async
 
 from rest_framework import viewsets, status
 from rest_framework.decorators import api_view, permission_classes, action
 from rest_framework.response import Response
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAuthenticated, IsAdminUser
 from rest_framework.authtoken.models import Token
 
 from .models import (
@@ -19,13 +21,28 @@ from .models import (
     Enrollment, LessonProgress, Quiz, QuizQuestion, QuizAnswer,
     PracticalAssignment, AssignmentSubmission, Reference,
     FinalTest, FinalTestQuestion, FinalTestAnswer, FinalTestResult,
-    AboutPage
+    FinalTestStats, AboutPage, video_fields
 )
+from . import metrics
+from .authentication import issue_token
+from .batch import execute_batch
+from .catalog import course_neighbours, subject_courses
+from .dashboard import get_dashboard
+from .fast_serializers import FastListMixin, FastListSerializer
+from .glossary import AUTOCOMPLETE_LIMIT, CURSOR_FIELDS, SEARCH_LIMIT, autocomplete_index, letter_index, term_page
+from .live import event_stream, live_feed_enabled
+from .pools import (
+    attempt_size, draw_question_ids, get_question_pools, load_questions, new_seed, sign_attempt,
+    unsign_attempt
+)
+from .response_cache import ResponseCacheMixin, cache_response
 from .serializers import (
     TermSerializer, SubjectSerializer, CourseSerializer, CourseDetailSerializer,
     CategorySerializer, PostSerializer, UserSerializer,
     RegisterSerializer, LoginSerializer, QuizSerializer
 )
+from .sparse import SparseFieldsViewMixin
+from .statistics import site_statistics
 
 
 # ========================
@@ -41,17 +58,36 @@ def index(request):
         'subjects': subjects,
         'courses': courses,
         'posts': posts,
+        'stats': site_statistics(),
     }
     return render(request, 'index.html', context)
 
 
 def glossary_page(request):
-    """Glossary sahifasi"""
-    terms = Term.objects.filter(is_active=True)
-    context = {'terms': terms}
+    """Glossary sahifasi - alifbo indeksi va birinchi sahifa, qolgani scroll bilan yuklanadi"""
+    terms, next_cursor = term_page()
+    context = {
+        'terms': terms,
+        'letters': letter_index(),
+        'next_cursor': next_cursor,
+    }
     return render(request, 'glossary.html', context)
 
 
+def glossary_rows(request):
+    """Glossary keyingi sahifasi (HTML qatorlar); kursor ``X-Next-Cursor`` sarlavhasida"""
+    try:
+        terms, next_cursor = term_page(
+            letter=request.GET.get('letter') or None, cursor=request.GET.get('cursor')
+        )
+    except ValueError as exc:
+        return HttpResponseBadRequest(str(exc))
+    response = render(request, 'glossary_rows.html', {'terms': terms})
+    if next_cursor:
+        response['X-Next-Cursor'] = next_cursor
+    return response
+
+
 def subjects_page(request):
     """Fanlar ro'yxati sahifasi"""
     subjects = Subject.objects.filter(is_active=True)
@@ -62,7 +98,7 @@ def subjects_page(request):
 def subject_detail(request, slug):
     """Fan va uning kurslari"""
     subject = get_object_or_404(Subject, slug=slug, is_active=True)
-    courses = Course.objects.filter(subject=subject, is_published=True).order_by('order')
+    courses = subject_courses(subject.pk)
     context = {
         'subject': subject,
         'courses': courses,
@@ -72,7 +108,7 @@ def subject_detail(request, slug):
 
 def courses_page(request):
     """Kurslar sahifasi"""
-    courses = Course.objects.filter(is_published=True)
+    courses = Course.objects.filter(is_published=True).select_related('category', 'subject', 'instructor')
     categories = Category.objects.all()
     subjects = Subject.objects.filter(is_active=True)
 
@@ -103,8 +139,10 @@ def courses_page(request):
 
 def course_detail(request, slug):
     """Kurs detallari"""
-    course = get_object_or_404(Course, slug=slug, is_published=True)
-    lessons = course.lessons.all()
+    course = get_object_or_404(
+        Course.objects.select_related('subject', 'instructor'), slug=slug, is_published=True
+    )
+    lessons = list(course.lessons.all())
 
     # Foydalanuvchi progressi
     completed_lessons = set()
@@ -115,14 +153,15 @@ def course_detail(request, slug):
             ).values_list('lesson_id', flat=True)
         )
 
-    # Keyingi va oldingi kurslar (fan ichida)
-    next_course = course.get_next_course()
-    prev_course = course.get_prev_course()
+    # Fan kurslari (yon panel) va keyingi/oldingi kurslar - keshdan
+    courses = subject_courses(course.subject_id)
+    prev_course, next_course = course_neighbours(courses, course)
 
     context = {
         'course': course,
         'lessons': lessons,
         'completed_lessons': completed_lessons,
+        'subject_courses': courses,
         'next_course': next_course,
         'prev_course': prev_course,
     }
@@ -133,18 +172,9 @@ def lesson_view(request, pk):
     """Dars sahifasi - video, maruza fayli, test"""
     lesson = get_object_or_404(Lesson, pk=pk)
     course = lesson.course
+    # Video maydonlari Lesson saqlanganda hisoblangan; bulk_create/update() qatorlari uchun - joyida
     embed_url = lesson.get_youtube_embed_url()
-
-    # Determine video type for template rendering
-    video_type = None
-    if lesson.video_url:
-        url_lower = lesson.video_url.lower()
-        if 'youtube.com' in url_lower or 'youtu.be' in url_lower:
-            video_type = 'youtube'
-        elif any(url_lower.endswith(ext) for ext in ['.mp4', '.webm', '.ogg', '.mov']):
-            video_type = 'direct'
-        else:
-            video_type = 'link'
+    video_type = lesson.video_type or video_fields(lesson.video_url)[1] or None
 
     # Quiz
     quiz = None
@@ -345,12 +375,7 @@ def logout_view(request):
 @login_required
 def profile_page(request):
     """Profil sahifasi"""
-    enrollments = request.user.enrollments.all()
-    lesson_progress = request.user.lesson_progress.filter(completed=True)
-    context = {
-        'enrollments': enrollments,
-        'lesson_progress': lesson_progress,
-    }
+    context = {'dashboard': get_dashboard(request.user.pk)}
     return render(request, 'profile.html', context)
 
 
@@ -427,7 +452,7 @@ def about_page(request):
     """Muallif haqida sahifasi — AboutPage modelidan ma'lumot oladi"""
     about = AboutPage.get_instance()
     topics = about.get_research_topics_list()
-    return render(request, 'about.html', {'about': about, 'topics': topics})
+    return render(request, 'about.html', {'about': about, 'topics': topics, 'stats': site_statistics()})
 
 
 @login_required
@@ -528,12 +553,14 @@ def final_test_list(request):
             if result.test_id not in user_results or result.completed_at > user_results[result.test_id].completed_at:
                 user_results[result.test_id] = result
 
+    tests = list(tests)
+    pools = get_question_pools([test.pk for test in tests])
     tests_data = []
     for test in tests:
         tests_data.append({
             'test': test,
             'result': user_results.get(test.id),
-            'questions_count': test.get_questions_count(),
+            'questions_count': attempt_size(test, pools[test.pk]),
         })
 
     context = {'tests_data': tests_data}
@@ -543,28 +570,37 @@ def final_test_list(request):
 def final_test_detail(request, pk):
     """Chiqish testini ishlash"""
     test = get_object_or_404(FinalTest, pk=pk, is_active=True)
-    questions = test.questions.prefetch_related('answers').all()
 
     if request.method == 'POST' and request.user.is_authenticated:
-        total = questions.count()
+        # Savollar to'plamidan tanlangan urinishni seed orqali tiklash
+        seed = unsign_attempt(request.POST.get('attempt', ''), test.pk)
+        if seed is None and test.questions_per_attempt:
+            messages.error(request, 'Test sessiyasi eskirgan, iltimos qaytadan boshlang.')
+            return redirect('final_test_detail', pk=test.pk)
+        # Javoblar shu tartibda saqlanadi
+        questions = load_questions(draw_question_ids(test, seed))
+        total = len(questions)
         correct = 0
         results = []
+        answer_ids = []
+        outcomes = []
 
         for question in questions:
+            answers = list(question.answers.all())
             answer_id = request.POST.get(f'question_{question.pk}')
-            correct_answer = question.answers.filter(is_correct=True).first()
+            correct_answer = next((a for a in answers if a.is_correct), None)
             user_answer = None
             is_correct = False
 
-            if answer_id:
-                try:
-                    user_answer = question.answers.get(pk=int(answer_id))
+            if answer_id and answer_id.isdigit():
+                user_answer = next((a for a in answers if a.pk == int(answer_id)), None)
+                if user_answer:
                     is_correct = user_answer.is_correct
                     if is_correct:
                         correct += 1
-                except FinalTestAnswer.DoesNotExist:
-                    pass
 
+            answer_ids.append(user_answer.pk if user_answer else None)
+            outcomes.append((question.pk, is_correct))
             results.append({
                 'question': question,
                 'user_answer': user_answer,
@@ -575,15 +611,21 @@ def final_test_detail(request, pk):
         score = int((correct / total) * 100) if total > 0 else 0
         passed = score >= test.pass_score
 
-        # Natijani saqlash
-        result_obj = FinalTestResult.objects.create(
-            test=test,
-            user=request.user,
-            score=score,
-            correct=correct,
-            total=total,
-            passed=passed,
-        )
+        # Natijani saqlash; statistika commitdan keyin, o'zining qisqa tranzaksiyasida
+        with transaction.atomic():
+            result_obj = FinalTestResult(
+                test=test,
+                user=request.user,
+                score=score,
+                correct=correct,
+                total=total,
+                passed=passed,
+                seed=seed,
+            )
+            result_obj.set_answers(answer_ids)
+            result_obj.set_question_ids(question.pk for question in questions)
+            result_obj.save()
+            transaction.on_commit(lambda: FinalTestStats.record_attempt(test, outcomes, score))
 
         context = {
             'test': test,
@@ -596,9 +638,11 @@ def final_test_detail(request, pk):
         }
         return render(request, 'final_test_result.html', context)
 
+    seed = new_seed()
     context = {
         'test': test,
-        'questions': questions,
+        'questions': load_questions(draw_question_ids(test, seed)),
+        'attempt_token': sign_attempt(test.pk, seed),
     }
     return render(request, 'final_test_detail.html', context)
 
@@ -607,7 +651,7 @@ def final_test_detail(request, pk):
 # REST API VIEWS
 # ========================
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(SparseFieldsViewMixin, viewsets.ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated]
@@ -617,6 +661,10 @@ class UserViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(request.user)
         return Response(serializer.data)
 
+    @action(detail=False, methods=['get'], url_path='me/dashboard')
+    def dashboard(self, request):
+        return Response(get_dashboard(request.user.pk))
+
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
@@ -624,7 +672,7 @@ def api_register(request):
     serializer = RegisterSerializer(data=request.data)
     if serializer.is_valid():
         user = serializer.save()
-        token, created = Token.objects.get_or_create(user=user)
+        token = issue_token(user)
         return Response({
             'user': UserSerializer(user).data,
             'token': token.key,
@@ -642,7 +690,7 @@ def api_login(request):
         password = serializer.validated_data['password']
         user = authenticate(username=username, password=password)
         if user:
-            token, created = Token.objects.get_or_create(user=user)
+            token = issue_token(user)
             return Response({
                 'user': UserSerializer(user).data,
                 'token': token.key,
@@ -657,60 +705,169 @@ def api_login(request):
 @permission_classes([IsAuthenticated])
 def api_logout(request):
     try:
+        # Token o'chirilganda post_delete signali uni barcha keshlardan ham olib tashlaydi
         request.user.auth_token.delete()
         return Response({'message': 'Muvaffaqiyatli chiqildi!'})
     except Exception:
         return Response({'error': 'Xatolik'}, status=status.HTTP_400_BAD_REQUEST)
 
 
-class TermViewSet(viewsets.ModelViewSet):
+@api_view(['POST'])
+@permission_classes([AllowAny])
+def api_batch(request):
+    """Bir nechta API so'rovini bitta so'rovda bajarish (mobil ilova uchun).
+
+    ``{"requests": [{"method": "GET", "url": "/api/courses/1/"}, ...]}`` ->
+    ``{"responses": [{"status": 200, "body": {...}}, ...]}``
+    """
+    items = request.data.get('requests') if isinstance(request.data, dict) else None
+    try:
+        responses = execute_batch(request, items)
+    except ValueError as exc:
+        return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+    return Response({'responses': responses})
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def api_metrics(request):
+    """Jarayon ichidagi o'lchovlar (navbatlar, hisoblagichlar)"""
+    return Response(metrics.snapshot())
+
+
+async def live_events(request):
+    """Yangi topshiriqlar va test natijalari - Server-Sent Events (faqat xodimlar).
+
+    ASGI da ishlaydi: kutayotgan ulanish thread band qilmaydi. WSGI da esa
+    oqim workerni ``MAX_AGE`` davomida band qiladi - 204 qaytariladi,
+    EventSource qayta ulanmaydi.
+    """
+    is_staff = await sync_to_async(lambda: request.user.is_staff)()
+    if not is_staff:
+        return HttpResponseForbidden()
+    if not live_feed_enabled(request):
+        return HttpResponse(status=204)
+    last_id = request.headers.get('Last-Event-ID') or request.GET.get('last_id')
+    response = StreamingHttpResponse(
+        event_stream(int(last_id) if last_id and last_id.isdigit() else None),
+        content_type='text/event-stream',
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+class TermViewSet(ResponseCacheMixin, SparseFieldsViewMixin, FastListMixin, viewsets.ModelViewSet):
     queryset = Term.objects.filter(is_active=True)
     serializer_class = TermSerializer
     permission_classes = [AllowAny]
+    cache_models = (Term,)
 
     @action(detail=False, methods=['get'])
+    @cache_response
     def search(self, request):
-        query = request.query_params.get('q', '')
+        """To'liq matnli qidiruv - faqat yuborilganda; har harfda ``autocomplete`` ishlatiladi"""
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response([])
         terms = self.queryset.filter(
             Q(title__icontains=query) | Q(description__icontains=query)
         )
-        serializer = self.get_serializer(terms, many=True)
-        return Response(serializer.data)
+        fast = FastListSerializer(self.get_serializer(), self.fast_list_annotations)
+        return Response(fast.to_representation(fast.queryset(terms)[:SEARCH_LIMIT]))
+
+    @action(detail=False, methods=['get'])
+    def autocomplete(self, request):
+        """Atama nomlari prefiks bo'yicha - bazaga so'rovsiz, xotiradagi indeksdan"""
+        try:
+            limit = min(int(request.query_params.get('limit', AUTOCOMPLETE_LIMIT)), 50)
+        except ValueError:
+            limit = AUTOCOMPLETE_LIMIT
+        return Response(autocomplete_index.lookup(request.query_params.get('q', ''), limit))
+
+    @action(detail=False, methods=['get'])
+    @cache_response
+    def page(self, request):
+        """Glossary keyset sahifasi: ``?letter=A&cursor=...``"""
+        fast = FastListSerializer(self.get_serializer(), self.fast_list_annotations)
+        try:
+            rows, next_cursor = term_page(
+                # ?fields= kursor ustunlarini olib tashlagan bo'lishi mumkin
+                fast.queryset(self.get_queryset(), *CURSOR_FIELDS),
+                letter=request.query_params.get('letter') or None,
+                cursor=request.query_params.get('cursor'),
+            )
+        except ValueError as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({
+            'letters': letter_index(),
+            'results': fast.to_representation(rows),
+            'next_cursor': next_cursor,
+        })
 
 
-class SubjectViewSet(viewsets.ReadOnlyModelViewSet):
+class SubjectViewSet(ResponseCacheMixin, SparseFieldsViewMixin, FastListMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Subject.objects.filter(is_active=True)
     serializer_class = SubjectSerializer
     permission_classes = [AllowAny]
+    # Kurslar soni Course signallari orqali yangilanadi
+    cache_models = (Subject, Course)
 
 
-class CourseViewSet(viewsets.ReadOnlyModelViewSet):
+class CourseViewSet(ResponseCacheMixin, SparseFieldsViewMixin, FastListMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Course.objects.filter(is_published=True)
     permission_classes = [AllowAny]
+    cache_models = (
+        Course, Subject, Category, User, Lesson, Quiz, QuizQuestion, QuizAnswer, PracticalAssignment,
+    )
 
     def get_serializer_class(self):
         if self.action == 'retrieve':
             return CourseDetailSerializer
         return CourseSerializer
 
+    def get_includes(self):
+        return set(filter(None, self.request.query_params.get('include', '').split(',')))
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action != 'retrieve':
+            return queryset
+        # Darslar bitta so'rovda: test/topshiriq borligi Exists() bilan
+        lessons = Lesson.objects.annotate(
+            quiz_exists=Exists(Quiz.objects.filter(lesson=OuterRef('pk'))),
+            assignment_exists=Exists(PracticalAssignment.objects.filter(lesson=OuterRef('pk'))),
+        )
+        prefetches = [Prefetch('lessons', queryset=lessons)]
+        if 'quiz' in self.get_includes():
+            prefetches.append('lessons__quiz__questions__answers')
+        return queryset.select_related('category', 'subject', 'instructor').prefetch_related(*prefetches)
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['include'] = self.get_includes()
+        return context
+
     @action(detail=False, methods=['get'])
+    @cache_response
     def categories(self, request):
         categories = Category.objects.all()
         serializer = CategorySerializer(categories, many=True)
         return Response(serializer.data)
 
     @action(detail=False, methods=['get'])
+    @cache_response
     def by_subject(self, request):
         subject_slug = request.query_params.get('slug')
         if subject_slug:
             courses = self.queryset.filter(subject__slug=subject_slug).order_by('order')
         else:
             courses = self.queryset
-        serializer = CourseSerializer(courses, many=True)
-        return Response(serializer.data)
+        return self.fast_list_response(courses, CourseSerializer(context=self.sparse_context()), paginate=False)
 
 
-class PostViewSet(viewsets.ReadOnlyModelViewSet):
+class PostViewSet(ResponseCacheMixin, SparseFieldsViewMixin, FastListMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Post.objects.filter(is_published=True)
     serializer_class = PostSerializer
-    permission_classes = [AllowAny]
\ No newline at end of file
+    permission_classes = [AllowAny]
+    cache_models = (Post, User)
\ No newline at end of file